@@ -0,0 +1,155 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Iterable, NamedTuple
+
+from FactorioAPI.API.client import APIClient, getDefaultClient
+from FactorioAPI.API.Internal import matchmaking
+from FactorioAPI.API.Internal.servers import ServerIndex
+
+"""
+matchmaking for asyncio, mostly for getting the details of lots of games at once
+
+requests has no async side, so each request runs on a thread of its own thread pool, with as many threads
+as concurrency and the APIClient's connection pool just as big, so every request in flight has a kept alive
+connection. if the client has a Scheduler its waits are awaited rather than taking up a thread.
+only concurrency requests are ever in flight, the rest of the ids aren't even looked at until there is room
+
+    async with AsyncMatchmaking(concurrency=32) as mm:
+        async for result in mm.getGameDetailsMany(server["game_id"] for server in servers):
+            if result.error is None:
+                print(result.details["name"])
+
+addDetails fills in the mods of a ServerIndex (servers.py) the same way, getGames doesn't have them
+
+url is there so it can be pointed at something else, like a local stub server in tests
+"""
+
+
+class GameDetailsResult(NamedTuple):
+    """The details of one game, or why they couldn't be got."""
+
+    gameId: str
+    # None if there was an error
+    details: dict | None
+    error: Exception | None
+
+
+class AsyncMatchmaking:
+    """An asyncio counterpart of matchmaking.py, see the top of this file."""
+
+    def __init__(
+        self,
+        client: APIClient = None,
+        concurrency: int = 16,
+        url: str = matchmaking.URL,
+    ) -> None:
+        """
+        Args:
+            client (APIClient, optional): The pooled client to send requests with, it should pool at least concurrency connections. Defaults to a new one that does, sharing getDefaultClient()'s Scheduler.
+            concurrency (int, optional): How many requests can be in flight at once. Defaults to 16.
+            url (str, optional): Where the matchmaking api is. Defaults to matchmaking.URL.
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency has to be at least 1")
+        self.concurrency = concurrency
+        self.url = url.rstrip("/")
+        self._ownsClient = client is None
+        if client is None:
+            # its own pool, but the same rate limits as every other api call
+            client = APIClient(
+                poolSize=concurrency, scheduler=getDefaultClient().scheduler
+            )
+        self.client = client
+        self._executor = ThreadPoolExecutor(concurrency, "matchmaking")
+        # limits everything, not just one getGameDetailsMany
+        self._semaphore = None
+
+    async def _get(self, path: str, endpoint: str, **kwargs):
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        async with self._semaphore:
+            return await self.client.requestAsync(
+                "GET", f"{self.url}/{path}", endpoint, self._executor, **kwargs
+            )
+
+    async def getGames(self, username: str, token: str) -> list:
+        """matchmaking.getGames without blocking the event loop."""
+        request = await self._get(
+            "get-games", "get-games", params={"username": username, "token": token}
+        )
+        return matchmaking.parseGames(request)
+
+    async def getGameDetails(self, gameId: str) -> dict:
+        """matchmaking.getGameDetails without blocking the event loop.
+
+        Raises:
+            Exception: If the api answered with an error.
+        """
+        request = await self._get(f"get-game-details/{gameId}", "get-game-details")
+        return matchmaking.parseGameDetails(gameId, request)
+
+    async def _result(self, gameId: str) -> GameDetailsResult:
+        try:
+            return GameDetailsResult(gameId, await self.getGameDetails(gameId), None)
+        except Exception as e:
+            return GameDetailsResult(gameId, None, e)
+
+    async def getGameDetailsMany(
+        self, ids: Iterable[str]
+    ) -> AsyncIterator[GameDetailsResult]:
+        """Gets the details of lots of games, concurrency at a time.
+
+        Args:
+            ids (Iterable[str]): The game ids, only taken from as there is room for more requests.
+
+        Returns:
+            AsyncIterator[GameDetailsResult]: A result for every id in the order they finish, errors are in the result instead of being raised.
+        """
+        ids = iter(ids)
+        pending = set()
+        try:
+            while True:
+                for gameId in ids:
+                    pending.add(asyncio.ensure_future(self._result(gameId)))
+                    if len(pending) >= self.concurrency:
+                        break
+                if not pending:
+                    return
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    yield task.result()
+        finally:
+            # stopped early, the requests already running just finish on their threads
+            for task in pending:
+                task.cancel()
+
+    async def addDetails(self, index: ServerIndex, ids: Iterable[str] = None) -> int:
+        """Gets the details of the servers in an index and merges their mods in, see ServerIndex.addDetails.
+
+        Args:
+            index (ServerIndex): The index, from GamesCache.getIndex (matchmaking.py) or made from getGames.
+            ids (Iterable[str], optional): The game ids to get. Defaults to every server in the index that has mods.
+
+        Returns:
+            int: How many servers got their mods, the ones that errored don't count.
+        """
+        if ids is None:
+            ids = [record.gameId for record in index.records if record.hasMods]
+        added = 0
+        async for result in self.getGameDetailsMany(ids):
+            added += index.addDetails([result])
+        return added
+
+    def close(self) -> None:
+        """Stops the threads, and closes the client if it made it."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        if self._ownsClient:
+            self.client.close()
+
+    async def __aenter__(self) -> "AsyncMatchmaking":
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        self.close()
@@ -1,28 +1,46 @@
 import json
 import os
+import threading
+import time
+
 import requests
 
-from FactorioAPI.Utils import getDefaultHeaders
+from FactorioAPI.API.client import APIClient, getDefaultClient
+from FactorioAPI.API.Internal.servers import ServerIndex
+
+URL = "https://multiplayer.factorio.com"
 
 
-def getGames(username: str, token: str) -> list:
+def getGames(
+    username: str, token: str, client: APIClient = None, url: str = URL
+) -> list:
     """
     Gets a list of game servers from the Factorio multiplayer API using the provided username and token
 
-    WARNING: This function provides no rate limiting and measures should be taken to prevent spamming
+    Rate limiting and retries are up to the client's Scheduler, the default client has one
 
     :param username: The username to authenticate with
     :param token: The authentication token to use
+    :param client: The pooled client to send it with, getDefaultClient() if not given
+    :param url: Where the matchmaking api is, URL if not given
     :return: A list of dicts, each containing information about a game server
     """
 
-    request = requests.get(
-        "https://multiplayer.factorio.com/get-games",
+    request = (client or getDefaultClient()).get(
+        f"{url}/get-games",
+        "get-games",
         params={"username": username, "token": token},
-        verify=True,
-        headers=getDefaultHeaders(),
     )
+    return parseGames(request)
+
 
+def parseGames(request: requests.Response) -> list:
+    """
+    Gets the servers out of a get-games response, for getGames and asyncMatchmaking.py
+
+    :param request: The response
+    :return: A list of dicts, each containing information about a game server
+    """
     servers = request.json()
     request.close()
     if not isinstance(servers, list):
@@ -34,16 +52,243 @@ def getGames(username: str, token: str) -> list:
     return servers
 
 
-def getGameDetails(gameId: str) -> dict:
+def getGameDetails(gameId: str, client: APIClient = None, url: str = URL) -> dict:
     """
     Gets the details of a game from the Factorio multiplayer API using the provided gameId
 
-    WARNING: This function provides no rate limiting and measures should be taken to prevent spamming
+    Rate limiting and retries are up to the client's Scheduler, the default client has one
 
     :param gameId: The id of the game to get details for
+    :param client: The pooled client to send it with, getDefaultClient() if not given
+    :param url: Where the matchmaking api is, URL if not given
     :return: A dict containing information about the game
     """
-    request = requests.get(
-        f"https://multiplayer.factorio.com/get-game-details/{gameId}",
+    request = (client or getDefaultClient()).get(
+        f"{url}/get-game-details/{gameId}",
+        "get-game-details",
     )
+    return parseGameDetails(gameId, request)
+
+
+def parseGameDetails(gameId: str, request: requests.Response) -> dict:
+    """
+    Gets the details out of a get-game-details response, for getGameDetails and asyncMatchmaking.py
+
+    :param gameId: The id of the game the details are for
+    :param request: The response
+    :return: A dict containing information about the game
+    """
+    if request.status_code >= 400:
+        try:
+            message = "\n" + request.json()["message"]
+        except:
+            message = ""
+        raise Exception(
+            f"Failed to get details of game {gameId} ({request.status_code}){message}"
+        )
     return request.json()
+
+
+class _CachedGames:
+    __slots__ = (
+        "servers",
+        "fetched",
+        "etag",
+        "lastModified",
+        "lock",
+        "refreshing",
+        "index",
+        "used",
+    )
+
+    def __init__(self) -> None:
+        self.servers = None
+        # time.monotonic() of the last fetch (or 304), 0 for never
+        self.fetched = 0.0
+        self.etag = None
+        self.lastModified = None
+        # held by whoever is fetching, so only one fetch per key happens at once
+        self.lock = threading.Lock()
+        self.refreshing = False
+        # (servers, a ServerIndex of them), made when it's first asked for
+        self.index = None
+        # time.monotonic() of the last get, entries that go unused are dropped
+        self.used = time.monotonic()
+
+
+class GamesCache:
+    """
+    getGames from memory, fetching at most once every ttl seconds
+
+    Up to ttl seconds after a fetch the servers come straight from memory. For staleFor seconds after that
+    the old servers are still given back, and one background thread fetches new ones. After that a call waits
+    for a new fetch. Only one fetch happens at a time for each username and token, everyone else waits for it
+    or gets the old servers. When the server sent an ETag or Last-Modified they are sent back, and a 304 keeps
+    the servers that are already there
+
+    The lists given back are shared between callers, so they shouldn't be changed. A username and token that
+    hasn't been asked for in ttl + staleFor seconds is forgotten when a new one comes along, and only the
+    maxEntries most recently used are kept
+
+    :param ttl: Seconds the servers are fresh for
+    :param staleFor: Seconds after that they can still be given back while new ones are fetched, 0 to always wait
+    :param maxEntries: The most usernames and tokens to keep servers for
+    :param client: The pooled client to fetch with, getDefaultClient() if not given
+    :param url: Where the matchmaking api is, URL if not given
+    """
+
+    def __init__(
+        self,
+        ttl: float = 10.0,
+        staleFor: float = 60.0,
+        client: APIClient = None,
+        url: str = URL,
+        maxEntries: int = 64,
+    ) -> None:
+        if maxEntries < 1:
+            raise ValueError("maxEntries has to be at least 1")
+        self.ttl = ttl
+        self.staleFor = staleFor
+        self.maxEntries = maxEntries
+        self.client = client
+        self.url = url
+        self.stats = {"hits": 0, "stale": 0, "fetches": 0, "notModified": 0}
+        # the error of the last background fetch that failed, None once one works
+        self.lastError = None
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def _count(self, stat: str) -> None:
+        with self._lock:
+            self.stats[stat] += 1
+
+    def _entry(self, username: str, token: str) -> _CachedGames:
+        key = (username, token)
+        entry = self._entries.get(key)
+        if entry is None:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is None:
+                    self._prune()
+                    entry = self._entries[key] = _CachedGames()
+        return entry
+
+    def _prune(self) -> None:
+        # has to be called with self._lock held, makes room for one more entry.
+        # one being fetched right now can go too, the fetch just finishes on an entry nobody has
+        now = time.monotonic()
+        for key in [
+            key
+            for key, entry in self._entries.items()
+            if now - entry.used >= self.ttl + self.staleFor
+        ]:
+            del self._entries[key]
+        over = len(self._entries) - self.maxEntries + 1
+        if over > 0:
+            for key in sorted(self._entries, key=lambda key: self._entries[key].used)[
+                :over
+            ]:
+                del self._entries[key]
+
+    def _fetch(self, entry: _CachedGames, username: str, token: str) -> None:
+        # has to be called with entry.lock held
+        headers = {}
+        if entry.servers is not None:
+            if entry.etag is not None:
+                headers["If-None-Match"] = entry.etag
+            if entry.lastModified is not None:
+                headers["If-Modified-Since"] = entry.lastModified
+        request = (self.client or getDefaultClient()).get(
+            f"{self.url}/get-games",
+            "get-games",
+            params={"username": username, "token": token},
+            headers=headers,
+        )
+        self._count("fetches")
+        if request.status_code == 304 and entry.servers is not None:
+            request.close()
+            self._count("notModified")
+        else:
+            etag = request.headers.get("ETag")
+            lastModified = request.headers.get("Last-Modified")
+            entry.servers = parseGames(request)
+            entry.index = None
+            entry.etag = etag
+            entry.lastModified = lastModified
+        entry.fetched = time.monotonic()
+
+    def _refreshInBackground(
+        self, entry: _CachedGames, username: str, token: str
+    ) -> None:
+        if not entry.lock.acquire(blocking=False):
+            # already being fetched
+            return
+        entry.refreshing = True
+
+        def refresh():
+            try:
+                self._fetch(entry, username, token)
+                self.lastError = None
+            except Exception as e:
+                self.lastError = e
+            finally:
+                entry.refreshing = False
+                entry.lock.release()
+
+        try:
+            threading.Thread(target=refresh, name="getGames", daemon=True).start()
+        except BaseException:
+            entry.refreshing = False
+            entry.lock.release()
+            raise
+
+    def get(self, username: str, token: str) -> list:
+        """
+        Gets the game servers, see GamesCache
+
+        :param username: The username to authenticate with
+        :param token: The authentication token to use
+        :return: A list of dicts, each containing information about a game server
+        """
+        entry = self._entry(username, token)
+        now = entry.used = time.monotonic()
+        age = now - entry.fetched
+        if entry.servers is not None:
+            if age < self.ttl:
+                self._count("hits")
+                return entry.servers
+            if age < self.ttl + self.staleFor:
+                self._count("stale")
+                if not entry.refreshing:
+                    self._refreshInBackground(entry, username, token)
+                return entry.servers
+        with entry.lock:
+            # someone else might have fetched them while this was waiting
+            if entry.servers is None or time.monotonic() - entry.fetched >= self.ttl:
+                self._fetch(entry, username, token)
+            else:
+                self._count("hits")
+            return entry.servers
+
+    def getIndex(self, username: str, token: str) -> ServerIndex:
+        """
+        Gets the game servers as a ServerIndex (servers.py), built once for each new list of servers.
+        getGames has no mods, so find(mod=...) only works once they're merged in with AsyncMatchmaking.addDetails,
+        and a new list of servers is a new index without them
+
+        :param username: The username to authenticate with
+        :param token: The authentication token to use
+        :return: The index, find and get on it look servers up without a scan
+        """
+        servers = self.get(username, token)
+        entry = self._entry(username, token)
+        built = entry.index
+        # a background fetch can swap the servers between the get and here, so check it's the same list
+        if built is None or built[0] is not servers:
+            built = entry.index = (servers, ServerIndex(servers))
+        return built[1]
+
+    def invalidate(self) -> None:
+        """Forgets everything, the next get for anyone fetches"""
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,273 @@
+import bisect
+import re
+from typing import Any, Iterable
+
+"""
+getGames results as compact records with indexes, for looking servers up without scanning the whole list
+
+every server is a ServerRecord (__slots__, so no dict per server), and ServerIndex builds once:
+    byId        game_id > record
+    versions    "1.1" and "1.1.110" > positions of the servers on that version
+    words       a word from a name, description or tag > positions, words are casefolded runs of letters and digits in any script
+    tags        a whole tag, lowercase without color/font rich text > positions
+    mods        a mod name > positions, getGames has no mods so these come from getGameDetails, see addDetails
+    players     positions sorted by player count, with the counts beside them for bisecting
+
+    index = ServerIndex(getGames(username, token))
+    async with AsyncMatchmaking() as mm:
+        await mm.addDetails(index)
+    index.find(version="1.1", mod="space-exploration", minPlayers=6)
+
+find intersects the sets it needs starting with the smallest, so it doesn't go near most servers.
+GamesCache.getIndex (matchmaking.py) keeps one built for each fetch
+"""
+
+# any letters or digits, so names in other scripts get indexed too
+_WORD = re.compile(r"\w+")
+# rich text like [color=red] and [/color], the words in them aren't what the server is about
+_RICH_TEXT = re.compile(r"\[/?(?:color|font)(?:=[^\]]*)?\]")
+
+
+def words(text: str) -> set:
+    """
+    Args:
+        text (str): A name, description or tag.
+
+    Returns:
+        set: The lowercase words in it, the same way the index splits them.
+    """
+    return set(_WORD.findall(_RICH_TEXT.sub(" ", text or "").casefold()))
+
+
+def _tagKey(tag: str) -> str:
+    return _RICH_TEXT.sub("", tag).strip().casefold()
+
+
+class ServerRecord:
+    """One server from getGames, the fields that aren't there are None (or empty)."""
+
+    __slots__ = (
+        "gameId",
+        "serverId",
+        "name",
+        "description",
+        "version",
+        "build",
+        "host",
+        "maxPlayers",
+        "players",
+        "playerCount",
+        "tags",
+        "hasPassword",
+        "hasMods",
+        "modCount",
+        "mods",
+        "gameTimeElapsed",
+        "lastHeartbeat",
+    )
+
+    def __init__(self, server: dict) -> None:
+        """
+        Args:
+            server (dict): A server from getGames, or the details from getGameDetails.
+        """
+        version = server.get("application_version") or {}
+        self.gameId = server.get("game_id")
+        self.serverId = server.get("server_id")
+        self.name = server.get("name", "")
+        self.description = server.get("description", "")
+        self.version = version.get("game_version")
+        self.build = version.get("build_version")
+        self.host = server.get("host_address")
+        self.maxPlayers = server.get("max_players")
+        self.players = tuple(server.get("players") or ())
+        self.playerCount = len(self.players)
+        self.tags = tuple(server.get("tags") or ())
+        self.hasPassword = server.get("has_password", False)
+        self.hasMods = server.get("has_mods", False)
+        self.modCount = server.get("mod_count", 0)
+        # (name, version), only in game details
+        self.mods = tuple(
+            (mod["name"], mod.get("version")) for mod in server.get("mods") or ()
+        )
+        self.gameTimeElapsed = server.get("game_time_elapsed")
+        self.lastHeartbeat = server.get("last_heartbeat")
+
+    def __repr__(self) -> str:
+        return f"ServerRecord({self.gameId!r}, {self.name!r}, {self.version!r}, {self.playerCount} players)"
+
+
+def _versionKeys(version: str | None) -> list:
+    if not version:
+        return []
+    parts = version.split(".")
+    return [".".join(parts[:2]), version] if len(parts) > 2 else [version]
+
+
+class ServerIndex:
+    """Indexes over a getGames listing, see the top of this file."""
+
+    def __init__(self, servers: Iterable[dict | ServerRecord]) -> None:
+        """
+        Args:
+            servers (Iterable[dict | ServerRecord]): The servers, from getGames (or getGameDetails for mods).
+        """
+        self.records = [
+            server if isinstance(server, ServerRecord) else ServerRecord(server)
+            for server in servers
+        ]
+        self.byId = {}
+        # game_id > position
+        self.positions = {}
+        self.versions = {}
+        self.words = {}
+        self.tags = {}
+        self.mods = {}
+        for i, record in enumerate(self.records):
+            self.byId[record.gameId] = record
+            self.positions[record.gameId] = i
+            for key in _versionKeys(record.version):
+                self.versions.setdefault(key, set()).add(i)
+            found = words(record.name) | words(record.description)
+            for tag in record.tags:
+                found |= words(tag)
+                self.tags.setdefault(_tagKey(tag), set()).add(i)
+            for word in found:
+                self.words.setdefault(word, set()).add(i)
+            for name, version in record.mods:
+                self.mods.setdefault(name, set()).add(i)
+        self._byPlayers = sorted(
+            range(len(self.records)), key=lambda i: self.records[i].playerCount
+        )
+        self._playerCounts = [self.records[i].playerCount for i in self._byPlayers]
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def addDetails(self, results: Iterable[dict | Any]) -> int:
+        """Merges in the mods from getGameDetails, so find(mod=...) can find the servers they're for.
+        only the mods are taken, servers that aren't in the index are left out
+
+        Args:
+            results (Iterable[dict | Any]): Details from getGameDetails, or GameDetailsResults from getGameDetailsMany (asyncMatchmaking.py), the ones with errors are skipped.
+
+        Returns:
+            int: How many servers got their mods.
+        """
+        added = 0
+        for result in results:
+            if isinstance(result, dict):
+                details = result
+                gameId = details.get("game_id")
+            elif result.error is None:
+                details = result.details
+                gameId = details.get("game_id", result.gameId)
+            else:
+                continue
+            i = self.positions.get(gameId)
+            if i is None and isinstance(gameId, str) and gameId.isdigit():
+                # ids given to getGameDetailsMany as strings, getGames has them as ints
+                i = self.positions.get(int(gameId))
+            if i is None:
+                continue
+            record = self.records[i]
+            for name, version in record.mods:
+                self.mods[name].discard(i)
+            record.mods = ServerRecord(details).mods
+            record.hasMods = bool(record.mods)
+            record.modCount = len(record.mods)
+            for name, version in record.mods:
+                self.mods.setdefault(name, set()).add(i)
+            added += 1
+        return added
+
+    def get(self, gameId: int) -> ServerRecord | None:
+        """
+        Returns:
+            ServerRecord | None: The server with that game id, None if there isn't one.
+        """
+        return self.byId.get(gameId)
+
+    def withPlayers(self, minPlayers: int = None, maxPlayers: int = None) -> list:
+        """
+        Args:
+            minPlayers (int, optional): At least this many players. Defaults to None.
+            maxPlayers (int, optional): At most this many players. Defaults to None.
+
+        Returns:
+            list: Positions of the servers in range, fewest players first.
+        """
+        start = 0
+        stop = len(self._playerCounts)
+        if minPlayers is not None:
+            start = bisect.bisect_left(self._playerCounts, minPlayers)
+        if maxPlayers is not None:
+            stop = bisect.bisect_right(self._playerCounts, maxPlayers)
+        return self._byPlayers[start:stop]
+
+    def find(
+        self,
+        version: str = None,
+        mod: str | Iterable[str] = None,
+        text: str = None,
+        tag: str = None,
+        minPlayers: int = None,
+        maxPlayers: int = None,
+        hasPassword: bool = None,
+    ) -> list:
+        """The servers that match everything given.
+
+        Args:
+            version (str, optional): "1.1" for any 1.1 server, "1.1.110" for just that one. Defaults to None.
+            mod (str | Iterable[str], optional): A mod, or mods, the server has to have. Defaults to None.
+            text (str, optional): Every word in it has to be in the name, description or tags. Defaults to None.
+            tag (str, optional): A whole tag the server has to have, any case and ignoring color/font rich text. Defaults to None.
+            minPlayers (int, optional): At least this many players. Defaults to None.
+            maxPlayers (int, optional): At most this many players. Defaults to None.
+            hasPassword (bool, optional): Whether it has to have a password or not. Defaults to None.
+
+        Returns:
+            list: The matching ServerRecords, in the order getGames gave them.
+        """
+        sets = []
+        if version is not None:
+            sets.append(self.versions.get(version, set()))
+        if mod is not None:
+            for name in [mod] if isinstance(mod, str) else mod:
+                sets.append(self.mods.get(name, set()))
+        if text is not None:
+            textWords = words(text)
+            if not textWords:
+                # nothing in it to match, rather than nothing to filter on
+                return []
+            for word in textWords:
+                sets.append(self.words.get(word, set()))
+        if tag is not None:
+            sets.append(self.tags.get(_tagKey(tag), set()))
+        if sets:
+            sets.sort(key=len)
+            positions = sets[0].intersection(*sets[1:])
+        else:
+            positions = None
+        if minPlayers is not None or maxPlayers is not None:
+            inRange = self.withPlayers(minPlayers, maxPlayers)
+            if positions is None:
+                positions = set(inRange)
+            elif len(inRange) < len(positions):
+                positions = positions.intersection(inRange)
+            else:
+                # checking the few that are left is cheaper than making a set of the range
+                records = self.records
+                positions = {
+                    i
+                    for i in positions
+                    if (minPlayers is None or records[i].playerCount >= minPlayers)
+                    and (maxPlayers is None or records[i].playerCount <= maxPlayers)
+                }
+        if positions is None:
+            positions = range(len(self.records))
+        records = self.records
+        found = [records[i] for i in sorted(positions)]
+        if hasPassword is not None:
+            found = [record for record in found if record.hasPassword == hasPassword]
+        return found
@@ -1,30 +1,31 @@
 import json
 import os
-import requests
 
-from FactorioAPI.Utils import getDefaultHeaders
+from FactorioAPI.API.client import APIClient, getDefaultClient
 
 
-def getToken(username: str, password: str, emailCode: str = "") -> str:
+def getToken(
+    username: str, password: str, emailCode: str = "", client: APIClient = None
+) -> str:
     """
     Get a token for the Factorio web API.
 
-    WARNING: This function provides no rate limiting and measures should be taken to prevent spamming
+    Rate limiting and retries are up to the client's Scheduler, the default client has one
 
     Args:
         username (str): The username of the user.
         password (str): The password of the user.
         emailCode (str, optional): The email code obtained from the email sent to the user. Defaults to "".
+        client (APIClient, optional): The pooled client to send it with. Defaults to getDefaultClient().
 
     Returns:
         str: The token obtained from the API.
     """
-    request = requests.post(
+    request = (client or getDefaultClient()).post(
         "https://auth.factorio.com/api-login",
+        "api-login",
         params={"username": username, "password": password, "email_code": emailCode},
-        headers=getDefaultHeaders(),
         timeout=10,
-        verify=True,
     )
     data: dict = request.json()
     # print(json.dumps(request.json(),indent=4))
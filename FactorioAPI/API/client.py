@@ -0,0 +1,261 @@
+import asyncio
+import functools
+import statistics
+import threading
+import time
+from collections import deque
+from concurrent.futures import Executor
+from typing import NamedTuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from FactorioAPI.API.scheduler import Scheduler
+from FactorioAPI.Utils import getDefaultHeaders
+
+"""
+one pooled, keep-alive http session for all of the api modules
+
+every call used to be a bare requests.get/post, so every call was a new TCP+TLS handshake.
+an APIClient owns a requests.Session whose adapter keeps up to poolSize connections open per host,
+sends the default headers (with gzip/deflate, and br when brotli is installed) and a timeout on every request,
+and remembers how long each request took
+
+    client = APIClient(poolSize=32, timeout=(3, 15))
+    servers = matchmaking.getGames(username, token, client=client)
+    client.latency("get-games")  # {"count": 1, "mean": 0.41, ...}
+
+given a Scheduler (scheduler.py) every request goes through it, to be rate limited, retried and coalesced.
+requestAsync is request for coroutines, the request runs on a thread and the scheduler's waits are awaited
+
+the api functions use getDefaultClient() when they aren't given one, which has a Scheduler with its defaults
+"""
+
+# (connect, read) seconds
+DEFAULT_TIMEOUT = (5, 30)
+
+
+class RequestMetric(NamedTuple):
+    """One request the client made."""
+
+    endpoint: str
+    method: str
+    # scheme, host and path, the query is left off since it can have tokens in it
+    url: str
+    # None when the request failed before there was a response
+    status: int | None
+    # from sending the request until the whole body was read
+    seconds: float
+    # bytes of body, after decompression
+    size: int
+    # time.time() when it was sent
+    started: float
+
+
+class APIClient:
+    """A pooled requests.Session with timeouts and latency metrics, see the top of this file.
+    safe to share between threads
+    """
+
+    def __init__(
+        self,
+        poolSize: int = 10,
+        timeout: float | tuple[float, float] = DEFAULT_TIMEOUT,
+        headers: dict = None,
+        maxMetrics: int = 10000,
+        scheduler: Scheduler = None,
+    ) -> None:
+        """
+        Args:
+            poolSize (int, optional): How many connections to keep open per host. Defaults to 10.
+            timeout (float | tuple[float, float], optional): Seconds, or (connect, read) seconds, for requests that don't give their own. Defaults to DEFAULT_TIMEOUT.
+            headers (dict, optional): Headers to send on top of getDefaultHeaders(). Defaults to None.
+            maxMetrics (int, optional): How many of the latest requests to keep metrics for. Defaults to 10000.
+            scheduler (Scheduler, optional): What to send every request through. Defaults to None, sending them straight away.
+        """
+        self.timeout = timeout
+        self.scheduler = scheduler
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=poolSize, pool_maxsize=poolSize)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update(getDefaultHeaders())
+        # the default headers put the app link in Connection, which would stop the connection being reused
+        self.session.headers["Connection"] = "keep-alive"
+        if headers:
+            self.session.headers.update(headers)
+        self.metrics = deque(maxlen=maxMetrics)
+        self._lock = threading.Lock()
+
+    def send(
+        self, method: str, url: str, endpoint: str = None, **kwargs
+    ) -> requests.Response:
+        """Sends a request once through the pooled session, not through the scheduler.
+        the body is read before returning so the connection goes back to the pool
+
+        Args:
+            method (str): "GET", "POST" and so on.
+            url (str): The url.
+            endpoint (str, optional): What to file its metrics under. Defaults to the url's path.
+            **kwargs: Anything requests.Session.request takes, timeout and verify have defaults.
+
+        Returns:
+            requests.Response: The response.
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        kwargs.setdefault("verify", True)
+        parts = urlsplit(url)
+        cleanUrl = f"{parts.scheme}://{parts.netloc}{parts.path}"
+        if endpoint is None:
+            endpoint = parts.path
+        started = time.time()
+        start = time.perf_counter()
+        status = None
+        size = 0
+        try:
+            response = self.session.request(method, url, **kwargs)
+            status = response.status_code
+            size = len(response.content)
+            return response
+        finally:
+            metric = RequestMetric(
+                endpoint,
+                method,
+                cleanUrl,
+                status,
+                time.perf_counter() - start,
+                size,
+                started,
+            )
+            with self._lock:
+                self.metrics.append(metric)
+
+    def request(
+        self, method: str, url: str, endpoint: str = None, **kwargs
+    ) -> requests.Response:
+        """Sends a request through the scheduler if there is one, see send.
+
+        Returns:
+            requests.Response: The response, the same one for identical requests that were coalesced.
+        """
+        if endpoint is None:
+            endpoint = urlsplit(url).path
+        send = functools.partial(self.send, method, url, endpoint, **kwargs)
+        if self.scheduler is None:
+            return send()
+        key = self.scheduler.requestKey(method, url, **kwargs)
+        return self.scheduler.run(endpoint, key, send, method)
+
+    async def requestAsync(
+        self,
+        method: str,
+        url: str,
+        endpoint: str = None,
+        executor: Executor = None,
+        **kwargs,
+    ) -> requests.Response:
+        """request without blocking the event loop, see send.
+
+        Args:
+            executor (Executor, optional): What to run the request on. Defaults to the loop's default executor.
+
+        Returns:
+            requests.Response: The response, the same one for identical requests that were coalesced.
+        """
+        if endpoint is None:
+            endpoint = urlsplit(url).path
+        loop = asyncio.get_running_loop()
+        send = functools.partial(self.send, method, url, endpoint, **kwargs)
+
+        def sendAsync():
+            return loop.run_in_executor(executor, send)
+
+        if self.scheduler is None:
+            return await sendAsync()
+        key = self.scheduler.requestKey(method, url, **kwargs)
+        return await self.scheduler.runAsync(endpoint, key, sendAsync, method)
+
+    def get(self, url: str, endpoint: str = None, **kwargs) -> requests.Response:
+        """A GET, see request."""
+        return self.request("GET", url, endpoint, **kwargs)
+
+    def post(self, url: str, endpoint: str = None, **kwargs) -> requests.Response:
+        """A POST, see request."""
+        return self.request("POST", url, endpoint, **kwargs)
+
+    def latency(self, endpoint: str = None) -> dict:
+        """Latency stats over the metrics that are kept.
+
+        Args:
+            endpoint (str, optional): Only this endpoint's requests. Defaults to all of them.
+
+        Returns:
+            dict: count, errors (no response), mean, p50, p95 and max in seconds, the times are None with no requests.
+        """
+        with self._lock:
+            metrics = [
+                metric
+                for metric in self.metrics
+                if endpoint is None or metric.endpoint == endpoint
+            ]
+        stats = {
+            "count": len(metrics),
+            "errors": sum(metric.status is None for metric in metrics),
+            "mean": None,
+            "p50": None,
+            "p95": None,
+            "max": None,
+        }
+        if metrics:
+            seconds = sorted(metric.seconds for metric in metrics)
+            stats["mean"] = statistics.fmean(seconds)
+            stats["p50"] = seconds[(len(seconds) - 1) // 2]
+            stats["p95"] = seconds[min(len(seconds) - 1, int(len(seconds) * 0.95))]
+            stats["max"] = seconds[-1]
+        return stats
+
+    def endpoints(self) -> list:
+        """
+        Returns:
+            list: Every endpoint there are metrics for.
+        """
+        with self._lock:
+            return list(dict.fromkeys(metric.endpoint for metric in self.metrics))
+
+    def close(self) -> None:
+        """Closes every pooled connection."""
+        self.session.close()
+
+    def __enter__(self) -> "APIClient":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+_defaultClient = None
+_defaultLock = threading.Lock()
+
+
+def getDefaultClient() -> APIClient:
+    """
+    Returns:
+        APIClient: The client the api functions use when they aren't given one, made the first time it's needed.
+    """
+    global _defaultClient
+    if _defaultClient is None:
+        with _defaultLock:
+            if _defaultClient is None:
+                _defaultClient = APIClient(scheduler=Scheduler())
+    return _defaultClient
+
+
+def setDefaultClient(client: APIClient) -> None:
+    """Makes the api functions use this client when they aren't given one, like one with a bigger pool.
+
+    Args:
+        client (APIClient): The client.
+    """
+    global _defaultClient
+    _defaultClient = client
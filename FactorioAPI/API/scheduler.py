@@ -0,0 +1,345 @@
+import asyncio
+import random
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Hashable
+
+import requests
+from urllib3.exceptions import ConnectTimeoutError
+
+"""
+rate limiting, retrying and coalescing for every api call, shared by sync and async callers
+
+    a token bucket per endpoint, so bursts are smoothed out to rate requests a second (burst can go at once)
+    a 429 or 5xx response, or a connection error or timeout, is tried again after an exponential backoff
+        with full jitter (a random wait between 0 and backoff doubled for every retry so far, at most maxBackoff),
+        or after the Retry-After the server sent. only GET and HEAD are retried like that, anything else
+        (a login POST) is only tried again when it never got a connection, so it can't have been sent
+    identical calls that are in flight at the same time (same key) are only sent once and all get that response
+
+APIClient uses one when it's given one (the default client has one), so nothing else has to know about it
+
+    client = APIClient(scheduler=Scheduler({"get-game-details": (20, 40)}))
+
+run is for threads, runAsync for coroutines, they share the buckets but coalesce separately
+"""
+
+# requests a second, how many can go at once
+DEFAULT_RATE = (10.0, 20)
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# methods that are safe to send again after the server might have seen them
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD"})
+
+
+def _notSent(error: Exception) -> bool:
+    # the connection was never made, so the server can't have got any of the request
+    if isinstance(error, requests.ConnectTimeout):
+        return True
+    if isinstance(error, requests.ConnectionError) and error.args:
+        # requests wraps urllib3's MaxRetryError, whose reason is what went wrong
+        return isinstance(getattr(error.args[0], "reason", None), ConnectTimeoutError)
+    return False
+
+
+class TokenBucket:
+    """A token bucket that hands out waits instead of sleeping, so it works for threads and coroutines.
+    safe to share between threads
+    """
+
+    def __init__(self, rate: float, burst: int) -> None:
+        """
+        Args:
+            rate (float): Tokens added a second.
+            burst (int): The most tokens it holds, it starts full.
+        """
+        if rate <= 0 or burst < 1:
+            raise ValueError("rate has to be more than 0 and burst at least 1")
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Takes a token, going into debt if there aren't any so callers queue up in order.
+
+        Returns:
+            float: Seconds to wait before using it, 0 if it can be used now.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._last) * self.rate
+            )
+            self._last = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+
+class Scheduler:
+    """Rate limits, retries and coalesces api calls, see the top of this file."""
+
+    def __init__(
+        self,
+        rates: dict = None,
+        defaultRate: tuple[float, int] = DEFAULT_RATE,
+        retries: int = 4,
+        backoff: float = 0.5,
+        maxBackoff: float = 30.0,
+        retryStatuses: frozenset = RETRY_STATUSES,
+    ) -> None:
+        """
+        Args:
+            rates (dict, optional): endpoint > (requests a second, burst). Defaults to None.
+            defaultRate (tuple[float, int], optional): (requests a second, burst) for endpoints not in rates. Defaults to DEFAULT_RATE.
+            retries (int, optional): How many times to try again after the first. Defaults to 4.
+            backoff (float, optional): Seconds the backoff starts at, doubling every retry. Defaults to 0.5.
+            maxBackoff (float, optional): The longest wait between tries, Retry-After included. Defaults to 30.0.
+            retryStatuses (frozenset, optional): Statuses to try again on. Defaults to RETRY_STATUSES.
+        """
+        self.rates = dict(rates or {})
+        self.defaultRate = defaultRate
+        self.retries = retries
+        self.backoff = backoff
+        self.maxBackoff = maxBackoff
+        self.retryStatuses = retryStatuses
+        self.stats = {
+            "calls": 0,
+            "sent": 0,
+            "retries": 0,
+            "coalesced": 0,
+            "waited": 0.0,
+        }
+        self._buckets = {}
+        self._inFlight = {}
+        self._inFlightAsync = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, endpoint: str) -> TokenBucket:
+        """
+        Returns:
+            TokenBucket: The endpoint's bucket, made the first time it's needed.
+        """
+        with self._lock:
+            if endpoint not in self._buckets:
+                self._buckets[endpoint] = TokenBucket(
+                    *self.rates.get(endpoint, self.defaultRate)
+                )
+            return self._buckets[endpoint]
+
+    def _count(self, stat: str, amount: float = 1) -> None:
+        with self._lock:
+            self.stats[stat] += amount
+
+    def _wait(self, endpoint: str) -> float:
+        delay = self.bucket(endpoint).reserve()
+        if delay:
+            self._count("waited", delay)
+        return delay
+
+    def retryDelay(
+        self,
+        attempt: int,
+        response: requests.Response = None,
+        error: Exception = None,
+        method: str = "GET",
+    ) -> float | None:
+        """How long to wait before trying again.
+
+        Args:
+            attempt (int): How many tries have been made, from 1.
+            response (requests.Response, optional): The response of the last try. Defaults to None.
+            error (Exception, optional): What the last try raised instead. Defaults to None.
+            method (str, optional): The request's method, only GET and HEAD are tried again once they could have been sent. Defaults to "GET".
+
+        Returns:
+            float | None: Seconds, or None if it shouldn't be tried again.
+        """
+        if attempt > self.retries:
+            return None
+        if method.upper() not in IDEMPOTENT_METHODS:
+            if error is None or not _notSent(error):
+                return None
+        elif error is not None:
+            if not isinstance(error, (requests.ConnectionError, requests.Timeout)):
+                return None
+        elif response is None or response.status_code not in self.retryStatuses:
+            return None
+        if response is not None:
+            retryAfter = response.headers.get("Retry-After")
+            if retryAfter is not None:
+                try:
+                    return min(self.maxBackoff, max(0.0, float(retryAfter)))
+                except ValueError:
+                    # it can also be a date, the backoff is near enough
+                    pass
+        return random.uniform(
+            0, min(self.maxBackoff, self.backoff * 2 ** (attempt - 1))
+        )
+
+    def _send(self, endpoint: str, send: Callable[[], requests.Response], method: str):
+        attempt = 0
+        while True:
+            time.sleep(self._wait(endpoint))
+            attempt += 1
+            self._count("sent")
+            try:
+                response = send()
+            except Exception as e:
+                delay = self.retryDelay(attempt, error=e, method=method)
+                if delay is None:
+                    raise
+            else:
+                delay = self.retryDelay(attempt, response, method=method)
+                if delay is None:
+                    return response
+            self._count("retries")
+            time.sleep(delay)
+
+    def run(
+        self,
+        endpoint: str,
+        key: Hashable,
+        send: Callable[[], requests.Response],
+        method: str = "GET",
+    ) -> requests.Response:
+        """Sends a request when the endpoint's bucket allows, trying again as needed, blocking until it's done.
+
+        Args:
+            endpoint (str): Whose bucket to use.
+            key (Hashable): Calls with the same key at the same time share one request, None to never share.
+            send (Callable[[], requests.Response]): Sends the request once.
+            method (str, optional): The request's method, which decides what is retried, see retryDelay. Defaults to "GET".
+
+        Returns:
+            requests.Response: The last response, which can still be an error if the retries ran out.
+        """
+        self._count("calls")
+        if key is None:
+            return self._send(endpoint, send, method)
+        with self._lock:
+            future = self._inFlight.get(key)
+            owner = future is None
+            if owner:
+                future = self._inFlight[key] = Future()
+            else:
+                self.stats["coalesced"] += 1
+        if not owner:
+            return future.result()
+        try:
+            response = self._send(endpoint, send, method)
+            future.set_result(response)
+            return response
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._inFlight[key]
+
+    async def _sendAsync(
+        self,
+        endpoint: str,
+        send: Callable[[], Awaitable[requests.Response]],
+        method: str,
+    ):
+        attempt = 0
+        while True:
+            delay = self._wait(endpoint)
+            if delay:
+                await asyncio.sleep(delay)
+            attempt += 1
+            self._count("sent")
+            try:
+                response = await send()
+            except Exception as e:
+                delay = self.retryDelay(attempt, error=e, method=method)
+                if delay is None:
+                    raise
+            else:
+                delay = self.retryDelay(attempt, response, method=method)
+                if delay is None:
+                    return response
+            self._count("retries")
+            await asyncio.sleep(delay)
+
+    async def runAsync(
+        self,
+        endpoint: str,
+        key: Hashable,
+        send: Callable[[], Awaitable[requests.Response]],
+        method: str = "GET",
+    ) -> requests.Response:
+        """run for coroutines, send is awaited instead of called and the waits don't block the loop."""
+        self._count("calls")
+        if key is None:
+            return await self._sendAsync(endpoint, send, method)
+        loop = asyncio.get_running_loop()
+        # tasks belong to a loop, so the same key on different loops isn't shared
+        key = (id(loop), key)
+        # [the task sending it, how many callers are waiting on it]
+        entry = self._inFlightAsync.get(key)
+        if entry is None:
+            task = loop.create_task(self._sendAsync(endpoint, send, method))
+            entry = self._inFlightAsync[key] = [task, 0]
+
+            def finished(task: asyncio.Task, entry: list = entry) -> None:
+                if self._inFlightAsync.get(key) is entry:
+                    del self._inFlightAsync[key]
+                # the waiters might all be gone, so nothing else would look at the error
+                if not task.cancelled():
+                    task.exception()
+
+            task.add_done_callback(finished)
+        else:
+            self._count("coalesced")
+        task = entry[0]
+        entry[1] += 1
+        try:
+            # the send is its own task and everyone (the caller that started it too) waits through a shield,
+            # so a caller being cancelled only cancels that caller
+            return await asyncio.shield(task)
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0 and not task.done():
+                # nobody wants it any more
+                if self._inFlightAsync.get(key) is entry:
+                    del self._inFlightAsync[key]
+                task.cancel()
+
+    def requestKey(self, method: str, url: str, **kwargs: Any) -> Hashable:
+        """The key identical requests share, None for anything that isn't a GET or HEAD.
+
+        Args:
+            method (str): The method.
+            url (str): The url.
+            **kwargs: What the request is sent with, params and headers count.
+
+        Returns:
+            Hashable: The key.
+        """
+        if (
+            method.upper() not in ("GET", "HEAD")
+            or "data" in kwargs
+            or "json" in kwargs
+        ):
+            return None
+        params = kwargs.get("params") or {}
+        headers = kwargs.get("headers") or {}
+        try:
+            key = (
+                method.upper(),
+                url,
+                tuple(sorted(dict(params).items())),
+                tuple(sorted(dict(headers).items())),
+            )
+            hash(key)
+            return key
+        except TypeError:
+            # params that can't be sorted or hashed, just don't share it
+            return None
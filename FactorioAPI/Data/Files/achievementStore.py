@@ -0,0 +1,338 @@
+import io
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Iterable
+
+import numpy as np
+
+from FactorioAPI.Data.Files.achievements import (
+    ACH_DECODERS,
+    MODDED_ACH_DECODERS,
+    readHeader,
+    readShortArray,
+)
+from FactorioAPI.Data.IO.buffer import BufferReader
+from FactorioAPI.Data.IO.read import (
+    readBool,
+    readShort,
+    readString,
+    readUInt,
+    readVersionString,
+)
+
+"""
+lots of achievement files as columns in numpy, for asking questions across all of them at once
+
+every achievement in every file is one row of AchievementStore.records:
+    player      which file it came from, an index into store.players
+    name        the achievement's name, an index into store.names
+    type        the achievement's type, an index into store.types
+    progress    its data as a number when it has one (kills, items produced, robots, damage), NaN otherwise
+    raw         the bytes of its data as they are in the file, padded to RAW_SIZE
+    rawSize     how many of those bytes are real
+
+    store = AchievementStore.fromFiles(glob.glob("players/*/achievements.dat"))
+    store.shareOfPlayers(type="kill-achievement", above=1000)
+    store.progressByPlayer("steam-all-the-way")
+
+rows are made with the same decoders as readAchievements (registered types included),
+names come from the header for achievements.dat and from each entry for achievements-modded.dat
+"""
+
+# the biggest data of any built in type is 8 bytes, anything longer is cut off (rawSize still says how long it was)
+RAW_SIZE = 8
+
+RECORD = np.dtype(
+    [
+        ("player", "<i4"),
+        ("name", "<i4"),
+        ("type", "<i2"),
+        ("progress", "<f8"),
+        ("raw", f"V{RAW_SIZE}"),
+        ("rawSize", "<u2"),
+    ]
+)
+
+
+def _progress(data: Any) -> float:
+    if type(data) == float or type(data) == int:
+        return float(data)
+    if type(data) == list:
+        for item in data:
+            if type(item) == float or type(item) == int:
+                return float(item)
+    return math.nan
+
+
+def _reader(
+    f: str | os.PathLike | bytes | io.BufferedReader | BufferReader,
+) -> BufferReader:
+    if isinstance(f, BufferReader):
+        return f
+    if isinstance(f, (str, os.PathLike)):
+        return BufferReader.open(f)
+    if isinstance(f, (bytes, bytearray, memoryview)):
+        return BufferReader(f)
+    return BufferReader(f.read())
+
+
+def readAchievementRows(
+    f: str | os.PathLike | bytes | io.BufferedReader | BufferReader,
+    modded: bool = False,
+) -> tuple[list, list, np.ndarray]:
+    """Reads one achievement file into rows, with its own name and type ids, see the top of this file.
+
+    Args:
+        f (str | os.PathLike | bytes | io.BufferedReader | BufferReader): The file, a path is mapped with mmap.
+        modded (bool, optional): Whether it is achievements-modded.dat. Defaults to False.
+
+    Raises:
+        ValueError: If there is an achievement type with no decoder.
+
+    Returns:
+        tuple[list, list, np.ndarray]: The names and types the ids in the rows point to, and the rows (player is 0).
+    """
+    reader = _reader(f)
+    view = reader.view
+    names = {}
+    types = {}
+    nameIds = []
+    typeIds = []
+    progress = []
+    raws = []
+    sizes = []
+    try:
+        readVersionString(reader)
+        readBool(reader)
+        header = readShortArray(reader, readHeader)
+        if modded:
+            decoders = MODDED_ACH_DECODERS
+            count = readUInt(reader)
+        else:
+            decoders = ACH_DECODERS
+            # index > (type, name)
+            byIndex = {0: ("NoneType", "")}
+            for achType in header:
+                for ach in achType["achs"]:
+                    byIndex[ach["index"]] = (achType["type"], ach["name"])
+            count = readShort(reader)
+        for i in range(count):
+            if modded:
+                achType = readString(reader, spaceOptimized=True)
+                name = readString(reader, spaceOptimized=True)
+            else:
+                achType, name = byIndex[readShort(reader)]
+            try:
+                decoder = decoders[achType]
+            except KeyError:
+                raise ValueError(f"Unknown achievement type: {achType}") from None
+            start = reader.pos
+            data = decoder(reader)
+            typeIds.append(types.setdefault(achType, len(types)))
+            nameIds.append(names.setdefault(name, len(names)))
+            progress.append(_progress(data))
+            raws.append(bytes(view[start : min(reader.pos, start + RAW_SIZE)]))
+            sizes.append(reader.pos - start)
+    finally:
+        if reader is not f:
+            reader.close()
+    rows = np.zeros(len(nameIds), dtype=RECORD)
+    rows["name"] = nameIds
+    rows["type"] = typeIds
+    rows["progress"] = progress
+    rows["raw"] = np.array(raws, dtype=f"V{RAW_SIZE}")
+    rows["rawSize"] = sizes
+    return list(names), list(types), rows
+
+
+def _readPathRows(args: tuple) -> tuple[list, list, np.ndarray]:
+    path, modded = args
+    return readAchievementRows(path, modded)
+
+
+class AchievementStore:
+    """Achievements from many files in one structured numpy array, see the top of this file."""
+
+    def __init__(self) -> None:
+        self.players = []
+        self.names = []
+        self.types = []
+        self._nameIds = {}
+        self._typeIds = {}
+        self._chunks = []
+        self._records = np.zeros(0, dtype=RECORD)
+
+    @property
+    def records(self) -> np.ndarray:
+        """
+        Returns:
+            np.ndarray: Every row, with RECORD as its dtype.
+        """
+        if self._chunks:
+            self._records = np.concatenate([self._records, *self._chunks])
+            self._chunks.clear()
+        return self._records
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def _remap(self, values: list, ids: dict, table: list) -> np.ndarray:
+        # the file's ids > the store's ids
+        mapping = np.empty(len(values), dtype=np.int32)
+        for i, value in enumerate(values):
+            if value not in ids:
+                ids[value] = len(table)
+                table.append(value)
+            mapping[i] = ids[value]
+        return mapping
+
+    def addRows(self, player: Any, names: list, types: list, rows: np.ndarray) -> None:
+        """Adds rows from readAchievementRows.
+
+        Args:
+            player (Any): What to call the player, like their file's path.
+            names (list): The names the rows' name ids point to.
+            types (list): The types the rows' type ids point to.
+            rows (np.ndarray): The rows.
+        """
+        rows = rows.copy()
+        rows["player"] = len(self.players)
+        self.players.append(player)
+        if len(rows):
+            rows["name"] = self._remap(names, self._nameIds, self.names)[rows["name"]]
+            rows["type"] = self._remap(types, self._typeIds, self.types)[rows["type"]]
+            self._chunks.append(rows)
+
+    def add(
+        self,
+        f: str | os.PathLike | bytes | io.BufferedReader | BufferReader,
+        player: Any = None,
+        modded: bool = False,
+    ) -> None:
+        """Reads one achievement file into the store.
+
+        Args:
+            f (str | os.PathLike | bytes | io.BufferedReader | BufferReader): The file.
+            player (Any, optional): What to call the player. Defaults to the path, or how many players came before.
+            modded (bool, optional): Whether it is achievements-modded.dat. Defaults to False.
+        """
+        if player is None:
+            player = (
+                os.fspath(f) if isinstance(f, (str, os.PathLike)) else len(self.players)
+            )
+        self.addRows(player, *readAchievementRows(f, modded))
+
+    @classmethod
+    def fromFiles(
+        cls, paths: Iterable[str], modded: bool = False, workers: int = None
+    ) -> "AchievementStore":
+        """Reads lots of achievement files into a new store.
+
+        Args:
+            paths (Iterable[str]): The files, each one is a player named by its path.
+            modded (bool, optional): Whether they are achievements-modded.dat. Defaults to False.
+            workers (int, optional): How many processes to read with, 0 to read them all in this one. Defaults to one per CPU.
+
+        Returns:
+            AchievementStore: The store.
+        """
+        store = cls()
+        paths = [os.fspath(path) for path in paths]
+        if workers == 0 or len(paths) < 2:
+            results = map(_readPathRows, ((path, modded) for path in paths))
+            for path, result in zip(paths, results):
+                store.addRows(path, *result)
+            return store
+        with ProcessPoolExecutor(workers) as executor:
+            results = executor.map(
+                _readPathRows, ((path, modded) for path in paths), chunksize=64
+            )
+            for path, result in zip(paths, results):
+                store.addRows(path, *result)
+        return store
+
+    def nameId(self, name: str) -> int:
+        """
+        Raises:
+            KeyError: If no file had that achievement.
+        """
+        return self._nameIds[name]
+
+    def typeId(self, achType: str) -> int:
+        """
+        Raises:
+            KeyError: If no file had that type.
+        """
+        return self._typeIds[achType]
+
+    def mask(
+        self, name: str = None, type: str = None, above: float = None
+    ) -> np.ndarray:
+        """Which rows match, everything given has to match.
+
+        Args:
+            name (str, optional): The achievement name. Defaults to None.
+            type (str, optional): The achievement type. Defaults to None.
+            above (float, optional): Progress has to be more than this. Defaults to None.
+
+        Returns:
+            np.ndarray: A bool per row.
+        """
+        records = self.records
+        mask = np.ones(len(records), dtype=bool)
+        if name is not None:
+            if name not in self._nameIds:
+                return np.zeros(len(records), dtype=bool)
+            mask &= records["name"] == self._nameIds[name]
+        if type is not None:
+            if type not in self._typeIds:
+                return np.zeros(len(records), dtype=bool)
+            mask &= records["type"] == self._typeIds[type]
+        if above is not None:
+            mask &= records["progress"] > above
+        return mask
+
+    def select(
+        self, name: str = None, type: str = None, above: float = None
+    ) -> np.ndarray:
+        """The rows that match, see mask."""
+        return self.records[self.mask(name, type, above)]
+
+    def playersWith(
+        self, name: str = None, type: str = None, above: float = None
+    ) -> np.ndarray:
+        """
+        Returns:
+            np.ndarray: A bool per player, whether they have a row that matches, see mask.
+        """
+        has = np.zeros(len(self.players), dtype=bool)
+        has[self.records["player"][self.mask(name, type, above)]] = True
+        return has
+
+    def shareOfPlayers(
+        self, name: str = None, type: str = None, above: float = None
+    ) -> float:
+        """How many of the players have a row that matches, see mask, like
+        shareOfPlayers(type="kill-achievement", above=1000)
+
+        Returns:
+            float: Between 0 and 1, 0 if there are no players.
+        """
+        if not self.players:
+            return 0.0
+        return float(self.playersWith(name, type, above).mean())
+
+    def progressByPlayer(self, name: str) -> np.ndarray:
+        """
+        Args:
+            name (str): The achievement name.
+
+        Returns:
+            np.ndarray: Each player's progress on it, NaN for players without it.
+        """
+        progress = np.full(len(self.players), np.nan)
+        mask = self.mask(name=name)
+        records = self.records
+        progress[records["player"][mask]] = records["progress"][mask]
+        return progress
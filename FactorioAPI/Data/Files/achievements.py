@@ -1,118 +1,395 @@
 import io
 import json
+import struct
 from typing import Any, Callable
+
+import numpy as np
+
+from FactorioAPI.Data.Files.parseCache import ParseCache
+from FactorioAPI.Data.IO.buffer import BufferReader
+from FactorioAPI.Data.IO.codec import SHORT
+from FactorioAPI.Data.IO.symbols import SymbolTable
+from FactorioAPI.Data.IO.schema import (
+    Array,
+    Bool,
+    Capture,
+    CompiledSchema,
+    Const,
+    Double,
+    Float,
+    Hex,
+    Int,
+    Primitive,
+    Rest,
+    Schema,
+    Short,
+    String,
+    Struct,
+    Switch,
+    Tuple,
+    Version,
+    compileSchema,
+    fixedSize,
+)
 from FactorioAPI.Data.IO.read import (
     hexed,
-    readArray,
     readBool,
-    readDouble,
-    readFloat,
-    readInt,
+    readPrimitiveRun,
     readShort,
     readString,
+    readUInt,
     readVersionString,
 )
+from FactorioAPI.Data.IO.write import (
+    writeHexed,
+    writeShort,
+    writeString,
+)
 
 
 def readShortArray(
-    f: io.BufferedReader | io.BytesIO,
-    objectDecoder: Callable[[io.BufferedReader | io.BytesIO], Any],
+    f: io.BufferedReader | io.BytesIO | BufferReader,
+    objectDecoder: Callable[
+        [io.BufferedReader | io.BytesIO | BufferReader], Any
+    ] = None,
+    dtype: np.dtype | struct.Struct | str = None,
+    asList=False,
     **kwargs,
-) -> list:
+) -> list | np.ndarray:
     """Reads variable amount of bytes and interprets them as an array.
     For arrays whose length is stored as a short
-    For arrays whose length is stored as a short
 
     Args:
-        f (io.BufferedReader | io.BytesIO): A file-like object or bytes buffer.
-        objectDecoder (Callable[[io.BufferedReader | io.BytesIO], Any]): A function that reads the object.
+        f (io.BufferedReader | io.BytesIO | BufferReader): A file-like object, bytes buffer or BufferReader.
+        objectDecoder (Callable[[io.BufferedReader | io.BytesIO | BufferReader], Any]): A function that reads the object.
+        dtype (np.dtype | struct.Struct | str, optional): If every object is the same fixed width primitive, its type, see readArray. Defaults to None.
+        asList (bool, optional): With dtype, return a list instead of an ndarray. Defaults to False.
         **kwargs: Arbitrary keyword arguments. These are passed to the objectDecoder function.
 
     Returns:
-        list: The bytes read as an array.
+        list | np.ndarray: The bytes read as an array.
     """
     arrayLength = readShort(f)
-    arrayLength = readShort(f)
+    if dtype is not None:
+        return readPrimitiveRun(f, arrayLength, dtype, asList)
     array = []
     for i in range(arrayLength):
         array.append(objectDecoder(f, **kwargs))
-        array.append(objectDecoder(f, **kwargs))
     return array
 
 
-def readHeader(f: io.BufferedReader | io.BytesIO) -> dict:
-    achType = readString(f, spaceOptimized=True)
-    achsOfType = readShortArray(f, readHeaderSubojbect)
+def readHeader(
+    f: io.BufferedReader | io.BytesIO | BufferReader, symbols: SymbolTable = None
+) -> dict:
+    achType = readString(f, spaceOptimized=True, symbols=symbols)
+    achsOfType = readShortArray(f, readHeaderSubojbect, symbols=symbols)
     return {"type": achType, "achs": achsOfType}
 
 
-def readHeaderSubojbect(f: io.BufferedReader | io.BytesIO) -> dict:
-    achName = readString(f, spaceOptimized=True)
+def readHeaderSubojbect(
+    f: io.BufferedReader | io.BytesIO | BufferReader, symbols: SymbolTable = None
+) -> dict:
+    achName = readString(f, spaceOptimized=True, symbols=symbols)
     achIndex = readShort(f)
     return {"name": achName, "index": achIndex}
 
 
-def readAchData(f: io.BufferedReader | io.BytesIO, achType: str, modded=False) -> dict:
-    data = None
-    match achType:
-        case "build-entity-achievement":
-            data = hexed(f.read(4))
-        case "combat-robot-count":
-            data = readInt(f)
-        case "construct-with-robots-achievement":
-            data = [readInt(f), hexed(f.read(4))]
-        case "deconstruct-with-robots-achievement":
-            data = readInt(f)
-        case "deliver-by-robots-achievement":
-            data = hexed(f.read(8))
-        case "dont-build-entity-achievement":
-            data = hexed(f.read(4))
-        case "dont-craft-manually-achievement":
-            data = hexed(f.read(8))
-        case "dont-use-entity-in-energy-production-achievement":
-            data = readDouble(f)
-        case "finish-the-game-achievement":
-            data = hexed(f.read(4))
-        case "group-attack-achievement":
-            data = hexed(f.read(4))
-        case "kill-achievement":
-            data = readDouble(f)
-        case "player-damaged-achievement":
-            data = [readFloat(f), readBool(f)]
-        case "produce-achievement":
-            data = readDouble(f)
-        case "produce-per-hour-achievement":
-            data = readDouble(f)
-        case "research-achievement":
-            if modded:
-                data = "NoData"
+def _hexDecoder(
+    size: int,
+) -> Callable[[io.BufferedReader | io.BytesIO | BufferReader], str]:
+    return lambda f: hexed(f.read(size))
+
+
+def _structDecoder(
+    s: struct.Struct,
+) -> Callable[[io.BufferedReader | io.BytesIO | BufferReader], Any]:
+    unpack = s.unpack
+    size = s.size
+    return lambda f: unpack(f.read(size))[0]
+
+
+def _constDecoder(
+    value: Any,
+) -> Callable[[io.BufferedReader | io.BytesIO | BufferReader], Any]:
+    return lambda f: value
+
+
+def _hexEncoder(f: io.BufferedWriter | io.BytesIO, data: str) -> None:
+    writeHexed(f, data)
+
+
+def _noEncoder(f: io.BufferedWriter | io.BytesIO, data: Any) -> None:
+    pass
+
+
+def _structEncoder(
+    s: struct.Struct,
+) -> Callable[[io.BufferedWriter | io.BytesIO, Any], None]:
+    pack = s.pack
+    return lambda f, data: f.write(pack(data))
+
+
+class AchievementType:
+    """How one achievement type's data is laid out.
+    it is described once as a schema (see Data/IO/schema.py), the decoder, encoder, size and progress
+    field that the readers, writers, validators and patchers use are all worked out from it
+    """
+
+    __slots__ = ("schema", "size", "progress", "decode", "encode", "_codec")
+
+    def __init__(self, schema: Schema) -> None:
+        """
+        Args:
+            schema (Schema): The schema of its data, like Double or Tuple(Int, Hex(4)).
+        """
+        self.schema = schema
+        self._codec = None
+        # bytes its data always takes up, None when it depends on the data
+        self.size = fixedSize(schema)
+        # (struct, where in the data) of the number that is its progress, None if there isn't one
+        first = schema.fields[0][1] if isinstance(schema, Struct) else schema
+        self.progress = (first.struct, 0) if type(first) is Primitive else None
+        # the common ones get a decoder and encoder without going through the compiled schema
+        if type(schema) is Primitive:
+            self.decode = _structDecoder(schema.struct)
+            self.encode = _structEncoder(schema.struct)
+        elif isinstance(schema, Hex):
+            self.decode = _hexDecoder(schema.size)
+            self.encode = _hexEncoder
+        elif isinstance(schema, Const):
+            self.decode = _constDecoder(schema.value)
+            self.encode = _noEncoder
+        else:
+            reader = self.codec.reader
+            size = self.size
+            if size is None:
+                self.decode = self.codec.read
             else:
-                data = hexed(f.read(4))
-        case "train-path-achievement":
-            data = readDouble(f)
-        case "achievement":
-            data = "NoData"
-        case "NoneType":
-            data = "NoneType"
-        case _:
-            raise ValueError(f"Unknown achievement type: {achType}")
-    return data
-
-
-def readContent(f: io.BufferedReader | io.BytesIO, indexLink: dict) -> dict:
+                self.decode = lambda f: reader(f.read(size), 0, {})[0]
+            self.encode = self.codec.write
+
+    @property
+    def codec(self) -> CompiledSchema:
+        """The schema compiled, the first time it's needed."""
+        if self._codec is None:
+            self._codec = compileSchema(self.schema)
+        return self._codec
+
+    def __repr__(self) -> str:
+        return f"AchievementType({type(self.schema).__name__}, size={self.size})"
+
+
+# achievement type > how its data is laid out, the one place that says so.
+# use registerAchievementType to add to them, so the tables below (and the compiled schemas) keep up
+ACHIEVEMENT_TYPES = {
+    achType: AchievementType(schema)
+    for achType, schema in {
+        "build-entity-achievement": Hex(4),
+        "combat-robot-count": Int,
+        "construct-with-robots-achievement": Tuple(Int, Hex(4)),
+        "deconstruct-with-robots-achievement": Int,
+        "deliver-by-robots-achievement": Hex(8),
+        "dont-build-entity-achievement": Hex(4),
+        "dont-craft-manually-achievement": Hex(8),
+        "dont-use-entity-in-energy-production-achievement": Double,
+        "finish-the-game-achievement": Hex(4),
+        "group-attack-achievement": Hex(4),
+        "kill-achievement": Double,
+        "player-damaged-achievement": Tuple(Float, Bool),
+        "produce-achievement": Double,
+        "produce-per-hour-achievement": Double,
+        "research-achievement": Hex(4),
+        "train-path-achievement": Double,
+        "achievement": Const("NoData"),
+        "NoneType": Const("NoneType"),
+    }.items()
+}
+# the modded file has no data for research achievements
+MODDED_ACHIEVEMENT_TYPES = {
+    **ACHIEVEMENT_TYPES,
+    "research-achievement": AchievementType(Const("NoData")),
+}
+
+# worked out from the types above by _derive, never changed on their own
+# achievement type > function that reads its data, what readAchData uses
+ACH_DECODERS = {}
+MODDED_ACH_DECODERS = {}
+# achievement type > function that writes its data, the other way around from ACH_DECODERS
+ACH_ENCODERS = {}
+MODDED_ACH_ENCODERS = {}
+# achievement type > schema of its data, for ACHIEVEMENTS and MODDED_ACHIEVEMENTS further down
+ACHIEVEMENT_DATA = {}
+MODDED_ACHIEVEMENT_DATA = {}
+# achievement type > how many bytes its data is, None when that depends on the data
+ACH_DATA_SIZES = {}
+MODDED_ACH_DATA_SIZES = {}
+
+
+def _derive() -> None:
+    for types, decoders, encoders, schemas, sizes in (
+        (
+            ACHIEVEMENT_TYPES,
+            ACH_DECODERS,
+            ACH_ENCODERS,
+            ACHIEVEMENT_DATA,
+            ACH_DATA_SIZES,
+        ),
+        (
+            MODDED_ACHIEVEMENT_TYPES,
+            MODDED_ACH_DECODERS,
+            MODDED_ACH_ENCODERS,
+            MODDED_ACHIEVEMENT_DATA,
+            MODDED_ACH_DATA_SIZES,
+        ),
+    ):
+        for table in (decoders, encoders, schemas, sizes):
+            table.clear()
+        for achType, achievementType in types.items():
+            decoders[achType] = achievementType.decode
+            encoders[achType] = achievementType.encode
+            schemas[achType] = achievementType.schema
+            sizes[achType] = achievementType.size
+
+
+_derive()
+
+
+def registerAchievementType(
+    achType: str, schema: Schema, moddedSchema: Schema = None
+) -> None:
+    """Adds (or replaces) how an achievement type's data is laid out, for types added by mods or newer versions.
+    every reader and writer picks it up, the compiled schemas, the push parsers and the validators included
+
+    Args:
+        achType (str): The achievement type, like "kill-achievement".
+        schema (Schema): The schema of its data, see Data/IO/schema.py.
+        moddedSchema (Schema, optional): The schema of its data in achievements-modded.dat, if that is different. Defaults to schema.
+    """
+    ACHIEVEMENT_TYPES[achType] = AchievementType(schema)
+    MODDED_ACHIEVEMENT_TYPES[achType] = (
+        ACHIEVEMENT_TYPES[achType]
+        if moddedSchema is None
+        else AchievementType(moddedSchema)
+    )
+    _derive()
+    achievementsCodec.recompile()
+    moddedAchievementsCodec.recompile()
+
+
+def readAchData(
+    f: io.BufferedReader | io.BytesIO | BufferReader, achType: str, modded=False
+) -> Any:
+    try:
+        decoder = (MODDED_ACH_DECODERS if modded else ACH_DECODERS)[achType]
+    except KeyError:
+        raise ValueError(f"Unknown achievement type: {achType}") from None
+    return decoder(f)
+
+
+def _unknownDecoder(
+    achType: str,
+) -> Callable[[io.BufferedReader | io.BytesIO | BufferReader], Any]:
+    def decoder(f: io.BufferedReader | io.BytesIO | BufferReader) -> Any:
+        raise ValueError(f"Unknown achievement type: {achType}")
+
+    return decoder
+
+
+def getIndexDecoders(achs: list) -> list:
+    """Looks up the decoder for every index in the header once, so reading the content is a list index per achievement.
+    a type there is no decoder for gets one that raises, so it's only an error if an achievement of that type is read
+
+    Args:
+        achs (list): The achievement header.
+
+    Returns:
+        list: index > decoder, None for indexes that aren't in the header.
+    """
+    indexLink = getIndexLink(achs)
+    decoders = [None] * (max(int(index) for index in indexLink) + 1)
+    for index, achType in indexLink.items():
+        index = int(index)
+        if index < 0:
+            continue
+        decoder = ACH_DECODERS.get(achType)
+        decoders[index] = _unknownDecoder(achType) if decoder is None else decoder
+    return decoders
+
+
+def readContent(
+    f: io.BufferedReader | io.BytesIO | BufferReader, indexLink: list | dict
+) -> dict:
     index = readShort(f)
-    # print(f.tell(), index)
-    data = readAchData(f, indexLink[str(index)])
+    if type(indexLink) == dict:
+        # the old index > type name dict
+        data = readAchData(f, indexLink[str(index)])
+    else:
+        decoder = indexLink[index] if index >= 0 else None
+        if decoder is None:
+            raise KeyError(str(index))
+        data = decoder(f)
     return {"index": index, "content": data}
 
 
-def readModdedContent(f: io.BufferedReader | io.BytesIO) -> dict:
-    achType = readString(f, spaceOptimized=True)
-    achName = readString(f, spaceOptimized=True)
+def readContents(
+    f: io.BufferedReader | io.BytesIO | BufferReader, decoders: list
+) -> list:
+    """Reads the achievement content of achievements.dat, a short array of index then data.
+
+    Args:
+        f (io.BufferedReader | io.BytesIO | BufferReader): The file to read from.
+        decoders (list): From getIndexDecoders.
+
+    Returns:
+        list: The content.
+    """
+    content = []
+    unpackShort = SHORT.unpack
+    read = f.read
+    count = len(decoders)
+    for i in range(readShort(f)):
+        index = unpackShort(read(2))[0]
+        decoder = decoders[index] if 0 <= index < count else None
+        if decoder is None:
+            raise KeyError(str(index))
+        content.append({"index": index, "content": decoder(f)})
+    return content
+
+
+def readModdedContent(
+    f: io.BufferedReader | io.BytesIO | BufferReader, symbols: SymbolTable = None
+) -> dict:
+    achType = readString(f, spaceOptimized=True, symbols=symbols)
+    achName = readString(f, spaceOptimized=True, symbols=symbols)
     achData = readAchData(f, achType, modded=True)
     return {"type": achType, "name": achName, "data": achData}
 
 
+def readModdedContents(
+    f: io.BufferedReader | io.BytesIO | BufferReader, symbols: SymbolTable = None
+) -> list:
+    """Reads the achievement content of achievements-modded.dat, an array of type, name then data.
+
+    Args:
+        f (io.BufferedReader | io.BytesIO | BufferReader): The file to read from.
+        symbols (SymbolTable, optional): See readString. Defaults to None.
+
+    Returns:
+        list: The content.
+    """
+    content = []
+    decoders = MODDED_ACH_DECODERS
+    for i in range(readUInt(f)):
+        achType = readString(f, spaceOptimized=True, symbols=symbols)
+        achName = readString(f, spaceOptimized=True, symbols=symbols)
+        try:
+            decoder = decoders[achType]
+        except KeyError:
+            raise ValueError(f"Unknown achievement type: {achType}") from None
+        content.append({"type": achType, "name": achName, "data": decoder(f)})
+    return content
+
+
 def getIndexLink(achs: list) -> dict:
     indexLink = {}
     for achType in achs:
@@ -124,36 +401,34 @@ def getIndexLink(achs: list) -> dict:
     return indexLink
 
 
-def getTracked(f: io.BufferedReader | io.BytesIO) -> list:
+def getTracked(f: io.BufferedReader | io.BytesIO | BufferReader) -> list:
     """Reads a variable amount of bytes and interprets them as a series of shorts that represent tracked achievements
     Note: reads until the end of the file
 
 
     Args:
-        f (io.BufferedReader | io.BytesIO): the file to read from
+        f (io.BufferedReader | io.BytesIO | BufferReader): the file to read from
 
     Raises:
         ValueError: raises an error if the amount of bytes left is odd (shorts are 2 bytes)
 
     Returns:
-        list: _description_
+        list: the indexes of the tracked achievements
     """
-    start = f.tell()
-    f.read()
-    space = f.tell()
-    achsAmt = (space - start) / 2
-    if int(achsAmt) != achsAmt:
+    data = f.read()
+    if len(data) % 2 != 0:
         raise ValueError(
             "Tracked Achievement amount isn't able to be an integer, there is an odd amount of bytes, Malformed File?"
         )
-    trackedAchs = []
-    f.seek(start)
-    for i in range(int(achsAmt)):
-        trackedAchs.append(readShort(f))
-    return trackedAchs
+    return readPrimitiveRun(BufferReader(data), len(data) // 2, SHORT, asList=True)
 
 
-def readAchievements(f: io.BufferedReader | io.BytesIO, modded=False) -> dict:
+def readAchievements(
+    f: io.BufferedReader | io.BytesIO | BufferReader,
+    modded=False,
+    cache: ParseCache = None,
+    symbols: SymbolTable = None,
+) -> dict:
     """
     Reads the achievements from the file assuming achievements.dat format.
 
@@ -161,14 +436,21 @@ def readAchievements(f: io.BufferedReader | io.BytesIO, modded=False) -> dict:
     further data restructuring may be useful to make it more readable
 
     Args:
-        f (io.BufferedReader | io.BytesIO): The file to read from.
+        f (io.BufferedReader | io.BytesIO | BufferReader): The file to read from.
         modded (bool, optional): Whether the file is modded. Defaults to False. if True then readModdedAchievements will be used
+        cache (ParseCache, optional): If given and f is an opened file, reuse what it parsed to last time, see parseCache.py. Defaults to None.
+        symbols (SymbolTable, optional): A pool shared between reads so the same names are one str, see symbols.py. not used for results that come from the cache. Defaults to None.
 
     Returns:
         dict: The achievement data
     """
+    if cache is not None:
+        kind = "moddedAchievements" if modded else "achievements"
+        return cache.read(
+            f, kind, lambda f: readAchievements(f, modded, symbols=symbols)
+        )
     if modded:
-        return readModdedAchievements(f)
+        return readModdedAchievements(f, symbols)
     # format documentated at https://wiki.factorio.com/Achievement_file_format#File_Format
     # i had to update it since it was out of date at the time
     achievements = dict()
@@ -177,17 +459,19 @@ def readAchievements(f: io.BufferedReader | io.BytesIO, modded=False) -> dict:
         f
     )  # who knows why this exists, but mod settings also has it
     # achievement types,name and index , see https://wiki.factorio.com/Achievement_file_format#Achievement_Header_Info for more info
-    achievements["header"] = readShortArray(f, readHeader)
-    # make a dict to help link indexs to achievement types
-    indexLink = getIndexLink(achievements["header"])
+    achievements["header"] = readShortArray(f, readHeader, symbols=symbols)
+    # make a list to help link indexs to how their achievement type is read
+    decoders = getIndexDecoders(achievements["header"])
     # achievement index and data, see https://wiki.factorio.com/Achievement_file_format#Achievement_Content_Info for more info
-    achievements["content"] = readShortArray(f, readContent, indexLink=indexLink)
+    achievements["content"] = readContents(f, decoders)
     # what achivements are tracked using their index, see https://wiki.factorio.com/Achievement_file_format#File_Format for more info
     achievements["tracked"] = getTracked(f)
     return achievements
 
 
-def readModdedAchievements(f: io.BufferedReader | io.BytesIO) -> dict:
+def readModdedAchievements(
+    f: io.BufferedReader | io.BytesIO | BufferReader, symbols: SymbolTable = None
+) -> dict:
     """
     Reads the achievements from the file assuming achievements-modded.dat format.
 
@@ -195,7 +479,8 @@ def readModdedAchievements(f: io.BufferedReader | io.BytesIO) -> dict:
     further data restructuring may be useful to make it more readable
 
     Args:
-        f (io.BufferedReader | io.BytesIO): The file to read from.
+        f (io.BufferedReader | io.BytesIO | BufferReader): The file to read from.
+        symbols (SymbolTable, optional): A pool shared between reads so the same names are one str, see symbols.py. Defaults to None.
 
     Returns:
         dict: The achievement data
@@ -208,14 +493,131 @@ def readModdedAchievements(f: io.BufferedReader | io.BytesIO) -> dict:
         f
     )  # who knows why this exists, but mod settings also has it
 
-    achievements["header"] = readShortArray(f, readHeader)
-    indexLink = getIndexLink(achievements["header"])
-    # print(json.dumps(indexLink, indent=4))
-    achievements["content"] = readArray(f, readModdedContent)
+    achievements["header"] = readShortArray(f, readHeader, symbols=symbols)
+    achievements["content"] = readModdedContents(f, symbols)
     achievements["tracked"] = getTracked(f)
     return achievements
 
 
+def writeAchData(
+    f: io.BufferedWriter | io.BytesIO, achType: str, data: Any, modded=False
+) -> None:
+    try:
+        encoder = (MODDED_ACH_ENCODERS if modded else ACH_ENCODERS)[achType]
+    except KeyError:
+        raise ValueError(f"Unknown achievement type: {achType}") from None
+    encoder(f, data)
+
+
+def writeHeader(f: io.BufferedWriter | io.BytesIO, data: list) -> None:
+    writeShort(f, len(data))
+    for achType in data:
+        writeString(f, achType["type"], spaceOptimize=True)
+        writeShort(f, len(achType["achs"]))
+        for ach in achType["achs"]:
+            writeString(f, ach["name"], spaceOptimize=True)
+            writeShort(f, ach["index"])
+
+
+def encodeAchievements(data: dict, modded=False) -> bytes:
+    """Encodes the achievements the same way the file has them, so encoding what readAchievements gives
+    is byte for byte the file it came from.
+
+    Args:
+        data (dict): The achievement data, as returned by readAchievements.
+        modded (bool, optional): Whether it is achievements-modded.dat. Defaults to False.
+
+    Raises:
+        ValueError: If there is an achievement type that isn't registered.
+
+    Returns:
+        bytes: The encoded achievements.
+    """
+    # the compiled schemas further down, which get their per type data from the registry like everything else
+    codec = moddedAchievementsCodec if modded else achievementsCodec
+    return bytes(codec.encode(data))
+
+
+def writeAchievements(
+    f: io.BufferedWriter | io.BytesIO, data: dict, modded=False
+) -> None:
+    """Writes the achievements to a file.
+    this encodes everything first then does one write, see encodeAchievements
+
+    Args:
+        f (io.BufferedWriter | io.BytesIO): A file-like object or bytes buffer.
+        data (dict): The achievement data to write.
+        modded (bool, optional): Whether it is achievements-modded.dat. Defaults to False.
+    """
+    f.write(encodeAchievements(data, modded))
+
+
+# the same formats as above, as schemas, see Data/IO/schema.py
+# achievementsCodec.read / moddedAchievementsCodec.read are the compiled versions of readAchievements / readModdedAchievements
+# the data of each type comes from ACHIEVEMENT_DATA / MODDED_ACHIEVEMENT_DATA, so from the registry at the top
+
+HEADER = Struct(
+    ("type", String(spaceOptimized=True)),
+    (
+        "achs",
+        Array(
+            Struct(("name", String(spaceOptimized=True)), ("index", Short)),
+            length=Short,
+        ),
+    ),
+)
+
+
+def getIndexTypes(achs: list) -> dict:
+    """getIndexLink but keyed by the int index, for the schemas
+
+    Args:
+        achs (list): The achievement header.
+
+    Returns:
+        dict: index > ach type
+    """
+    return {int(index): achType for index, achType in getIndexLink(achs).items()}
+
+
+ACHIEVEMENTS = Struct(
+    ("version", Version()),
+    ("randomBool", Bool),
+    ("header", Capture("indexLink", Array(HEADER, length=Short), getIndexTypes)),
+    (
+        "content",
+        Array(
+            Struct(
+                ("index", Short),
+                ("content", Switch("index", ACHIEVEMENT_DATA, lookup="indexLink")),
+            ),
+            length=Short,
+        ),
+    ),
+    ("tracked", Rest(Short)),
+)
+
+MODDED_ACHIEVEMENTS = Struct(
+    ("version", Version()),
+    ("randomBool", Bool),
+    ("header", Array(HEADER, length=Short)),
+    (
+        "content",
+        Array(
+            Struct(
+                ("type", String(spaceOptimized=True)),
+                ("name", String(spaceOptimized=True)),
+                ("data", Switch("type", MODDED_ACHIEVEMENT_DATA)),
+            )
+        ),
+    ),
+    ("tracked", Rest(Short)),
+)
+
+achievementsCodec = compileSchema(ACHIEVEMENTS)
+moddedAchievementsCodec = compileSchema(MODDED_ACHIEVEMENTS)
+
+
 # print("meow")
 
 
@@ -0,0 +1,164 @@
+import mmap
+import os
+from typing import NamedTuple
+
+from FactorioAPI.Data.Files.achievements import (
+    ACH_DECODERS,
+    ACHIEVEMENT_TYPES,
+    MODDED_ACH_DECODERS,
+    MODDED_ACHIEVEMENT_TYPES,
+    readHeader,
+    readShortArray,
+)
+from FactorioAPI.Data.IO.buffer import BufferReader
+from FactorioAPI.Data.IO.read import (
+    readBool,
+    readShort,
+    readString,
+    readUInt,
+    readVersionString,
+)
+
+"""
+changing an achievement's progress without reading and writing the whole file
+
+locateAchievements finds where every achievement's data starts. the progress of most types is a fixed width
+number at the start of the data (AchievementType.progress in achievements.py), so it gets overwritten right there in an mmap of the file
+and nothing else is touched. use writeAchievements (achievements.py) for anything that changes the size
+
+    patchAchievementProgress("achievements.dat", {"steam-all-the-way": 0.0})
+"""
+
+
+class AchievementLocation(NamedTuple):
+    """Where an achievement's data is in the file."""
+
+    name: str
+    type: str
+    # the index from the header, None in achievements-modded.dat
+    index: int | None
+    offset: int
+    size: int
+
+
+def locateAchievements(
+    data: bytes | bytearray | memoryview | mmap.mmap, modded: bool = False
+) -> list[AchievementLocation]:
+    """Finds where every achievement's data is.
+
+    Args:
+        data (bytes | bytearray | memoryview | mmap.mmap): The whole file.
+        modded (bool, optional): Whether it is achievements-modded.dat. Defaults to False.
+
+    Raises:
+        ValueError: If there is an achievement type with no decoder.
+
+    Returns:
+        list[AchievementLocation]: Every achievement, in the order they are in the file.
+    """
+    reader = BufferReader(data)
+    try:
+        readVersionString(reader)
+        readBool(reader)
+        header = readShortArray(reader, readHeader)
+        if modded:
+            decoders = MODDED_ACH_DECODERS
+            count = readUInt(reader)
+        else:
+            decoders = ACH_DECODERS
+            # index > (type, name)
+            byIndex = {0: ("NoneType", "")}
+            for achType in header:
+                for ach in achType["achs"]:
+                    byIndex[ach["index"]] = (achType["type"], ach["name"])
+            count = readShort(reader)
+        locations = []
+        for i in range(count):
+            index = None
+            if modded:
+                achType = readString(reader, spaceOptimized=True)
+                name = readString(reader, spaceOptimized=True)
+            else:
+                index = readShort(reader)
+                achType, name = byIndex[index]
+            try:
+                decoder = decoders[achType]
+            except KeyError:
+                raise ValueError(f"Unknown achievement type: {achType}") from None
+            start = reader.pos
+            # the decoders are the easiest way to know how long the data is
+            decoder(reader)
+            locations.append(
+                AchievementLocation(name, achType, index, start, reader.pos - start)
+            )
+        return locations
+    finally:
+        reader.close()
+
+
+def _patch(view: memoryview, changes: dict, modded: bool) -> int:
+    # pack every value before writing any, so a bad name, type or value changes nothing
+    writes = []
+    found = set()
+    types = MODDED_ACHIEVEMENT_TYPES if modded else ACHIEVEMENT_TYPES
+    for location in locateAchievements(view, modded):
+        if location.name not in changes:
+            continue
+        # locateAchievements already checked the type is known
+        progress = types[location.type].progress
+        if progress is None:
+            raise ValueError(
+                f"{location.name} is a {location.type}, which has no fixed width progress"
+            )
+        s, offset = progress
+        writes.append((location.offset + offset, s.pack(changes[location.name])))
+        found.add(location.name)
+    missing = set(changes) - found
+    if missing:
+        raise KeyError(f"{sorted(missing)} aren't in the achievements")
+    for offset, packed in writes:
+        view[offset : offset + len(packed)] = packed
+    return len(writes)
+
+
+def patchAchievementProgressBuffer(
+    data: bytearray, changes: dict, modded: bool = False
+) -> int:
+    """Changes achievements' progress in an encoded achievements file in memory, see the top of this file.
+
+    Args:
+        data (bytearray): The encoded achievements, changed in place.
+        changes (dict): achievement name > new progress.
+        modded (bool, optional): Whether it is achievements-modded.dat. Defaults to False.
+
+    Returns:
+        int: How many achievements were changed.
+    """
+    with memoryview(data) as view:
+        return _patch(view, changes, modded)
+
+
+def patchAchievementProgress(
+    path: str | os.PathLike, changes: dict, modded: bool = False
+) -> int:
+    """Changes achievements' progress in an achievements file, see the top of this file.
+
+    Args:
+        path (str | os.PathLike): The achievements.dat or achievements-modded.dat file.
+        changes (dict): achievement name > new progress, like {"steam-all-the-way": 0.0}.
+        modded (bool, optional): Whether it is achievements-modded.dat. Defaults to False.
+
+    Raises:
+        KeyError: If an achievement isn't in the file.
+        ValueError: If an achievement's type has no fixed width progress.
+        struct.error: If a new progress can't be packed as its type's number, nothing is written then either.
+
+    Returns:
+        int: How many achievements were changed.
+    """
+    with open(path, "r+b") as f:
+        with mmap.mmap(f.fileno(), 0) as mapped:
+            with memoryview(mapped) as view:
+                changed = _patch(view, changes, modded)
+            mapped.flush()
+    return changed
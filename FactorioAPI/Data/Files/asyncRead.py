@@ -0,0 +1,119 @@
+import asyncio
+from typing import AsyncIterable, AsyncIterator
+
+from FactorioAPI.Data.Files.incremental import (
+    AchievementsPushParser,
+    ModSettingsPushParser,
+)
+from FactorioAPI.Data.IO.push import PushParser
+
+"""
+readModSettings / readAchievements / readModdedAchievements for asyncio
+
+they take an asyncio.StreamReader or any async iterable of bytes (an upload body, aiofiles, ...),
+read it in big chunks and hand them to the push parsers from incremental.py, which decode them
+straight away without blocking on anything. the chunks are fed DECODE_STEP bytes at a time with the event loop
+getting a turn after each, so a huge chunk (a whole upload body at once) doesn't hold up everything else
+and lots of files can be read at once on one thread
+
+    reader, writer = await asyncio.open_connection(host, port)
+    settings = await readModSettingsAsync(reader)
+"""
+
+DEFAULT_CHUNK_SIZE = 1 << 16
+# the most bytes decoded before the event loop gets a turn, a few milliseconds of work
+DECODE_STEP = 1 << 14
+
+AsyncSource = asyncio.StreamReader | AsyncIterable[bytes]
+
+
+async def _chunks(source: AsyncSource, chunkSize: int) -> AsyncIterator[bytes]:
+    if isinstance(source, asyncio.StreamReader) or (
+        hasattr(source, "read") and not hasattr(source, "__aiter__")
+    ):
+        while True:
+            chunk = await source.read(chunkSize)
+            if not chunk:
+                return
+            yield chunk
+    else:
+        async for chunk in source:
+            yield chunk
+
+
+async def iterSectionsAsync(
+    parser: PushParser, source: AsyncSource, chunkSize: int = DEFAULT_CHUNK_SIZE
+) -> AsyncIterator[tuple]:
+    """Feeds a push parser from an async source, giving back each top level section once it is done.
+    parser.close() has been called by the time this finishes, so parser.result is the whole thing
+
+    Args:
+        parser (PushParser): A parser from incremental.py.
+        source (AsyncSource): An asyncio.StreamReader or an async iterable of bytes.
+        chunkSize (int, optional): How much to read at once from a StreamReader. Defaults to DEFAULT_CHUNK_SIZE.
+
+    Returns:
+        AsyncIterator[tuple]: (key, value) for each section, in order.
+    """
+    async for chunk in _chunks(source, chunkSize):
+        view = memoryview(chunk)
+        for start in range(0, len(view), DECODE_STEP):
+            for section in parser.feed(view[start : start + DECODE_STEP]):
+                yield section
+            # let everything else on the loop run, however big the chunk was
+            await asyncio.sleep(0)
+    parser.close()
+    for section in parser.emitted():
+        yield section
+
+
+async def _read(parser: PushParser, source: AsyncSource, chunkSize: int) -> dict:
+    async for section in iterSectionsAsync(parser, source, chunkSize):
+        pass
+    return parser.result
+
+
+async def readModSettingsAsync(
+    source: AsyncSource, chunkSize: int = DEFAULT_CHUNK_SIZE
+) -> dict:
+    """Reads the mod settings without blocking, see the top of this file.
+
+    Args:
+        source (AsyncSource): An asyncio.StreamReader or an async iterable of bytes.
+        chunkSize (int, optional): How much to read at once from a StreamReader. Defaults to DEFAULT_CHUNK_SIZE.
+
+    Returns:
+        dict: The mod settings.
+    """
+    return await _read(ModSettingsPushParser(), source, chunkSize)
+
+
+async def readAchievementsAsync(
+    source: AsyncSource, modded: bool = False, chunkSize: int = DEFAULT_CHUNK_SIZE
+) -> dict:
+    """Reads the achievements without blocking, see the top of this file.
+
+    Args:
+        source (AsyncSource): An asyncio.StreamReader or an async iterable of bytes.
+        modded (bool, optional): Whether it is achievements-modded.dat. Defaults to False.
+        chunkSize (int, optional): How much to read at once from a StreamReader. Defaults to DEFAULT_CHUNK_SIZE.
+
+    Returns:
+        dict: The achievement data.
+    """
+    return await _read(AchievementsPushParser(modded), source, chunkSize)
+
+
+async def readModdedAchievementsAsync(
+    source: AsyncSource, chunkSize: int = DEFAULT_CHUNK_SIZE
+) -> dict:
+    """Reads the achievements without blocking, assuming achievements-modded.dat format.
+
+    Args:
+        source (AsyncSource): An asyncio.StreamReader or an async iterable of bytes.
+        chunkSize (int, optional): How much to read at once from a StreamReader. Defaults to DEFAULT_CHUNK_SIZE.
+
+    Returns:
+        dict: The achievement data.
+    """
+    return await _read(AchievementsPushParser(modded=True), source, chunkSize)
@@ -0,0 +1,214 @@
+from functools import partial
+from typing import Any, Callable, Iterable
+
+from FactorioAPI.Data.Files.achievements import (
+    ACHIEVEMENT_TYPES,
+    MODDED_ACHIEVEMENT_TYPES,
+    getIndexLink,
+)
+from FactorioAPI.Data.IO.codec import DOUBLE, SHORT, UINT
+from FactorioAPI.Data.IO.push import (
+    REST,
+    Parse,
+    PushParser,
+    pullBool,
+    pullSchema,
+    pullString,
+    pullStruct,
+    pullVersionString,
+)
+
+"""
+readModSettings / readAchievements / readModdedAchievements for bytes that arrive in chunks, see Data/IO/push.py
+
+    parser = ModSettingsPushParser()
+    for chunk in response.iter_content(65536):
+        for key, value in parser.feed(chunk):
+            print("got", key)
+    settings = parser.close()
+
+feed() gives back each top level section as (key, value) as soon as all of it has arrived,
+"version" first and then every key of the mod settings ("startup", "runtime-global", ...), or for achievements
+"version", "randomBool", "header", "content" and "tracked" (which only comes from close(), it runs to the end).
+close() gives back the same thing the normal reader would
+"""
+
+
+def pullPTString() -> Parse:
+    """readPTString, see modSettings.py"""
+    if (yield 1) == b"\x01":
+        return None
+    return (yield from pullString(spaceOptimized=True))
+
+
+def pullPropertyTree() -> Parse:
+    """readPropertyTree, see modSettings.py"""
+    # type byte and the any type flag
+    dataType = (yield 2)[0]
+    if dataType == 0:
+        return None
+    elif dataType == 1:
+        return (yield 1) == b"\x01"
+    elif dataType == 2:
+        return DOUBLE.unpack((yield 8))[0]
+    elif dataType == 3:
+        return (yield from pullPTString())
+    elif dataType == 4:
+        data = []
+        for i in range(UINT.unpack((yield 4))[0]):
+            data.append((yield from pullPropertyTree()))
+        return data
+    elif dataType == 5:
+        data = {}
+        for i in range(UINT.unpack((yield 4))[0]):
+            key = yield from pullPTString()
+            data[key] = yield from pullPropertyTree()
+        return data
+    raise ValueError(f"Unknown property tree type {dataType}")
+
+
+def parseModSettings(emit: Callable[[Any], None]) -> Parse:
+    settings = {}
+    settings["version"] = yield from pullVersionString()
+    emit(("version", settings["version"]))
+    yield 1
+    # the root is always a dict, its entries are the sections
+    dataType = (yield 2)[0]
+    if dataType != 5:
+        raise ValueError(f"The mod settings should be a dict, not type {dataType}")
+    for i in range(UINT.unpack((yield 4))[0]):
+        key = yield from pullPTString()
+        settings[key] = yield from pullPropertyTree()
+        emit((key, settings[key]))
+    return settings
+
+
+def pullAchData(achType: str, modded: bool = False) -> Parse:
+    """readAchData, see achievements.py"""
+    try:
+        achievementType = (MODDED_ACHIEVEMENT_TYPES if modded else ACHIEVEMENT_TYPES)[
+            achType
+        ]
+    except KeyError:
+        raise ValueError(f"Unknown achievement type: {achType}") from None
+    size = achievementType.size
+    if size is None:
+        # its lengths are pulled first and then the rest in as few yields as it can, see pullSchema
+        return (yield from pullSchema(achievementType.schema, achievementType.codec))
+    return achievementType.codec.decode((yield size) if size else b"")[0]
+
+
+def pullShortArray(item: Callable[[], Parse]) -> Parse:
+    """readShortArray, see achievements.py"""
+    data = []
+    for i in range(SHORT.unpack((yield 2))[0]):
+        data.append((yield from item()))
+    return data
+
+
+def _pullHeader() -> Parse:
+    achType = yield from pullString(spaceOptimized=True)
+    achs = yield from pullShortArray(_pullHeaderSubobject)
+    return {"type": achType, "achs": achs}
+
+
+def _pullHeaderSubobject() -> Parse:
+    name = yield from pullString(spaceOptimized=True)
+    index = yield from pullStruct(SHORT)
+    return {"name": name, "index": index}
+
+
+def pullTracked() -> Parse:
+    """getTracked, see achievements.py, takes every byte up to the end"""
+    tracked = []
+    pending = b""
+    while True:
+        data = yield REST
+        if not data:
+            break
+        data = pending + data
+        even = len(data) & ~1
+        tracked.extend(value for (value,) in SHORT.iter_unpack(data[:even]))
+        pending = data[even:]
+    if pending:
+        raise ValueError(
+            "Tracked Achievement amount isn't able to be an integer, there is an odd amount of bytes, Malformed File?"
+        )
+    return tracked
+
+
+def parseAchievements(emit: Callable[[Any], None], modded: bool = False) -> Parse:
+    achievements = {}
+    achievements["version"] = yield from pullVersionString()
+    emit(("version", achievements["version"]))
+    achievements["randomBool"] = yield from pullBool()
+    emit(("randomBool", achievements["randomBool"]))
+    achievements["header"] = yield from pullShortArray(_pullHeader)
+    emit(("header", achievements["header"]))
+    content = []
+    if modded:
+        for i in range(UINT.unpack((yield 4))[0]):
+            achType = yield from pullString(spaceOptimized=True)
+            name = yield from pullString(spaceOptimized=True)
+            data = yield from pullAchData(achType, modded=True)
+            content.append({"type": achType, "name": name, "data": data})
+    else:
+        indexLink = getIndexLink(achievements["header"])
+        for i in range(SHORT.unpack((yield 2))[0]):
+            index = yield from pullStruct(SHORT)
+            data = yield from pullAchData(indexLink[str(index)])
+            content.append({"index": index, "content": data})
+    achievements["content"] = content
+    emit(("content", content))
+    achievements["tracked"] = yield from pullTracked()
+    emit(("tracked", achievements["tracked"]))
+    return achievements
+
+
+class ModSettingsPushParser(PushParser):
+    """readModSettings for chunks of bytes, see the top of this file."""
+
+    def __init__(self) -> None:
+        super().__init__(parseModSettings)
+
+
+class AchievementsPushParser(PushParser):
+    """readAchievements for chunks of bytes, see the top of this file."""
+
+    def __init__(self, modded: bool = False) -> None:
+        """
+        Args:
+            modded (bool, optional): Whether it is achievements-modded.dat. Defaults to False.
+        """
+        super().__init__(partial(parseAchievements, modded=modded))
+
+
+def readModSettingsChunks(chunks: Iterable[bytes]) -> dict:
+    """Reads the mod settings from chunks of bytes, like a streamed download.
+
+    Args:
+        chunks (Iterable[bytes]): The bytes of the file, in order.
+
+    Returns:
+        dict: The mod settings.
+    """
+    parser = ModSettingsPushParser()
+    for chunk in chunks:
+        parser.feed(chunk)
+    return parser.close()
+
+
+def readAchievementsChunks(chunks: Iterable[bytes], modded: bool = False) -> dict:
+    """Reads the achievements from chunks of bytes, like a streamed download.
+
+    Args:
+        chunks (Iterable[bytes]): The bytes of the file, in order.
+        modded (bool, optional): Whether it is achievements-modded.dat. Defaults to False.
+
+    Returns:
+        dict: The achievement data.
+    """
+    parser = AchievementsPushParser(modded)
+    for chunk in chunks:
+        parser.feed(chunk)
+    return parser.close()
@@ -0,0 +1,341 @@
+import io
+from collections.abc import Mapping, Sequence
+from typing import Any, Iterator
+
+from FactorioAPI.Data.Files.modSettings import propertyTreeCodec
+from FactorioAPI.Data.IO.buffer import BufferReader
+from FactorioAPI.Data.IO.codec import UINT, VERSION
+
+"""
+a lazy version of readModSettings
+
+one pass goes over the whole property tree without decoding any values, just skipping over them,
+and writes down where every dict entry and list item starts (PropertyTreeIndex).
+LazyDict and LazyList then only decode something when it is asked for, and keep it once it has been
+
+so settings["startup"]["some-setting"]["value"] is 3 dict lookups and decoding 1 double,
+instead of building every dict in the file
+
+the lazy tree keeps the buffer it came from alive, for a BufferReader.open() that means the mmap stays open
+"""
+
+
+def skipPTString(view: memoryview | bytes, pos: int) -> int:
+    """Skips over a property tree string.
+
+    Args:
+        view (memoryview | bytes): The buffer.
+        pos (int): Where the string starts.
+
+    Returns:
+        int: Where the string ends.
+    """
+    if view[pos] == 1:
+        # no string, just the flag
+        return pos + 1
+    length = view[pos + 1]
+    pos += 2
+    if length == 255:
+        length = UINT.unpack_from(view, pos)[0]
+        pos += 4
+    return pos + length
+
+
+def readPTStringAt(view: memoryview | bytes, pos: int) -> tuple[str | None, int]:
+    """readPTString but on a buffer and an offset.
+
+    Args:
+        view (memoryview | bytes): The buffer.
+        pos (int): Where the string starts.
+
+    Returns:
+        tuple[str | None, int]: The string (None if it has no string) and where it ends.
+    """
+    if view[pos] == 1:
+        return None, pos + 1
+    length = view[pos + 1]
+    pos += 2
+    if length == 255:
+        length = UINT.unpack_from(view, pos)[0]
+        pos += 4
+    return str(view[pos : pos + length], "utf-8"), pos + length
+
+
+def skipPropertyTree(view: memoryview | bytes, pos: int) -> int:
+    """Skips over a whole property tree node, without decoding anything in it.
+
+    Args:
+        view (memoryview | bytes): The buffer.
+        pos (int): Where the node starts.
+
+    Raises:
+        ValueError: If the node has an unknown type.
+
+    Returns:
+        int: Where the node ends.
+    """
+    dataType = view[pos]
+    # type byte and the any type flag
+    pos += 2
+    if dataType == 0:
+        return pos
+    elif dataType == 1:
+        return pos + 1
+    elif dataType == 2:
+        return pos + 8
+    elif dataType == 3:
+        return skipPTString(view, pos)
+    elif dataType == 4:
+        count = UINT.unpack_from(view, pos)[0]
+        pos += 4
+        for i in range(count):
+            pos = skipPropertyTree(view, pos)
+        return pos
+    elif dataType == 5:
+        count = UINT.unpack_from(view, pos)[0]
+        pos += 4
+        for i in range(count):
+            pos = skipPTString(view, pos)
+            pos = skipPropertyTree(view, pos)
+        return pos
+    raise ValueError(f"Unknown property tree type {dataType} at byte {pos - 2}")
+
+
+class PropertyTreeIndex:
+    """Where everything in a property tree is, made with one skip-scan pass.
+
+    dicts maps the offset of every dict node to {key: offset of the value}
+    lists maps the offset of every list node to [offset of each item]
+    """
+
+    __slots__ = ("view", "dicts", "lists", "end")
+
+    def __init__(self, view: memoryview | bytes, pos: int) -> None:
+        """
+        Args:
+            view (memoryview | bytes): The buffer the tree is in.
+            pos (int): Where the root node starts.
+        """
+        self.view = view
+        self.dicts = {}
+        self.lists = {}
+        self.end = self._scan(pos)
+
+    def _scan(self, pos: int) -> int:
+        view = self.view
+        dicts = self.dicts
+        lists = self.lists
+        unpackUInt = UINT.unpack_from
+
+        def scan(pos: int) -> int:
+            dataType = view[pos]
+            if dataType == 5:
+                start = pos
+                count = unpackUInt(view, pos + 2)[0]
+                pos += 6
+                entries = {}
+                for i in range(count):
+                    # the key, inlined readPTStringAt
+                    if view[pos] == 1:
+                        key = None
+                        pos += 1
+                    else:
+                        length = view[pos + 1]
+                        pos += 2
+                        if length == 255:
+                            length = unpackUInt(view, pos)[0]
+                            pos += 4
+                        key = str(view[pos : pos + length], "utf-8")
+                        pos += length
+                    entries[key] = pos
+                    # the value, bools and doubles are the common case so they're done here
+                    valueType = view[pos]
+                    if valueType == 1:
+                        pos += 3
+                    elif valueType == 2:
+                        pos += 10
+                    else:
+                        pos = scan(pos)
+                dicts[start] = entries
+                return pos
+            elif dataType == 4:
+                start = pos
+                count = unpackUInt(view, pos + 2)[0]
+                pos += 6
+                items = []
+                for i in range(count):
+                    items.append(pos)
+                    pos = scan(pos)
+                lists[start] = items
+                return pos
+            # everything else has nothing inside it worth indexing
+            return skipPropertyTree(view, pos)
+
+        return scan(pos)
+
+    def node(self, pos: int) -> "Any | LazyDict | LazyList":
+        """Gets the node at an offset, dicts and lists come back lazy, anything else is decoded.
+
+        Args:
+            pos (int): Where the node starts.
+
+        Returns:
+            Any | LazyDict | LazyList: The node.
+        """
+        dataType = self.view[pos]
+        if dataType == 5:
+            return LazyDict(self, pos)
+        elif dataType == 4:
+            return LazyList(self, pos)
+        return propertyTreeCodec.decode(self.view, pos)[0]
+
+
+class LazyDict(Mapping):
+    """A property tree dict that only decodes values when they are asked for."""
+
+    __slots__ = ("_index", "_offset", "_entries", "_cache")
+
+    def __init__(self, index: PropertyTreeIndex, offset: int, extra: dict = None):
+        """
+        Args:
+            index (PropertyTreeIndex): The index of the tree this is in.
+            offset (int): Where this dict's node starts.
+            extra (dict, optional): Already decoded entries that go first, like the mod settings version. Defaults to None.
+        """
+        self._index = index
+        self._offset = offset
+        self._entries = index.dicts[offset]
+        self._cache = {} if extra is None else dict(extra)
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return self._cache[key]
+        except KeyError:
+            pass
+        value = self._index.node(self._entries[key])
+        self._cache[key] = value
+        return value
+
+    def __iter__(self) -> Iterator:
+        for key in self._cache:
+            if key not in self._entries:
+                yield key
+        yield from self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries) + sum(
+            1 for key in self._cache if key not in self._entries
+        )
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._entries or key in self._cache
+
+    def offsetOf(self, key: str) -> int:
+        """
+        Args:
+            key (str): A key of this dict.
+
+        Returns:
+            int: The byte offset of the key's value node.
+        """
+        return self._entries[key]
+
+    def getPath(self, path: str | list | tuple, sep: str = ".") -> Any:
+        """Gets a value nested in dicts, like "startup.some-setting.value".
+
+        Args:
+            path (str | list | tuple): The keys, as a list or joined by sep.
+            sep (str, optional): What the keys are joined by if path is a string. Defaults to ".".
+
+        Returns:
+            Any: The value.
+        """
+        if isinstance(path, str):
+            path = path.split(sep)
+        node = self
+        for key in path:
+            node = node[key]
+        return node
+
+    def toDict(self) -> dict:
+        """
+        Returns:
+            dict: The whole dict decoded, the same as readPropertyTree would give.
+        """
+        data = {
+            key: value for key, value in self._cache.items() if key not in self._entries
+        }
+        data.update(propertyTreeCodec.decode(self._index.view, self._offset)[0])
+        return data
+
+    def __repr__(self) -> str:
+        return f"LazyDict({len(self)} keys at byte {self._offset})"
+
+
+class LazyList(Sequence):
+    """A property tree list that only decodes items when they are asked for."""
+
+    __slots__ = ("_index", "_offset", "_items", "_cache")
+
+    def __init__(self, index: PropertyTreeIndex, offset: int) -> None:
+        """
+        Args:
+            index (PropertyTreeIndex): The index of the tree this is in.
+            offset (int): Where this list's node starts.
+        """
+        self._index = index
+        self._offset = offset
+        self._items = index.lists[offset]
+        self._cache = {}
+
+    def __getitem__(self, i: int | slice) -> Any:
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self._items)))]
+        if i < 0:
+            i += len(self._items)
+        try:
+            return self._cache[i]
+        except KeyError:
+            pass
+        value = self._index.node(self._items[i])
+        self._cache[i] = value
+        return value
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def toList(self) -> list:
+        """
+        Returns:
+            list: The whole list decoded, the same as readPropertyTree would give.
+        """
+        return propertyTreeCodec.decode(self._index.view, self._offset)[0]
+
+    def __repr__(self) -> str:
+        return f"LazyList({len(self)} items at byte {self._offset})"
+
+
+def readModSettingsLazy(
+    f: io.BufferedReader | io.BytesIO | BufferReader | bytes | bytearray,
+) -> LazyDict:
+    """Reads the mod settings lazily, see the top of this file.
+    the result acts like the dict readModSettings gives, with "version" in it too
+
+    Args:
+        f (io.BufferedReader | io.BytesIO | BufferReader | bytes | bytearray): Where to read from. a file is read in one go, a BufferReader isn't copied.
+
+    Returns:
+        LazyDict: The mod settings.
+    """
+    if isinstance(f, BufferReader):
+        view, pos = f.view, f.pos
+    elif isinstance(f, (bytes, bytearray, memoryview)):
+        view, pos = memoryview(f).cast("B"), 0
+    else:
+        view, pos = memoryview(f.read()), 0
+    version = list(VERSION.unpack_from(view, pos))
+    # version and the bool after it
+    index = PropertyTreeIndex(view, pos + 9)
+    if isinstance(f, BufferReader):
+        f.pos = index.end
+    return LazyDict(index, pos + 9, {"version": version})
@@ -1,4 +1,7 @@
 import io
+from FactorioAPI.Data.Files.parseCache import ParseCache
+from FactorioAPI.Data.IO.buffer import BufferReader, BufferWriter
+from FactorioAPI.Data.IO.symbols import SymbolTable
 from FactorioAPI.Data.IO.read import (
     readArray,
     readBool,
@@ -8,7 +11,22 @@ from FactorioAPI.Data.IO.read import (
     readUByte,
     readVersionString,
 )
+from FactorioAPI.Data.IO.schema import (
+    Array,
+    Bool,
+    Const,
+    Dict,
+    Double,
+    Recursive,
+    String,
+    Struct,
+    Switch,
+    UByte,
+    Version,
+    compileSchema,
+)
 from FactorioAPI.Data.IO.write import (
+    sizeOfString,
     writeArray,
     writeBool,
     writeDict,
@@ -19,12 +37,17 @@ from FactorioAPI.Data.IO.write import (
 )
 
 
-def readPTString(f: io.BufferedReader | io.BytesIO, returnString: bool = False) -> str:
+def readPTString(
+    f: io.BufferedReader | io.BytesIO | BufferReader,
+    returnString: bool = False,
+    symbols: SymbolTable = None,
+) -> str:
     """Reads variable amount of bytes and interprets them as a property tree string.
 
     Args:
-        f (io.BufferedReader | io.BytesIO): A file-like object or bytes buffer.
+        f (io.BufferedReader | io.BytesIO | BufferReader): A file-like object, bytes buffer or BufferReader.
         returnString (bool, optional): If true, returns an empty string instead of None when there is no string. Defaults to False.
+        symbols (SymbolTable, optional): A shared pool for the strings, see readString. Defaults to None.
 
     Returns:
         str: The bytes read as a property tree string.
@@ -34,16 +57,17 @@ def readPTString(f: io.BufferedReader | io.BytesIO, returnString: bool = False)
         if returnString:
             return ""
         return None
-    return readString(f, spaceOptimized=True)
+    return readString(f, spaceOptimized=True, symbols=symbols)
 
 
 def readPropertyTree(
-    f: io.BufferedReader | io.BytesIO,
+    f: io.BufferedReader | io.BytesIO | BufferReader, symbols: SymbolTable = None
 ) -> None | bool | float | str | list | dict:
     """Reads variable amount of bytes and interprets them as a property tree.
 
     Args:
-        f (io.BufferedReader | io.BytesIO): A file-like object or bytes buffer.
+        f (io.BufferedReader | io.BytesIO | BufferReader): A file-like object, bytes buffer or BufferReader.
+        symbols (SymbolTable, optional): A shared pool for the keys and strings, see readString. Defaults to None.
 
     Returns:
         None | bool | float | str | list | dict: The bytes read as a property tree.
@@ -60,28 +84,38 @@ def readPropertyTree(
     elif dataType == 2:
         return readDouble(f)
     elif dataType == 3:
-        return readPTString(f)
+        return readPTString(f, symbols=symbols)
     elif dataType == 4:
         # print("cool")
-        return readArray(f, readPropertyTree)
+        return readArray(f, readPropertyTree, symbols=symbols)
     elif dataType == 5:
-        return readDict(f, readPTString, readPropertyTree)
+        return readDict(f, readPTString, readPropertyTree, symbols=symbols)
 
 
-def readModSettings(f: io.BufferedReader | io.BytesIO) -> dict:
+def readModSettings(
+    f: io.BufferedReader | io.BytesIO | BufferReader,
+    cache: ParseCache = None,
+    symbols: SymbolTable = None,
+) -> dict:
     """Reads the mod settings from a file or bytes buffer.
 
     Args:
-        f (io.BufferedReader | io.BytesIO): A file-like object or bytes buffer.
+        f (io.BufferedReader | io.BytesIO | BufferReader): A file-like object, bytes buffer or BufferReader.
+        cache (ParseCache, optional): If given and f is an opened file, reuse what it parsed to last time, see parseCache.py. Defaults to None.
+        symbols (SymbolTable, optional): A pool shared between reads so the same names are one str, see symbols.py. not used for results that come from the cache. Defaults to None.
 
     Returns:
         dict: The mod settings.
     """
+    if cache is not None:
+        return cache.read(
+            f, "modSettings", lambda f: readModSettings(f, symbols=symbols)
+        )
     settings = {}
     version = readVersionString(f)
     readBool(f)
     settings["version"] = version
-    settings.update(readPropertyTree(f))
+    settings.update(readPropertyTree(f, symbols=symbols))
     return settings
 
 
@@ -133,14 +167,154 @@ def writePropertyTree(
         writeDict(f, data, writePTString, writePropertyTree)
 
 
+def sizeOfPTString(data: str, emtpyAsNone: bool = False) -> int:
+    """Gets how many bytes writePTString will write for a string.
+
+    Args:
+        data (str): The property tree string that would be written.
+        emtpyAsNone (bool, optional): If true, treats an empty string as None. Defaults to False.
+
+    Returns:
+        int: The amount of bytes.
+    """
+    if data is None or (data == "" and emtpyAsNone):
+        return 1
+    return 1 + sizeOfString(data, spaceOptimize=True)
+
+
+def sizeOfPropertyTree(data: None | bool | float | int | str | list | dict) -> int:
+    """Gets exactly how many bytes writePropertyTree will write for some data.
+
+    Args:
+        data (None | bool | float | int | str | list | dict): The property tree that would be written.
+
+    Raises:
+        TypeError: If there is something in the tree that can't be a property tree.
+
+    Returns:
+        int: The amount of bytes.
+    """
+    # every node starts with the type byte and the any type flag
+    if data is None:
+        return 2
+    elif type(data) == bool:
+        return 3
+    elif type(data) == float or type(data) == int:
+        return 10
+    elif type(data) == str:
+        return 2 + sizeOfPTString(data)
+    elif type(data) == list:
+        size = 6
+        for v in data:
+            size += sizeOfPropertyTree(v)
+        return size
+    elif type(data) == dict:
+        size = 6
+        for k, v in data.items():
+            size += sizeOfPTString(k) + sizeOfPropertyTree(v)
+        return size
+    raise TypeError(f"Can't write {type(data).__name__} as a property tree")
+
+
+def encodeModSettings(data: dict) -> bytearray:
+    """Encodes the mod settings into one exactly sized buffer.
+    the size is worked out first so everything gets written into a single allocation
+
+    Args:
+        data (dict): The mod settings to encode, as returned by readModSettings.
+
+    Returns:
+        bytearray: The encoded mod settings.
+    """
+    # everything but the version is the property tree, done without popping so data isn't changed
+    tree = {k: v for k, v in data.items() if k != "version"}
+    # version + the bool after it + the tree
+    size = 9 + sizeOfPropertyTree(tree)
+    buffer = BufferWriter(size)
+    writeVersionString(buffer, data["version"])
+    writeBool(buffer, False)
+    writePropertyTree(buffer, tree)
+    return buffer.buffer
+
+
 def writeModSettings(f: io.BufferedWriter | io.BytesIO, data: dict) -> None:
     """Writes the mod settings to a file.
+    this encodes everything first then does one write, see encodeModSettings
 
     Args:
         f (io.BufferedWriter | io.BytesIO): A file-like object or bytes buffer.
         data (dict): The mod settings to write.
     """
+    f.write(encodeModSettings(data))
 
-    writeVersionString(f, data.pop("version"))
-    writeBool(f, False)
-    writePropertyTree(f, data)
+
+def propertyTreeType(data: None | bool | float | int | str | list | dict) -> int:
+    """Gets the property tree type byte for some data.
+
+    Args:
+        data (None | bool | float | int | str | list | dict): The data.
+
+    Raises:
+        TypeError: If the data can't be a property tree.
+
+    Returns:
+        int: The type, 0 none, 1 bool, 2 number, 3 string, 4 list, 5 dict.
+    """
+    if data is None:
+        return 0
+    elif type(data) == bool:
+        return 1
+    elif type(data) == float or type(data) == int:
+        return 2
+    elif type(data) == str:
+        return 3
+    elif type(data) == list:
+        return 4
+    elif type(data) == dict:
+        return 5
+    raise TypeError(f"Can't write {type(data).__name__} as a property tree")
+
+
+# the same format as everything above, as a schema, see Data/IO/schema.py
+# modSettingsCodec.read / modSettingsCodec.write are the compiled versions of readModSettings / writeModSettings
+
+PT_STRING = Struct(
+    ("_isNone", Bool, lambda data: data is None),
+    (
+        "value",
+        Switch("_isNone", {True: Const(None), False: String(spaceOptimized=True)}),
+    ),
+    result="value",
+)
+
+PROPERTY_TREE = Recursive("propertyTree")
+PROPERTY_TREE.define(
+    Struct(
+        ("_type", UByte, propertyTreeType),
+        ("_anyTypeFlag", Bool, lambda data: False),
+        (
+            "value",
+            Switch(
+                "_type",
+                {
+                    0: Const(None),
+                    1: Bool,
+                    2: Double,
+                    3: PT_STRING,
+                    4: Array(PROPERTY_TREE),
+                    5: Dict(PT_STRING, PROPERTY_TREE),
+                },
+            ),
+        ),
+        result="value",
+    )
+)
+
+MOD_SETTINGS = Struct(
+    ("version", Version()),
+    ("_randomBool", Bool, lambda data: False),
+    (Struct.SPREAD, PROPERTY_TREE),
+)
+
+modSettingsCodec = compileSchema(MOD_SETTINGS)
+propertyTreeCodec = compileSchema(PROPERTY_TREE)
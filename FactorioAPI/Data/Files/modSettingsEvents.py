@@ -0,0 +1,328 @@
+import io
+from typing import Any, Iterable, NamedTuple
+
+from FactorioAPI.Data.Files.lazyModSettings import skipPropertyTree
+from FactorioAPI.Data.Files.modSettings import (
+    propertyTreeType,
+    readPTString,
+    writePTString,
+)
+from FactorioAPI.Data.IO.buffer import BufferReader
+from FactorioAPI.Data.IO.codec import UINT
+from FactorioAPI.Data.IO.read import (
+    readBool,
+    readDouble,
+    readOptimizedNumber,
+    readUByte,
+    readUInt,
+    readVersionString,
+)
+from FactorioAPI.Data.IO.write import (
+    writeBool,
+    writeDouble,
+    writeUByte,
+    writeUInt,
+    writeVersionString,
+)
+
+"""
+walking a property tree one event at a time instead of building it
+
+iterPropertyTree / iterModSettings give back a PropertyTreeReader, which yields a PropertyTreeEvent for
+every node as it reads it, only ever holding the path to where it is, so memory doesn't grow with the file.
+stop iterating whenever, and call skip() right after a startDict / startList to jump over that whole subtree
+
+PropertyTreeEventWriter takes the same events and writes them back out, so a file can be turned into
+another one without the whole tree ever existing:
+
+    with open("in.dat", "rb") as src, open("out.dat", "wb") as dst:
+        events = iterModSettings(src)
+        writer = ModSettingsEventWriter(dst, events.version)
+        writer.writeAll(event for event in events if not isUnwanted(event))
+"""
+
+START_DICT = "startDict"
+END_DICT = "endDict"
+START_LIST = "startList"
+END_LIST = "endList"
+VALUE = "value"
+
+
+class PropertyTreeEvent(NamedTuple):
+    """One step of walking a property tree.
+
+    kind is one of START_DICT, END_DICT, START_LIST, END_LIST or VALUE
+    path is the keys (and list indexes) from the root to this node
+    type is the property tree type byte, see propertyTreeType
+    value is the decoded value for VALUE, how many children there are for a start, and None for an end
+    anyTypeFlag is the flag byte that comes after the type, None for an end
+    """
+
+    kind: str
+    path: tuple
+    type: int
+    value: Any
+    anyTypeFlag: bool | None = False
+
+
+class _Frame:
+    __slots__ = ("type", "remaining", "path", "index")
+
+    def __init__(self, dataType: int, remaining: int, path: tuple) -> None:
+        self.type = dataType
+        self.remaining = remaining
+        self.path = path
+        self.index = 0
+
+
+class PropertyTreeReader:
+    """Iterates over the events of one property tree, see the top of this file."""
+
+    def __init__(
+        self, f: io.BufferedReader | io.BytesIO | BufferReader, path: tuple = ()
+    ) -> None:
+        """
+        Args:
+            f (io.BufferedReader | io.BytesIO | BufferReader): Where to read from, positioned at the start of the tree.
+            path (tuple, optional): The path of the root node. Defaults to ().
+        """
+        self.f = f
+        self.version = None
+        self._stack = []
+        self._skip = False
+        self._events = self._walk(path)
+
+    def __iter__(self) -> "PropertyTreeReader":
+        return self
+
+    def __next__(self) -> PropertyTreeEvent:
+        return next(self._events)
+
+    def skip(self) -> None:
+        """Skips the rest of the dict or list that the last event started.
+        its end event still comes next, does nothing after any other event
+        """
+        self._skip = True
+
+    def _node(self, path: tuple) -> PropertyTreeEvent:
+        f = self.f
+        dataType = readUByte(f)
+        anyTypeFlag = readBool(f)
+        if dataType == 0:
+            return PropertyTreeEvent(VALUE, path, 0, None, anyTypeFlag)
+        elif dataType == 1:
+            return PropertyTreeEvent(VALUE, path, 1, readBool(f), anyTypeFlag)
+        elif dataType == 2:
+            return PropertyTreeEvent(VALUE, path, 2, readDouble(f), anyTypeFlag)
+        elif dataType == 3:
+            return PropertyTreeEvent(VALUE, path, 3, readPTString(f), anyTypeFlag)
+        elif dataType == 4 or dataType == 5:
+            count = readUInt(f)
+            self._stack.append(_Frame(dataType, count, path))
+            kind = START_LIST if dataType == 4 else START_DICT
+            return PropertyTreeEvent(kind, path, dataType, count, anyTypeFlag)
+        raise ValueError(f"Unknown property tree type {dataType} at {path}")
+
+    def _skipChildren(self, frame: _Frame) -> None:
+        f = self.f
+        for i in range(frame.remaining):
+            if frame.type == 5:
+                _skipPTString(f)
+            _skipNode(f)
+        frame.remaining = 0
+
+    def _walk(self, path: tuple):
+        stack = self._stack
+        event = self._node(path)
+        yield event
+        if self._skip:
+            self._skip = False
+            if stack:
+                self._skipChildren(stack[-1])
+        while stack:
+            frame = stack[-1]
+            if frame.remaining == 0:
+                stack.pop()
+                kind = END_LIST if frame.type == 4 else END_DICT
+                yield PropertyTreeEvent(kind, frame.path, frame.type, None, None)
+                continue
+            frame.remaining -= 1
+            if frame.type == 5:
+                childPath = frame.path + (readPTString(self.f),)
+            else:
+                childPath = frame.path + (frame.index,)
+                frame.index += 1
+            depth = len(stack)
+            event = self._node(childPath)
+            yield event
+            if self._skip:
+                self._skip = False
+                if len(stack) > depth:
+                    self._skipChildren(stack[-1])
+
+
+def _discard(f: io.BufferedReader | io.BytesIO | BufferReader, size: int) -> None:
+    if isinstance(f, BufferReader):
+        f.pos += size
+    else:
+        f.read(size)
+
+
+def _skipPTString(f: io.BufferedReader | io.BytesIO | BufferReader) -> None:
+    if not readBool(f):
+        _discard(f, readOptimizedNumber(f))
+
+
+def _skipNode(f: io.BufferedReader | io.BytesIO | BufferReader) -> None:
+    if isinstance(f, BufferReader):
+        f.pos = skipPropertyTree(f.view, f.pos)
+        return
+    dataType = readUByte(f)
+    readBool(f)
+    if dataType == 1:
+        _discard(f, 1)
+    elif dataType == 2:
+        _discard(f, 8)
+    elif dataType == 3:
+        _skipPTString(f)
+    elif dataType == 4 or dataType == 5:
+        for i in range(readUInt(f)):
+            if dataType == 5:
+                _skipPTString(f)
+            _skipNode(f)
+    elif dataType != 0:
+        raise ValueError(f"Unknown property tree type {dataType}")
+
+
+def iterPropertyTree(
+    f: io.BufferedReader | io.BytesIO | BufferReader,
+) -> PropertyTreeReader:
+    """Walks a property tree one event at a time, see the top of this file.
+
+    Args:
+        f (io.BufferedReader | io.BytesIO | BufferReader): A file-like object, bytes buffer or BufferReader.
+
+    Returns:
+        PropertyTreeReader: An iterator of PropertyTreeEvent.
+    """
+    return PropertyTreeReader(f)
+
+
+def iterModSettings(
+    f: io.BufferedReader | io.BytesIO | BufferReader,
+) -> PropertyTreeReader:
+    """Walks the mod settings one event at a time, see the top of this file.
+    the version is read straight away and put on the reader as .version
+
+    Args:
+        f (io.BufferedReader | io.BytesIO | BufferReader): A file-like object, bytes buffer or BufferReader.
+
+    Returns:
+        PropertyTreeReader: An iterator of PropertyTreeEvent.
+    """
+    version = readVersionString(f)
+    readBool(f)
+    reader = PropertyTreeReader(f)
+    reader.version = version
+    return reader
+
+
+class PropertyTreeEventWriter:
+    """Writes PropertyTreeEvents back out as a property tree.
+
+    the count on a start event is what gets written, if it is None (or ends up wrong because events
+    were filtered out) the writer goes back and fixes it at the end event, which needs a seekable f
+    """
+
+    def __init__(self, f: io.BufferedWriter | io.BytesIO) -> None:
+        """
+        Args:
+            f (io.BufferedWriter | io.BytesIO): A file-like object or bytes buffer.
+        """
+        self.f = f
+        # [type, count written in the header, where the count is, children written]
+        self._stack = []
+
+    def write(self, event: PropertyTreeEvent) -> None:
+        """Writes one event.
+
+        Args:
+            event (PropertyTreeEvent): The event.
+
+        Raises:
+            ValueError: If an end doesn't match its start, or a count is wrong and f can't seek.
+        """
+        f = self.f
+        kind = event.kind
+        if kind == END_DICT or kind == END_LIST:
+            self._end(event)
+            return
+        if self._stack:
+            parent = self._stack[-1]
+            parent[3] += 1
+            if parent[0] == 5:
+                writePTString(f, event.path[-1])
+        dataType = event.type
+        if dataType is None:
+            # made by hand without a type, work it out
+            if kind == START_DICT:
+                dataType = 5
+            elif kind == START_LIST:
+                dataType = 4
+            else:
+                dataType = propertyTreeType(event.value)
+        writeUByte(f, dataType)
+        writeBool(f, bool(event.anyTypeFlag))
+        if kind == VALUE:
+            if dataType == 1:
+                writeBool(f, event.value)
+            elif dataType == 2:
+                writeDouble(f, event.value)
+            elif dataType == 3:
+                writePTString(f, event.value)
+            elif dataType != 0:
+                raise ValueError(f"A value event can't have type {dataType}")
+            return
+        count = event.value
+        countAt = f.tell() if f.seekable() else None
+        writeUInt(f, 0 if count is None else count)
+        self._stack.append([dataType, count, countAt, 0])
+
+    def _end(self, event: PropertyTreeEvent) -> None:
+        if not self._stack:
+            raise ValueError(f"{event.kind} without a start")
+        dataType, count, countAt, written = self._stack.pop()
+        if (dataType == 4) != (event.kind == END_LIST):
+            raise ValueError(f"{event.kind} doesn't match the start at {event.path}")
+        if count == written:
+            return
+        if countAt is None:
+            raise ValueError(
+                f"Wrote {written} children at {event.path} but the start said {count}, and the file can't seek to fix it"
+            )
+        end = self.f.tell()
+        self.f.seek(countAt)
+        self.f.write(UINT.pack(written))
+        self.f.seek(end)
+
+    def writeAll(self, events: Iterable[PropertyTreeEvent]) -> None:
+        """
+        Args:
+            events (Iterable[PropertyTreeEvent]): The events to write, in order.
+        """
+        for event in events:
+            self.write(event)
+
+
+class ModSettingsEventWriter(PropertyTreeEventWriter):
+    """PropertyTreeEventWriter that writes the mod settings version first."""
+
+    def __init__(self, f: io.BufferedWriter | io.BytesIO, version: list | str) -> None:
+        """
+        Args:
+            f (io.BufferedWriter | io.BytesIO): A file-like object or bytes buffer.
+            version (list | str): The version to write, like iterModSettings' .version.
+        """
+        super().__init__(f)
+        writeVersionString(f, version)
+        writeBool(f, False)
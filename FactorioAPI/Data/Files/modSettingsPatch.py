@@ -0,0 +1,146 @@
+import mmap
+import os
+
+from FactorioAPI.Data.Files.lazyModSettings import PropertyTreeIndex, skipPropertyTree
+from FactorioAPI.Data.Files.modSettings import propertyTreeCodec
+from FactorioAPI.Data.IO.codec import DOUBLE
+
+"""
+changing settings in a mod-settings.dat without reading and writing the whole thing
+
+the file is mapped with mmap and indexed (see lazyModSettings.py) to find where each setting is.
+a bool or double that stays a bool or double is overwritten right where it is, nothing else is touched.
+anything that changes size (strings, or changing a value's type) means everything after it moves, so only
+the file from the first such change onwards is rewritten. property trees only store counts, not byte sizes,
+so nothing before the change ever needs fixing
+
+paths are the keys from the root, like ("startup", "some-setting", "value") or "startup.some-setting.value"
+"""
+
+# version and the bool after it
+_TREE_START = 9
+
+
+def _path(path: str | tuple | list) -> tuple:
+    if isinstance(path, str):
+        return tuple(path.split("."))
+    return tuple(path)
+
+
+def findNode(index: PropertyTreeIndex, root: int, path: str | tuple | list) -> int:
+    """Finds where a node is in an indexed property tree.
+
+    Args:
+        index (PropertyTreeIndex): The index of the tree.
+        root (int): Where the root node starts.
+        path (str | tuple | list): The keys (list indexes for lists) from the root.
+
+    Raises:
+        KeyError: If the path doesn't exist.
+
+    Returns:
+        int: Where the node starts.
+    """
+    pos = root
+    for key in _path(path):
+        dataType = index.view[pos]
+        try:
+            if dataType == 5:
+                pos = index.dicts[pos][key]
+            elif dataType == 4:
+                pos = index.lists[pos][int(key)]
+            else:
+                raise KeyError(key)
+        except (KeyError, IndexError, ValueError):
+            raise KeyError(f"{path!r} isn't in the mod settings") from None
+    return pos
+
+
+def _plan(view: memoryview, changes: dict) -> tuple[list, list]:
+    index = PropertyTreeIndex(view, _TREE_START)
+    inPlace = []
+    replacements = []
+    for path, value in changes.items():
+        pos = findNode(index, _TREE_START, path)
+        dataType = view[pos]
+        if dataType == 1 and type(value) == bool:
+            inPlace.append((pos + 2, b"\x01" if value else b"\x00"))
+        elif dataType == 2 and (type(value) == float or type(value) == int):
+            inPlace.append((pos + 2, DOUBLE.pack(value)))
+        else:
+            encoded = propertyTreeCodec.encode(value)
+            # keep the any type flag that was there
+            encoded[1] = view[pos + 1]
+            replacements.append((pos, skipPropertyTree(view, pos), bytes(encoded)))
+    replacements.sort()
+    for (start, end, _), (nextStart, _, _) in zip(replacements, replacements[1:]):
+        if nextStart < end:
+            raise ValueError("Can't change a value and something inside it at once")
+    return inPlace, replacements
+
+
+def _tail(view: memoryview, replacements: list) -> bytes:
+    """Everything from the first replacement to the end, with the replacements in it."""
+    pieces = []
+    last = replacements[0][0]
+    for start, end, encoded in replacements:
+        pieces.append(view[last:start])
+        pieces.append(encoded)
+        last = end
+    pieces.append(view[last:])
+    tail = b"".join(pieces)
+    for piece in pieces:
+        if isinstance(piece, memoryview):
+            piece.release()
+    return tail
+
+
+def patchModSettingsBuffer(data: bytearray, changes: dict) -> int:
+    """Changes settings in an encoded mod-settings.dat in memory, see the top of this file.
+
+    Args:
+        data (bytearray): The encoded mod settings, changed in place.
+        changes (dict): path > new value.
+
+    Returns:
+        int: How many bytes had to be rewritten after a size change, 0 if everything fit in place.
+    """
+    with memoryview(data) as view:
+        inPlace, replacements = _plan(view, changes)
+        for pos, encoded in inPlace:
+            view[pos : pos + len(encoded)] = encoded
+        if not replacements:
+            return 0
+        tail = _tail(view, replacements)
+    data[replacements[0][0] :] = tail
+    return len(tail)
+
+
+def patchModSettings(path: str | os.PathLike, changes: dict) -> int:
+    """Changes settings in a mod-settings.dat file, see the top of this file.
+
+    Args:
+        path (str | os.PathLike): The mod-settings.dat file.
+        changes (dict): path > new value, like {"startup.some-setting.value": True}.
+
+    Raises:
+        KeyError: If a path isn't in the file.
+
+    Returns:
+        int: How many bytes had to be rewritten after a size change, 0 if everything fit in place.
+    """
+    with open(path, "r+b") as f:
+        with mmap.mmap(f.fileno(), 0) as mapped:
+            with memoryview(mapped) as view:
+                # work out every change before touching anything, so a bad path changes nothing
+                inPlace, replacements = _plan(view, changes)
+                for pos, encoded in inPlace:
+                    view[pos : pos + len(encoded)] = encoded
+                tail = _tail(view, replacements) if replacements else None
+            mapped.flush()
+        if tail is None:
+            return 0
+        f.seek(replacements[0][0])
+        f.write(tail)
+        f.truncate()
+    return len(tail)
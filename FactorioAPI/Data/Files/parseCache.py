@@ -0,0 +1,320 @@
+import io
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from typing import Any, Callable
+
+from FactorioAPI.Utils import getFileHash
+
+"""
+remembering what a file parsed to, so an unchanged file doesn't get parsed again
+
+results are stored on disk in a sqlite database, keyed by the hash of the file's contents (getFileHash)
+and what kind of file it is. before hashing, (path, size, mtime) is looked up, so a file that hasn't been touched
+since last time only costs a stat. a file that was touched but has the same contents (copied, re-downloaded)
+costs a hash, and only new contents get parsed
+
+the database is in WAL mode so any number of processes can share one cache, each opens its own connection.
+when the stored results get bigger than maxBytes the least recently used ones are thrown away, down to
+EVICT_TO of maxBytes so it isn't done again on the next put. the total size is kept up to date by triggers,
+so checking it is one row, and a hit doesn't write straight away, when results were used is saved in batches
+
+    cache = ParseCache("parse-cache.sqlite")
+    with open("mod-settings.dat", "rb") as f:
+        settings = readModSettings(f, cache=cache)
+
+every get gives back a new copy, changing it doesn't change what is cached
+"""
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+# how much of maxBytes is left after evicting
+EVICT_TO = 0.9
+# a hit's new used time is saved once this many have built up, or this long after the oldest one
+USED_BATCH = 64
+USED_FLUSH_SECONDS = 30.0
+
+# part of every key, bump it whenever a reader changes what it gives back so old results aren't used.
+# it's not the library version, a release that doesn't touch the readers shouldn't throw the cache away
+PARSER_VERSION = 1
+
+_SCHEMA = """
+BEGIN IMMEDIATE;
+CREATE TABLE IF NOT EXISTS results (
+    hash TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    data BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    used REAL NOT NULL,
+    PRIMARY KEY (hash, kind)
+);
+CREATE INDEX IF NOT EXISTS resultsUsed ON results (used);
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT NOT NULL PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime INTEGER NOT NULL,
+    hash TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS filesHash ON files (hash);
+CREATE TABLE IF NOT EXISTS totals (
+    name TEXT NOT NULL PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+CREATE TRIGGER IF NOT EXISTS resultsInserted AFTER INSERT ON results BEGIN
+    UPDATE totals SET value = value + NEW.size WHERE name = 'size';
+END;
+CREATE TRIGGER IF NOT EXISTS resultsDeleted AFTER DELETE ON results BEGIN
+    UPDATE totals SET value = value - OLD.size WHERE name = 'size';
+END;
+CREATE TRIGGER IF NOT EXISTS resultsResized AFTER UPDATE OF size ON results BEGIN
+    UPDATE totals SET value = value - OLD.size + NEW.size WHERE name = 'size';
+END;
+-- summed once for a database from before there were totals, then the triggers keep it up
+INSERT OR IGNORE INTO totals (name, value)
+    SELECT 'size', COALESCE(SUM(size), 0) FROM results
+    WHERE NOT EXISTS (SELECT 1 FROM totals WHERE name = 'size');
+COMMIT;
+"""
+
+
+def defaultCachePath() -> str:
+    """
+    Returns:
+        str: Where the cache goes if no path is given, in XDG_CACHE_HOME or ~/.cache.
+    """
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(base, "FactorioAPI", "parse-cache.sqlite")
+
+
+class ParseCache:
+    """An on disk cache of parsed files, see the top of this file."""
+
+    def __init__(
+        self, path: str | os.PathLike = None, maxBytes: int = DEFAULT_MAX_BYTES
+    ) -> None:
+        """
+        Args:
+            path (str | os.PathLike, optional): The database file, made if it doesn't exist. Defaults to defaultCachePath().
+            maxBytes (int, optional): How big the stored results can get before old ones are thrown away. Defaults to DEFAULT_MAX_BYTES.
+        """
+        self.path = os.fspath(path) if path is not None else defaultCachePath()
+        self.maxBytes = maxBytes
+        self.hits = 0
+        self.misses = 0
+        self._local = threading.local()
+        # (hash, kind) > when it was last used, for hits that haven't been saved yet
+        self._used = {}
+        self._usedSince = None
+        self._usedLock = threading.Lock()
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def _connection(self) -> sqlite3.Connection:
+        # one connection per thread, and a new one after a fork
+        local = self._local
+        if getattr(local, "pid", None) != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(_SCHEMA)
+            local.connection = connection
+            local.pid = os.getpid()
+        return local.connection
+
+    def _load(self, fileHash: str, kind: str) -> tuple[bool, Any]:
+        connection = self._connection()
+        row = connection.execute(
+            "SELECT data FROM results WHERE hash = ? AND kind = ?", (fileHash, kind)
+        ).fetchone()
+        if row is None:
+            return False, None
+        self._markUsed(fileHash, kind)
+        return True, pickle.loads(row[0])
+
+    def _markUsed(self, fileHash: str, kind: str) -> None:
+        now = time.time()
+        with self._usedLock:
+            self._used[(fileHash, kind)] = now
+            if self._usedSince is None:
+                self._usedSince = now
+            due = (
+                len(self._used) >= USED_BATCH
+                or now - self._usedSince >= USED_FLUSH_SECONDS
+            )
+        if due:
+            self.flush()
+
+    def flush(self) -> None:
+        """Saves when the results that were hit since the last flush were used, in one transaction."""
+        with self._usedLock:
+            used = self._used
+            self._used = {}
+            self._usedSince = None
+        if not used:
+            return
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            connection.executemany(
+                "UPDATE results SET used = ? WHERE hash = ? AND kind = ?",
+                [(when, fileHash, kind) for (fileHash, kind), when in used.items()],
+            )
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+    def get(
+        self, path: str | os.PathLike, kind: str, parse: Callable[[str], Any]
+    ) -> Any:
+        """Gets what a file parses to, from the cache if it can.
+
+        Args:
+            path (str | os.PathLike): The file.
+            kind (str): What parse does, so the same file parsed different ways isn't mixed up.
+            parse (Callable[[str], Any]): Parses the file, given its path, only called on a miss.
+
+        Returns:
+            Any: What parse gave for the file.
+        """
+        path = os.path.abspath(path)
+        # so a changed parser never gets an old result
+        kind = f"{kind}@{PARSER_VERSION}"
+        stat = os.stat(path)
+        connection = self._connection()
+        row = connection.execute(
+            "SELECT hash FROM files WHERE path = ? AND size = ? AND mtime = ?",
+            (path, stat.st_size, stat.st_mtime_ns),
+        ).fetchone()
+        if row is not None:
+            found, data = self._load(row[0], kind)
+            if found:
+                self.hits += 1
+                return data
+        fileHash = getFileHash(path)
+        connection.execute(
+            "INSERT OR REPLACE INTO files (path, size, mtime, hash) VALUES (?, ?, ?, ?)",
+            (path, stat.st_size, stat.st_mtime_ns, fileHash),
+        )
+        found, data = self._load(fileHash, kind)
+        if found:
+            self.hits += 1
+            return data
+        self.misses += 1
+        data = parse(path)
+        self.put(fileHash, kind, data)
+        return data
+
+    def read(
+        self,
+        f: io.BufferedReader,
+        kind: str,
+        parse: Callable[[io.BufferedReader], Any],
+    ) -> Any:
+        """get for a file that is already open, like the readers take.
+        if f isn't a real file from the start (a BytesIO, or part way through) it is just parsed
+
+        Args:
+            f (io.BufferedReader): The open file.
+            kind (str): What parse does, see get.
+            parse (Callable[[io.BufferedReader], Any]): Parses the file from f, only called on a miss.
+
+        Returns:
+            Any: What parse gave for the file.
+        """
+        path = getattr(f, "name", None)
+        if not isinstance(path, (str, bytes)) or not f.seekable() or f.tell() != 0:
+            return parse(f)
+
+        def parseFile(path: str) -> Any:
+            f.seek(0)
+            return parse(f)
+
+        data = self.get(path, kind, parseFile)
+        # leave f where the reader would have
+        f.seek(0, io.SEEK_END)
+        return data
+
+    def put(self, fileHash: str, kind: str, data: Any) -> None:
+        """Stores a result, then throws away old ones if there's too much.
+
+        Args:
+            fileHash (str): The hash of the file's contents.
+            kind (str): What kind of result it is.
+            data (Any): The result, anything pickle can do.
+        """
+        blob = pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+        connection = self._connection()
+        # an upsert rather than INSERT OR REPLACE, the rows REPLACE deletes don't fire the delete trigger
+        connection.execute(
+            "INSERT INTO results (hash, kind, data, size, used) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT (hash, kind) DO UPDATE SET data = excluded.data, size = excluded.size, used = excluded.used",
+            (fileHash, kind, blob, len(blob), time.time()),
+        )
+        if self.size() > self.maxBytes:
+            self.evict()
+
+    def size(self) -> int:
+        """
+        Returns:
+            int: How many bytes the stored results take up.
+        """
+        row = (
+            self._connection()
+            .execute("SELECT value FROM totals WHERE name = 'size'")
+            .fetchone()
+        )
+        return row[0] if row is not None else 0
+
+    def evict(self) -> None:
+        """Throws away the least recently used results until they fit in EVICT_TO of maxBytes, if they don't fit in maxBytes."""
+        # the hits that haven't been saved yet count, they aren't the least recently used any more
+        self.flush()
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            total = connection.execute(
+                "SELECT value FROM totals WHERE name = 'size'"
+            ).fetchone()[0]
+            if total > self.maxBytes:
+                over = total - int(self.maxBytes * EVICT_TO)
+                old = []
+                hashes = set()
+                for rowid, fileHash, size in connection.execute(
+                    "SELECT rowid, hash, size FROM results ORDER BY used"
+                ):
+                    old.append((rowid,))
+                    hashes.add(fileHash)
+                    over -= size
+                    if over <= 0:
+                        break
+                connection.executemany("DELETE FROM results WHERE rowid = ?", old)
+                connection.executemany(
+                    "DELETE FROM files WHERE hash = ? AND NOT EXISTS (SELECT 1 FROM results WHERE results.hash = files.hash)",
+                    [(fileHash,) for fileHash in hashes],
+                )
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+    def clear(self) -> None:
+        """Throws away everything."""
+        with self._usedLock:
+            self._used = {}
+            self._usedSince = None
+        connection = self._connection()
+        connection.execute("DELETE FROM results")
+        connection.execute("DELETE FROM files")
+
+    def close(self) -> None:
+        """Saves the hits that are waiting to be (see flush) and closes this thread's connection."""
+        connection = getattr(self._local, "connection", None)
+        if connection is not None and self._local.pid == os.getpid():
+            self.flush()
+            connection.close()
+        self._local = threading.local()
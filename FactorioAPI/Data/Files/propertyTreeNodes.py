@@ -0,0 +1,473 @@
+import io
+from array import array
+from collections.abc import Mapping, Sequence
+from typing import Any, Iterator
+
+from FactorioAPI.Data.Files.lazyModSettings import readPTStringAt
+from FactorioAPI.Data.Files.modSettings import (
+    propertyTreeType,
+    sizeOfPTString,
+    writePTString,
+)
+from FactorioAPI.Data.IO.buffer import BufferReader, BufferWriter
+from FactorioAPI.Data.IO.codec import DOUBLE, UINT, VERSION
+from FactorioAPI.Data.IO.write import (
+    writeBool,
+    writeDouble,
+    writeUInt,
+    writeVersionString,
+)
+
+"""
+a smaller typed model of a property tree than nested dicts, that also keeps every flag byte
+
+dicts and lists are PTDict / PTList, everything else (None, bool, float, str) is kept as the plain python value.
+the type and any type flag of every child are kept by its parent in meta, which is just the 2 header bytes of
+each child one after another, exactly like they are in the file. so:
+- nothing is lost, reading and writing gives back the exact same bytes, flags included
+- the writer never has to guess a type, it looks the type byte up in a table
+- every dict with the same keys shares one keys tuple, and every dict with the same types shares one meta,
+  a mod setting ({"value": x}) ends up as one small object and a 1 item tuple
+- a list of only doubles (without flags) is a PTDoubleList, backed by an array("d")
+"""
+
+# so identical key sets and headers across every tree only exist once
+_sharedKeys = {}
+_sharedMeta = {}
+# the most of each that are kept, after that the oldest are forgotten to make room.
+# a forgotten one is still used by the nodes that have it, new ones just don't share with it
+MAX_SHARED = 4096
+
+# the header of a double without the flag
+_DOUBLE_HEADER = b"\x02\x00"
+
+
+def _share(cache: dict, value: tuple | bytes) -> tuple | bytes:
+    # only small ones, they are the ones repeated everywhere
+    if len(value) > 16:
+        return value
+    shared = cache.get(value)
+    if shared is None:
+        if len(cache) >= MAX_SHARED:
+            # dicts keep insertion order, so the first key is the oldest
+            try:
+                del cache[next(iter(cache))]
+            except (KeyError, RuntimeError, StopIteration):
+                # another thread got there first
+                pass
+        shared = cache.setdefault(value, value)
+    return shared
+
+
+def _header(data: Any, anyTypeFlag: bool) -> bytes:
+    if isinstance(data, PTDict):
+        dataType = 5
+    elif isinstance(data, (PTList, PTDoubleList)):
+        dataType = 4
+    else:
+        dataType = propertyTreeType(data)
+    return bytes((dataType, 1 if anyTypeFlag else 0))
+
+
+class PTDict(Mapping):
+    """A property tree dict, acts like a read only dict, change it with set."""
+
+    __slots__ = ("_keys", "_meta", "_values", "_index")
+
+    def __init__(self, keys: tuple, meta: bytes, values: tuple) -> None:
+        """
+        Args:
+            keys (tuple): The keys, in order.
+            meta (bytes): The type byte and any type flag of every value, 2 bytes each.
+            values (tuple): The values, PTDict / PTList / PTDoubleList or plain python values.
+        """
+        self._keys = _share(_sharedKeys, keys)
+        self._meta = _share(_sharedMeta, meta)
+        self._values = values
+        self._index = None
+
+    def _find(self, key: str) -> int:
+        if len(self._keys) <= 8:
+            # small enough that looking through it is quicker than keeping a dict for it
+            return self._keys.index(key)
+        if self._index is None:
+            self._index = {k: i for i, k in enumerate(self._keys)}
+        return self._index[key]
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return self._values[self._find(key)]
+        except ValueError:
+            raise KeyError(key) from None
+
+    def __iter__(self) -> Iterator:
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, key: object) -> bool:
+        try:
+            self._find(key)
+        except (ValueError, KeyError):
+            return False
+        return True
+
+    def typeOf(self, key: str) -> int:
+        """
+        Returns:
+            int: The property tree type of the value at key, see propertyTreeType.
+        """
+        return self._meta[2 * self._find(key)]
+
+    def flagOf(self, key: str) -> bool:
+        """
+        Returns:
+            bool: The any type flag of the value at key.
+        """
+        return self._meta[2 * self._find(key) + 1] == 1
+
+    def set(self, key: str, value: Any, anyTypeFlag: bool = None) -> None:
+        """Sets a value, adding the key if it isn't there.
+
+        Args:
+            key (str): The key.
+            value (Any): The value, PTDict / PTList / PTDoubleList or a plain python value.
+            anyTypeFlag (bool, optional): The any type flag, keeps the old one if None. Defaults to None.
+        """
+        keys = list(self._keys)
+        values = list(self._values)
+        meta = bytearray(self._meta)
+        if key in self:
+            i = self._find(key)
+            if anyTypeFlag is None:
+                anyTypeFlag = meta[2 * i + 1] == 1
+            values[i] = value
+            meta[2 * i : 2 * i + 2] = _header(value, anyTypeFlag)
+        else:
+            keys.append(key)
+            values.append(value)
+            meta += _header(value, bool(anyTypeFlag))
+        self._keys = _share(_sharedKeys, tuple(keys))
+        self._meta = _share(_sharedMeta, bytes(meta))
+        self._values = tuple(values)
+        self._index = None
+
+    def write(self, f: io.BufferedWriter | io.BytesIO | BufferWriter) -> None:
+        """Writes the dict, not including its own header.
+
+        Args:
+            f (io.BufferedWriter | io.BytesIO | BufferWriter): A file-like object or bytes buffer.
+        """
+        meta = self._meta
+        writeUInt(f, len(self._values))
+        for i, value in enumerate(self._values):
+            writePTString(f, self._keys[i])
+            f.write(meta[2 * i : 2 * i + 2])
+            _WRITERS[meta[2 * i]](f, value)
+
+    def size(self) -> int:
+        """
+        Returns:
+            int: How many bytes write will write.
+        """
+        meta = self._meta
+        size = 4 + 2 * len(self._values)
+        for i, value in enumerate(self._values):
+            size += sizeOfPTString(self._keys[i]) + _SIZES[meta[2 * i]](value)
+        return size
+
+    def toPython(self) -> dict:
+        """
+        Returns:
+            dict: The same nested dicts readPropertyTree gives.
+        """
+        return {k: _toPython(v) for k, v in zip(self._keys, self._values)}
+
+    @classmethod
+    def fromPython(cls, data: dict) -> "PTDict":
+        """Makes a PTDict out of nested dicts, every flag is False.
+
+        Args:
+            data (dict): The data.
+
+        Returns:
+            PTDict: The data as nodes.
+        """
+        values = tuple(_fromPython(v) for v in data.values())
+        meta = b"".join(_header(v, False) for v in values)
+        return cls(tuple(data), meta, values)
+
+    def __repr__(self) -> str:
+        return f"PTDict({len(self)} keys)"
+
+
+class PTList(Sequence):
+    """A property tree list, acts like a read only list."""
+
+    __slots__ = ("_meta", "_values")
+
+    def __init__(self, meta: bytes, values: tuple) -> None:
+        """
+        Args:
+            meta (bytes): The type byte and any type flag of every value, 2 bytes each.
+            values (tuple): The values.
+        """
+        self._meta = _share(_sharedMeta, meta)
+        self._values = values
+
+    def __getitem__(self, i: int | slice) -> Any:
+        return self._values[i]
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def typeOf(self, i: int) -> int:
+        return self._meta[2 * i]
+
+    def flagOf(self, i: int) -> bool:
+        return self._meta[2 * i + 1] == 1
+
+    def write(self, f: io.BufferedWriter | io.BytesIO | BufferWriter) -> None:
+        meta = self._meta
+        writeUInt(f, len(self._values))
+        for i, value in enumerate(self._values):
+            f.write(meta[2 * i : 2 * i + 2])
+            _WRITERS[meta[2 * i]](f, value)
+
+    def size(self) -> int:
+        meta = self._meta
+        size = 4 + 2 * len(self._values)
+        for i, value in enumerate(self._values):
+            size += _SIZES[meta[2 * i]](value)
+        return size
+
+    def toPython(self) -> list:
+        return [_toPython(v) for v in self._values]
+
+    def __repr__(self) -> str:
+        return f"PTList({len(self)} items)"
+
+
+class PTDoubleList(Sequence):
+    """A property tree list of only doubles without flags, kept in an array("d")."""
+
+    __slots__ = ("_values",)
+
+    def __init__(self, values: array) -> None:
+        self._values = values
+
+    def __getitem__(self, i: int | slice) -> float:
+        return self._values[i]
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def typeOf(self, i: int) -> int:
+        return 2
+
+    def flagOf(self, i: int) -> bool:
+        return False
+
+    def write(self, f: io.BufferedWriter | io.BytesIO | BufferWriter) -> None:
+        writeUInt(f, len(self._values))
+        for value in self._values:
+            f.write(_DOUBLE_HEADER)
+            writeDouble(f, value)
+
+    def size(self) -> int:
+        return 4 + 10 * len(self._values)
+
+    def toPython(self) -> list:
+        return self._values.tolist()
+
+    def __repr__(self) -> str:
+        return f"PTDoubleList({len(self)} items)"
+
+
+def _writeNode(f, value) -> None:
+    value.write(f)
+
+
+def _sizeNode(value) -> int:
+    return value.size()
+
+
+# by type byte, 0 none, 1 bool, 2 double, 3 string, 4 list, 5 dict
+_WRITERS = [
+    lambda f, value: None,
+    writeBool,
+    writeDouble,
+    writePTString,
+    _writeNode,
+    _writeNode,
+]
+_SIZES = [
+    lambda value: 0,
+    lambda value: 1,
+    lambda value: 8,
+    sizeOfPTString,
+    _sizeNode,
+    _sizeNode,
+]
+
+
+def _toPython(value: Any) -> Any:
+    if isinstance(value, (PTDict, PTList, PTDoubleList)):
+        return value.toPython()
+    return value
+
+
+def _fromPython(value: Any) -> Any:
+    if type(value) == dict:
+        return PTDict.fromPython(value)
+    if type(value) == list:
+        values = tuple(_fromPython(v) for v in value)
+        return PTList(b"".join(_header(v, False) for v in values), values)
+    propertyTreeType(value)
+    return value
+
+
+def _readValue(view: memoryview | bytes, pos: int) -> tuple[Any, int]:
+    # pos is right after the header
+    dataType = view[pos - 2]
+    if dataType == 1:
+        return view[pos] == 1, pos + 1
+    elif dataType == 2:
+        return DOUBLE.unpack_from(view, pos)[0], pos + 8
+    elif dataType == 3:
+        return readPTStringAt(view, pos)
+    elif dataType == 0:
+        return None, pos
+    count = UINT.unpack_from(view, pos)[0]
+    pos += 4
+    meta = bytearray()
+    values = []
+    if dataType == 5:
+        keys = []
+        for i in range(count):
+            key, pos = readPTStringAt(view, pos)
+            keys.append(key)
+            meta += view[pos : pos + 2]
+            value, pos = _readValue(view, pos + 2)
+            values.append(value)
+        return PTDict(tuple(keys), bytes(meta), tuple(values)), pos
+    elif dataType == 4:
+        for i in range(count):
+            meta += view[pos : pos + 2]
+            value, pos = _readValue(view, pos + 2)
+            values.append(value)
+        if count and meta == _DOUBLE_HEADER * count:
+            return PTDoubleList(array("d", values)), pos
+        return PTList(bytes(meta), tuple(values)), pos
+    raise ValueError(f"Unknown property tree type {dataType} at byte {pos - 2}")
+
+
+def readPropertyTreeNode(
+    view: memoryview | bytes, pos: int = 0
+) -> tuple[Any, bytes, int]:
+    """Reads a property tree node into the node model.
+
+    Args:
+        view (memoryview | bytes): The buffer.
+        pos (int, optional): Where the node starts. Defaults to 0.
+
+    Returns:
+        tuple[Any, bytes, int]: The node, its 2 header bytes, and where it ends.
+    """
+    header = bytes(view[pos : pos + 2])
+    value, pos = _readValue(view, pos + 2)
+    return value, header, pos
+
+
+class ModSettingsTree:
+    """Mod settings as nodes, with every byte needed to write them back the same."""
+
+    __slots__ = ("version", "randomBool", "header", "root")
+
+    def __init__(
+        self,
+        version: list,
+        root: PTDict,
+        randomBool: bool = False,
+        header: bytes = b"\x05\x00",
+    ) -> None:
+        """
+        Args:
+            version (list): The version.
+            root (PTDict): The settings.
+            randomBool (bool, optional): The bool after the version. Defaults to False.
+            header (bytes, optional): The type and any type flag of the root. Defaults to b"\\x05\\x00".
+        """
+        self.version = version
+        self.root = root
+        self.randomBool = randomBool
+        self.header = header
+
+    def size(self) -> int:
+        return 9 + 2 + self.root.size()
+
+    def encode(self) -> bytearray:
+        """
+        Returns:
+            bytearray: The encoded mod settings, made in one exactly sized buffer.
+        """
+        buffer = BufferWriter(self.size())
+        writeVersionString(buffer, self.version)
+        writeBool(buffer, self.randomBool)
+        buffer.write(self.header)
+        self.root.write(buffer)
+        return buffer.buffer
+
+    def write(self, f: io.BufferedWriter | io.BytesIO) -> None:
+        """
+        Args:
+            f (io.BufferedWriter | io.BytesIO): A file-like object or bytes buffer.
+        """
+        f.write(self.encode())
+
+    def toPython(self) -> dict:
+        """
+        Returns:
+            dict: The same dict readModSettings gives.
+        """
+        settings = {"version": list(self.version)}
+        settings.update(self.root.toPython())
+        return settings
+
+    @classmethod
+    def fromPython(cls, data: dict) -> "ModSettingsTree":
+        """
+        Args:
+            data (dict): Mod settings like readModSettings gives.
+
+        Returns:
+            ModSettingsTree: The mod settings as nodes.
+        """
+        root = PTDict.fromPython({k: v for k, v in data.items() if k != "version"})
+        return cls(list(data["version"]), root)
+
+
+def readModSettingsNodes(
+    f: io.BufferedReader | io.BytesIO | BufferReader | bytes | bytearray,
+) -> ModSettingsTree:
+    """Reads the mod settings into the node model, see the top of this file.
+
+    Args:
+        f (io.BufferedReader | io.BytesIO | BufferReader | bytes | bytearray): Where to read from. a file is read in one go.
+
+    Returns:
+        ModSettingsTree: The mod settings.
+    """
+    if isinstance(f, BufferReader):
+        view, pos = f.view, f.pos
+    elif isinstance(f, (bytes, bytearray, memoryview)):
+        view, pos = f, 0
+    else:
+        view, pos = f.read(), 0
+    version = list(VERSION.unpack_from(view, pos))
+    randomBool = view[pos + 8] == 1
+    root, header, end = readPropertyTreeNode(view, pos + 9)
+    if isinstance(f, BufferReader):
+        f.pos = end
+    return ModSettingsTree(version, root, randomBool, header)
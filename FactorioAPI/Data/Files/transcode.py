@@ -0,0 +1,533 @@
+import codecs
+import io
+import json
+from json.decoder import scanstring
+from json.encoder import encode_basestring_ascii
+from typing import Any, Iterator, TextIO
+
+from FactorioAPI.Data.Files.achievements import (
+    ACHIEVEMENT_TYPES,
+    HEADER,
+    MODDED_ACHIEVEMENT_TYPES,
+    getIndexDecoders,
+    getIndexLink,
+    readContent,
+    readHeader,
+    readModdedContent,
+    readShortArray,
+)
+from FactorioAPI.Data.Files.modSettingsEvents import (
+    END_DICT,
+    END_LIST,
+    START_DICT,
+    START_LIST,
+    VALUE,
+    PropertyTreeEvent,
+    PropertyTreeEventWriter,
+    iterModSettings,
+)
+from FactorioAPI.Data.IO.buffer import BufferReader
+from FactorioAPI.Data.IO.codec import SHORT, UINT
+from FactorioAPI.Data.IO.read import readBool, readShort, readUInt, readVersionString
+from FactorioAPI.Data.IO.schema import Array, Short, compileSchema
+from FactorioAPI.Data.IO.write import writeBool, writeString, writeVersionString
+
+"""
+.dat to JSON and back without building the whole thing in between
+
+modSettingsToJson / achievementsToJson write exactly what json.dumps(readModSettings(f), indent=4) would,
+but walk the file as it goes (the events from modSettingsEvents.py, one achievement at a time) and write
+through a buffer that gets flushed every so often, so memory doesn't grow with the file
+
+jsonToModSettings / jsonToAchievements go the other way with a small JSON tokenizer that reads the text
+in chunks, and give the same bytes writeModSettings would. counts aren't known until the end of each
+dict or list, so they get written afterwards, which means the output has to be seekable (a file or BytesIO)
+
+    with open("mod-settings.dat", "rb") as src, open("mod-settings.json", "w") as dst:
+        modSettingsToJson(src, dst)
+"""
+
+DEFAULT_BUFFER_SIZE = 1 << 16
+
+
+def _float(value: float) -> str:
+    # the same as json's floatstr
+    if value != value:
+        return "NaN"
+    elif value == float("inf"):
+        return "Infinity"
+    elif value == float("-inf"):
+        return "-Infinity"
+    return float.__repr__(value)
+
+
+def _key(key: Any) -> str:
+    # json turns keys that aren't strings into strings
+    if isinstance(key, str):
+        return encode_basestring_ascii(key)
+    elif key is None:
+        return '"null"'
+    elif key is True:
+        return '"true"'
+    elif key is False:
+        return '"false"'
+    elif isinstance(key, float):
+        return '"' + _float(key) + '"'
+    return '"' + int.__repr__(key) + '"'
+
+
+class JsonTextWriter:
+    """Writes JSON one piece at a time, laid out the same as json.dumps(indent=indent)."""
+
+    def __init__(
+        self, out: TextIO, indent: int = 4, bufferSize: int = DEFAULT_BUFFER_SIZE
+    ) -> None:
+        """
+        Args:
+            out (TextIO): Where the text goes.
+            indent (int, optional): Spaces per level. Defaults to 4.
+            bufferSize (int, optional): Roughly how many characters to hold before writing them to out. Defaults to DEFAULT_BUFFER_SIZE.
+        """
+        self.out = out
+        self.indent = " " * indent
+        self.bufferSize = bufferSize
+        self._parts = []
+        self._size = 0
+        # [is a dict, nothing written in it yet]
+        self._stack = []
+
+    def _write(self, text: str) -> None:
+        self._parts.append(text)
+        self._size += len(text)
+        if self._size >= self.bufferSize:
+            self.flush()
+
+    def _item(self, key: Any) -> None:
+        if not self._stack:
+            return
+        frame = self._stack[-1]
+        self._write(("\n" if frame[1] else ",\n") + self.indent * len(self._stack))
+        frame[1] = False
+        if frame[0]:
+            self._write(_key(key) + ": ")
+
+    def start(self, isDict: bool, key: Any = None) -> None:
+        """Starts a dict or a list.
+
+        Args:
+            isDict (bool): Whether it is a dict.
+            key (Any, optional): Its key if it is in a dict. Defaults to None.
+        """
+        self._item(key)
+        self._write("{" if isDict else "[")
+        self._stack.append([isDict, True])
+
+    def end(self) -> None:
+        """Ends the last dict or list that was started."""
+        isDict, empty = self._stack.pop()
+        if not empty:
+            self._write("\n" + self.indent * len(self._stack))
+        self._write("}" if isDict else "]")
+
+    def value(self, value: Any, key: Any = None) -> None:
+        """Writes a whole value, meant for small things, a big dict or list should use start and end.
+
+        Args:
+            value (Any): The value.
+            key (Any, optional): Its key if it is in a dict. Defaults to None.
+        """
+        self._item(key)
+        if value is None:
+            self._write("null")
+        elif value is True:
+            self._write("true")
+        elif value is False:
+            self._write("false")
+        elif type(value) == float:
+            self._write(_float(value))
+        elif type(value) == int:
+            self._write(int.__repr__(value))
+        elif type(value) == str:
+            self._write(encode_basestring_ascii(value))
+        else:
+            text = json.dumps(value, indent=len(self.indent))
+            self._write(text.replace("\n", "\n" + self.indent * len(self._stack)))
+
+    def flush(self) -> None:
+        """Writes everything held to out."""
+        if self._parts:
+            self.out.write("".join(self._parts))
+            self._parts.clear()
+            self._size = 0
+
+
+def modSettingsToJson(
+    f: io.BufferedReader | io.BytesIO | BufferReader,
+    out: TextIO,
+    indent: int = 4,
+) -> None:
+    """Writes the mod settings as JSON, see the top of this file.
+
+    Args:
+        f (io.BufferedReader | io.BytesIO | BufferReader): The mod settings.
+        out (TextIO): Where the JSON goes.
+        indent (int, optional): Spaces per level. Defaults to 4.
+    """
+    events = iterModSettings(f)
+    writer = JsonTextWriter(out, indent)
+    writer.start(True)
+    writer.value(events.version, "version")
+    # the root dict's entries go in the same dict as the version
+    next(events)
+    for event in events:
+        if len(event.path) == 0:
+            break
+        kind = event.kind
+        if kind == VALUE:
+            writer.value(event.value, event.path[-1])
+        elif kind == START_DICT or kind == START_LIST:
+            writer.start(kind == START_DICT, event.path[-1])
+        else:
+            writer.end()
+    writer.end()
+    writer.flush()
+
+
+def achievementsToJson(
+    f: io.BufferedReader | io.BytesIO | BufferReader,
+    out: TextIO,
+    modded: bool = False,
+    indent: int = 4,
+) -> None:
+    """Writes the achievements as JSON, see the top of this file.
+    only the header is kept whole, the achievements are written one at a time
+
+    Args:
+        f (io.BufferedReader | io.BytesIO | BufferReader): The achievements.
+        out (TextIO): Where the JSON goes.
+        modded (bool, optional): Whether it is achievements-modded.dat. Defaults to False.
+        indent (int, optional): Spaces per level. Defaults to 4.
+    """
+    writer = JsonTextWriter(out, indent)
+    writer.start(True)
+    writer.value(readVersionString(f), "version")
+    writer.value(readBool(f), "randomBool")
+    header = readShortArray(f, readHeader)
+    writer.value(header, "header")
+    writer.start(False, "content")
+    if modded:
+        for i in range(readUInt(f)):
+            writer.value(readModdedContent(f))
+    else:
+        decoders = getIndexDecoders(header)
+        for i in range(readShort(f)):
+            writer.value(readContent(f, decoders))
+    writer.end()
+    writer.start(False, "tracked")
+    pending = b""
+    while True:
+        data = f.read(DEFAULT_BUFFER_SIZE)
+        if not data:
+            break
+        data = pending + bytes(data)
+        even = len(data) & ~1
+        for (index,) in SHORT.iter_unpack(data[:even]):
+            writer.value(index)
+        pending = data[even:]
+    if pending:
+        raise ValueError(
+            "Tracked Achievement amount isn't able to be an integer, there is an odd amount of bytes, Malformed File?"
+        )
+    writer.end()
+    writer.end()
+    writer.flush()
+
+
+class JsonTokens:
+    """Reads JSON text a chunk at a time and splits it into tokens.
+
+    next() gives (kind, value), kind is one of { } [ ] : , or "value" for a string, number, true, false or null
+    """
+
+    def __init__(
+        self, src: TextIO | io.BufferedReader, chunkSize: int = DEFAULT_BUFFER_SIZE
+    ) -> None:
+        """
+        Args:
+            src (TextIO | io.BufferedReader): The JSON, as text or as utf-8 bytes.
+            chunkSize (int, optional): How much to read at once. Defaults to DEFAULT_BUFFER_SIZE.
+        """
+        self.src = src
+        self.chunkSize = chunkSize
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._text = ""
+        self._pos = 0
+        self._eof = False
+        # how much text came before _text, for error messages
+        self._offset = 0
+
+    def _more(self) -> bool:
+        if self._eof:
+            return False
+        data = self.src.read(self.chunkSize)
+        if isinstance(data, (bytes, bytearray, memoryview)):
+            data = self._decoder.decode(data, final=not data)
+        if not data:
+            self._eof = True
+            return False
+        self._offset += self._pos
+        self._text = self._text[self._pos :] + data
+        self._pos = 0
+        return True
+
+    def _error(self, message: str) -> ValueError:
+        return ValueError(f"{message} at character {self._offset + self._pos}")
+
+    def _skipSpace(self) -> bool:
+        while True:
+            text = self._text
+            pos = self._pos
+            while pos < len(text) and text[pos] in " \t\n\r":
+                pos += 1
+            self._pos = pos
+            if pos < len(text):
+                return True
+            if not self._more():
+                return False
+
+    def next(self) -> tuple[str, Any]:
+        """
+        Raises:
+            ValueError: If the text isn't valid JSON, or ends part way through.
+
+        Returns:
+            tuple[str, Any]: The next token.
+        """
+        if not self._skipSpace():
+            raise self._error("Ran out of JSON")
+        char = self._text[self._pos]
+        if char in "{}[]:,":
+            self._pos += 1
+            return char, None
+        if char == '"':
+            while True:
+                try:
+                    value, end = scanstring(self._text, self._pos + 1)
+                    break
+                except json.JSONDecodeError:
+                    # most likely cut off at the end of the chunk
+                    if not self._more():
+                        raise self._error("Bad string") from None
+            self._pos = end
+            return "value", value
+        # a number or a literal, it runs until a delimiter
+        while True:
+            text = self._text
+            end = self._pos
+            while end < len(text) and text[end] not in " \t\n\r,:]}[{":
+                end += 1
+            if end < len(text) or not self._more():
+                break
+        word = self._text[self._pos : end]
+        if word == "true":
+            value = True
+        elif word == "false":
+            value = False
+        elif word == "null":
+            value = None
+        else:
+            try:
+                value = json.loads(word)
+            except json.JSONDecodeError:
+                raise self._error(f"Bad value {word!r}") from None
+            if type(value) not in (int, float):
+                raise self._error(f"Bad value {word!r}")
+        self._pos = end
+        return "value", value
+
+    def expect(self, kind: str) -> None:
+        """Takes the next token, which has to be kind."""
+        token = self.next()
+        if token[0] != kind:
+            raise self._error(f"Expected {kind!r}, got {token[0]!r}")
+
+    def items(self, close: str) -> Iterator[tuple[str, Any]]:
+        """Goes over the items of a dict or list whose opening token has been taken,
+        giving the first token of each, which must be fully taken before asking for the next.
+
+        Args:
+            close (str): "}" or "]".
+        """
+        token = self.next()
+        if token[0] == close:
+            return
+        while True:
+            yield token
+            separator = self.next()[0]
+            if separator == close:
+                return
+            if separator != ",":
+                raise self._error(f"Expected ',' or {close!r}")
+            token = self.next()
+
+    def key(self, token: tuple[str, Any]) -> str:
+        """The key from a dict item's first token, taking the : after it."""
+        if token[0] != "value" or type(token[1]) != str:
+            raise self._error("Expected a key")
+        self.expect(":")
+        return token[1]
+
+    def value(self, token: tuple[str, Any] = None) -> Any:
+        """Reads a whole value, meant for small things.
+
+        Args:
+            token (tuple[str, Any], optional): Its first token, if it has already been taken. Defaults to taking the next one.
+        """
+        if token is None:
+            token = self.next()
+        kind = token[0]
+        if kind == "value":
+            return token[1]
+        elif kind == "{":
+            return {self.key(item): self.value() for item in self.items("}")}
+        elif kind == "[":
+            return [self.value(item) for item in self.items("]")]
+        raise self._error(f"Unexpected {kind!r}")
+
+    def end(self) -> None:
+        """Checks there's nothing but whitespace left."""
+        if self._skipSpace():
+            raise self._error("Extra data after the JSON")
+
+
+def _treeEvents(
+    tokens: JsonTokens, token: tuple[str, Any], path: tuple
+) -> Iterator[PropertyTreeEvent]:
+    kind = token[0]
+    if kind == "{":
+        yield PropertyTreeEvent(START_DICT, path, 5, None)
+        for item in tokens.items("}"):
+            key = tokens.key(item)
+            yield from _treeEvents(tokens, tokens.next(), path + (key,))
+        yield PropertyTreeEvent(END_DICT, path, 5, None, None)
+    elif kind == "[":
+        yield PropertyTreeEvent(START_LIST, path, 4, None)
+        for i, item in enumerate(tokens.items("]")):
+            yield from _treeEvents(tokens, item, path + (i,))
+        yield PropertyTreeEvent(END_LIST, path, 4, None, None)
+    elif kind == "value":
+        # the writer works out the type
+        yield PropertyTreeEvent(VALUE, path, None, token[1])
+    else:
+        raise tokens._error(f"Unexpected {kind!r}")
+
+
+def jsonToModSettings(
+    src: TextIO | io.BufferedReader, out: io.BufferedWriter | io.BytesIO
+) -> None:
+    """Writes JSON like modSettingsToJson gives back out as mod settings, see the top of this file.
+
+    Args:
+        src (TextIO | io.BufferedReader): The JSON, as text or as utf-8 bytes.
+        out (io.BufferedWriter | io.BytesIO): Where the mod settings go, has to be seekable.
+
+    Raises:
+        ValueError: If the JSON is bad or has no version.
+    """
+    tokens = JsonTokens(src)
+    tokens.expect("{")
+    start = out.tell()
+    # the version and the bool after it, filled in once the version turns up
+    out.write(bytes(9))
+    writer = PropertyTreeEventWriter(out)
+    writer.write(PropertyTreeEvent(START_DICT, (), 5, None))
+    version = None
+    for item in tokens.items("}"):
+        key = tokens.key(item)
+        if key == "version":
+            version = tokens.value()
+            continue
+        writer.writeAll(_treeEvents(tokens, tokens.next(), (key,)))
+    writer.write(PropertyTreeEvent(END_DICT, (), 5, None, None))
+    tokens.end()
+    if version is None:
+        raise ValueError("The mod settings have no version")
+    end = out.tell()
+    out.seek(start)
+    writeVersionString(out, version)
+    writeBool(out, False)
+    out.seek(end)
+
+
+_HEADER = compileSchema(Array(HEADER, length=Short))
+
+
+def _achData(types: dict, achType: str, data: Any) -> bytearray:
+    try:
+        return types[achType].codec.encode(data)
+    except KeyError:
+        raise ValueError(f"Unknown achievement type: {achType}") from None
+
+
+def jsonToAchievements(
+    src: TextIO | io.BufferedReader,
+    out: io.BufferedWriter | io.BytesIO,
+    modded: bool = False,
+) -> None:
+    """Writes JSON like achievementsToJson gives back out as achievements, see the top of this file.
+    the keys have to be in the same order as the file, version, randomBool, header, content, tracked
+
+    Args:
+        src (TextIO | io.BufferedReader): The JSON, as text or as utf-8 bytes.
+        out (io.BufferedWriter | io.BytesIO): Where the achievements go, has to be seekable.
+        modded (bool, optional): Whether it is achievements-modded.dat. Defaults to False.
+
+    Raises:
+        ValueError: If the JSON is bad or the keys are missing or out of order.
+    """
+    tokens = JsonTokens(src)
+    tokens.expect("{")
+    order = iter(("version", "randomBool", "header", "content", "tracked"))
+    indexLink = None
+    for item in tokens.items("}"):
+        key = tokens.key(item)
+        if key != next(order, None):
+            raise ValueError(f"Didn't expect {key!r} there in the achievements")
+        if key == "version":
+            writeVersionString(out, tokens.value())
+        elif key == "randomBool":
+            writeBool(out, tokens.value())
+        elif key == "header":
+            header = tokens.value()
+            indexLink = getIndexLink(header)
+            out.write(_HEADER.encode(header))
+        elif key == "content":
+            tokens.expect("[")
+            countAt = out.tell()
+            count = 0
+            out.write(bytes(4 if modded else 2))
+            for entry in tokens.items("]"):
+                entry = tokens.value(entry)
+                if modded:
+                    writeString(out, entry["type"], spaceOptimize=True)
+                    writeString(out, entry["name"], spaceOptimize=True)
+                    out.write(
+                        _achData(MODDED_ACHIEVEMENT_TYPES, entry["type"], entry["data"])
+                    )
+                else:
+                    out.write(SHORT.pack(entry["index"]))
+                    achType = indexLink[str(entry["index"])]
+                    out.write(_achData(ACHIEVEMENT_TYPES, achType, entry["content"]))
+                count += 1
+            end = out.tell()
+            out.seek(countAt)
+            out.write(UINT.pack(count) if modded else SHORT.pack(count))
+            out.seek(end)
+        else:
+            tokens.expect("[")
+            for entry in tokens.items("]"):
+                out.write(SHORT.pack(tokens.value(entry)))
+    tokens.end()
+    missing = next(order, None)
+    if missing is not None:
+        raise ValueError(f"The achievements have no {missing!r}")
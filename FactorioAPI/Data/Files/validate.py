@@ -0,0 +1,424 @@
+import io
+import os
+import struct
+from typing import NamedTuple
+
+from FactorioAPI.Data.Files.achievements import (
+    ACH_DATA_SIZES,
+    ACH_DECODERS,
+    MODDED_ACH_DATA_SIZES,
+    MODDED_ACH_DECODERS,
+)
+from FactorioAPI.Data.IO.buffer import BufferReader
+from FactorioAPI.Data.IO.codec import SHORT, UINT
+
+"""
+checking a file is well formed without reading it
+
+the validators walk the same structure the readers do, but only look at type bytes, flags and lengths
+and jump over everything else by its size, so nothing is built and the only strings decoded are achievement
+types (they say how big the data after them is). strings aren't checked to be valid utf-8
+
+a file is first walked with no bounds checks at all (_scanPropertyTree, _scanAchievements), and only if that
+trips over something is it walked again carefully to find the offset and what should have been there
+
+    result = validateModSettings(upload)
+    if not result:
+        print(result)  # "expected a property tree type (0-5) at byte 1234, got 9"
+"""
+
+
+class ValidationResult(NamedTuple):
+    """What a validator found, truthy when the file is fine."""
+
+    ok: bool
+    # where it went wrong and what should have been there, None when ok
+    offset: int | None = None
+    expected: str | None = None
+    message: str | None = None
+
+    def __bool__(self) -> bool:
+        return self.ok
+
+    def __str__(self) -> str:
+        if self.ok:
+            return "OK"
+        return f"expected {self.expected} at byte {self.offset}, {self.message}"
+
+
+OK = ValidationResult(True)
+
+
+class _Invalid(Exception):
+    def __init__(self, offset: int, expected: str, message: str) -> None:
+        super().__init__(offset, expected, message)
+        self.result = ValidationResult(False, offset, expected, message)
+
+
+def _view(
+    data: bytes | bytearray | memoryview | BufferReader | io.BufferedReader,
+) -> memoryview:
+    if isinstance(data, BufferReader):
+        return data.view[data.pos :]
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        return memoryview(data).cast("B")
+    return memoryview(data.read())
+
+
+def _need(view: memoryview, pos: int, size: int, expected: str) -> None:
+    if pos + size > len(view):
+        raise _Invalid(pos, expected, f"the file ends after {len(view) - pos} bytes")
+
+
+def _flag(view: memoryview, pos: int, expected: str) -> None:
+    _need(view, pos, 1, expected)
+    if view[pos] > 1:
+        raise _Invalid(pos, expected, f"got {view[pos]}")
+
+
+def _skipString(view: memoryview, pos: int, expected: str) -> int:
+    # a space optimized length then that many bytes
+    _need(view, pos, 1, f"the length of {expected}")
+    length = view[pos]
+    pos += 1
+    if length == 255:
+        _need(view, pos, 4, f"the length of {expected}")
+        length = UINT.unpack_from(view, pos)[0]
+        pos += 4
+    _need(view, pos, length, expected)
+    return pos + length
+
+
+def _skipPTString(view: memoryview, pos: int, expected: str) -> int:
+    _flag(view, pos, f"the empty flag of {expected}")
+    if view[pos] == 1:
+        return pos + 1
+    return _skipString(view, pos + 1, expected)
+
+
+def _skipPropertyTree(view: memoryview, pos: int) -> int:
+    # a stack instead of recursion so a corrupt file can't nest deep enough to overflow
+    # [is a dict, children left]
+    stack = []
+    end = len(view)
+    while True:
+        _need(view, pos, 2, "a property tree node")
+        dataType = view[pos]
+        if dataType > 5:
+            raise _Invalid(pos, "a property tree type (0-5)", f"got {dataType}")
+        _flag(view, pos + 1, "the any type flag")
+        pos += 2
+        if dataType == 1:
+            _flag(view, pos, "a bool")
+            pos += 1
+        elif dataType == 2:
+            _need(view, pos, 8, "a double")
+            pos += 8
+        elif dataType == 3:
+            pos = _skipPTString(view, pos, "a string")
+        elif dataType == 4 or dataType == 5:
+            _need(view, pos, 4, "a count")
+            count = UINT.unpack_from(view, pos)[0]
+            # every child is at least 2 bytes, so a count bigger than that can't be right
+            if count * 2 > end - pos - 4:
+                raise _Invalid(
+                    pos,
+                    "a count",
+                    f"got {count}, more than the rest of the file can hold",
+                )
+            pos += 4
+            stack.append([dataType == 5, count])
+        # go to the next child, closing everything that is done
+        while stack:
+            frame = stack[-1]
+            if frame[1] == 0:
+                stack.pop()
+                continue
+            frame[1] -= 1
+            if frame[0]:
+                pos = _skipPTString(view, pos, "a dict key")
+            break
+        else:
+            return pos
+
+
+class _Recheck(Exception):
+    pass
+
+
+def _scanPropertyTree(view: memoryview, pos: int) -> int:
+    # the same walk as _skipPropertyTree with no bounds checks or messages, it just goes until something
+    # is out of range (IndexError, struct.error) or wrong (_Recheck). anything it accepts _skipPropertyTree
+    # does too, so a bad file is walked again with that to find out where and why
+    unpack = UINT.unpack_from
+    # children left, times 2, plus 1 for a dict
+    stack = []
+    while True:
+        dataType = view[pos]
+        if dataType > 5 or view[pos + 1] > 1:
+            raise _Recheck
+        pos += 2
+        if dataType == 2:
+            pos += 8
+        elif dataType == 5 or dataType == 4:
+            stack.append(unpack(view, pos)[0] * 2 + (dataType == 5))
+            pos += 4
+        elif dataType == 3:
+            empty = view[pos]
+            if empty == 0:
+                length = view[pos + 1]
+                if length == 255:
+                    pos += unpack(view, pos + 2)[0] + 6
+                else:
+                    pos += length + 2
+            elif empty == 1:
+                pos += 1
+            else:
+                raise _Recheck
+        elif dataType == 1:
+            if view[pos] > 1:
+                raise _Recheck
+            pos += 1
+        while stack:
+            left = stack[-1]
+            if left < 2:
+                stack.pop()
+                continue
+            stack[-1] = left - 2
+            if left & 1:
+                empty = view[pos]
+                if empty == 0:
+                    length = view[pos + 1]
+                    if length == 255:
+                        pos += unpack(view, pos + 2)[0] + 6
+                    else:
+                        pos += length + 2
+                elif empty == 1:
+                    pos += 1
+                else:
+                    raise _Recheck
+            break
+        else:
+            return pos
+
+
+def _end(view: memoryview, pos: int) -> None:
+    if pos != len(view):
+        raise _Invalid(pos, "the end of the file", f"{len(view) - pos} bytes left over")
+
+
+def validateModSettings(
+    data: bytes | bytearray | memoryview | BufferReader | io.BufferedReader,
+) -> ValidationResult:
+    """Checks mod settings are well formed, see the top of this file.
+
+    Args:
+        data (bytes | bytearray | memoryview | BufferReader | io.BufferedReader): The mod settings.
+
+    Returns:
+        ValidationResult: OK, or where and why it isn't.
+    """
+    view = _view(data)
+    try:
+        _need(view, 0, 8, "a version")
+        _flag(view, 8, "a bool")
+        _need(view, 9, 1, "a property tree dict")
+        if view[9] != 5:
+            raise _Invalid(9, "a property tree dict (type 5)", f"got type {view[9]}")
+        try:
+            if _scanPropertyTree(view, 9) == len(view):
+                return OK
+        except (_Recheck, IndexError, struct.error):
+            pass
+        _end(view, _skipPropertyTree(view, 9))
+    except _Invalid as invalid:
+        return invalid.result
+    return OK
+
+
+def _typeString(view: memoryview, pos: int) -> tuple[str, int]:
+    # the one string that does get decoded, the type says how big the data is
+    start = pos
+    pos = _skipString(view, pos, "an achievement type")
+    start += 5 if view[start] == 255 else 1
+    return str(view[start:pos], "utf-8", "replace"), pos
+
+
+def _skipHeader(view: memoryview, pos: int, modded: bool) -> tuple[dict, int]:
+    # index > ach type
+    indexTypes = {0: "NoneType"}
+    _need(view, pos, 2, "the header count")
+    count = SHORT.unpack_from(view, pos)[0]
+    pos += 2
+    for i in range(count):
+        # an unknown type is only a problem if an achievement of that type is in the content, like when reading
+        achType, pos = _typeString(view, pos)
+        _need(view, pos, 2, "an achievement count")
+        achCount = SHORT.unpack_from(view, pos)[0]
+        pos += 2
+        for j in range(achCount):
+            pos = _skipString(view, pos, "an achievement name")
+            _need(view, pos, 2, "an achievement index")
+            indexTypes[SHORT.unpack_from(view, pos)[0]] = achType
+            pos += 2
+    return indexTypes, pos
+
+
+def _skipAchData(view: memoryview, pos: int, achType: str, modded: bool) -> int:
+    sizes = MODDED_ACH_DATA_SIZES if modded else ACH_DATA_SIZES
+    size = sizes.get(achType)
+    if size is not None:
+        _need(view, pos, size, f"the data of a {achType}")
+        return pos + size
+    # a type whose size depends on its data, its decoder is the only thing that knows how big it is
+    decoders = MODDED_ACH_DECODERS if modded else ACH_DECODERS
+    if achType not in decoders:
+        raise _Invalid(pos, "a known achievement type", f"got {achType!r}")
+    reader = BufferReader(view, pos)
+    try:
+        decoders[achType](reader)
+    except Exception as e:
+        raise _Invalid(pos, f"the data of a {achType}", str(e)) from None
+    if reader.pos > len(view):
+        raise _Invalid(
+            pos, f"the data of a {achType}", "the file ends part way through"
+        )
+    return reader.pos
+
+
+def _scanAchievements(view: memoryview, modded: bool) -> int:
+    # like _scanPropertyTree, validateAchievements with no checks that stops at anything unexpected.
+    # types without a fixed size are left to the careful walk
+    short = SHORT.unpack_from
+    uint = UINT.unpack_from
+    # keyed by the type's bytes, made each time since types can be registered at any point
+    sizes = {
+        achType.encode(): size
+        for achType, size in (
+            MODDED_ACH_DATA_SIZES if modded else ACH_DATA_SIZES
+        ).items()
+    }
+    # index > size of its data
+    indexSizes = {0: 0}
+    pos = 11
+    for i in range(short(view, 9)[0]):
+        length = view[pos]
+        if length == 255:
+            length = uint(view, pos + 1)[0]
+            pos += 4
+        achType = bytes(view[pos + 1 : pos + 1 + length])
+        pos += length + 1
+        size = sizes.get(achType)
+        if size is None and not modded:
+            raise _Recheck
+        achCount = short(view, pos)[0]
+        pos += 2
+        for j in range(achCount):
+            length = view[pos]
+            if length == 255:
+                pos += uint(view, pos + 1)[0] + 5
+            else:
+                pos += length + 1
+            indexSizes[short(view, pos)[0]] = size
+            pos += 2
+    if modded:
+        count = uint(view, pos)[0]
+        pos += 4
+        for i in range(count):
+            length = view[pos]
+            if length == 255:
+                length = uint(view, pos + 1)[0]
+                pos += 4
+            size = sizes[bytes(view[pos + 1 : pos + 1 + length])]
+            if size is None:
+                raise _Recheck
+            pos += length + 1
+            length = view[pos]
+            if length == 255:
+                pos += uint(view, pos + 1)[0] + 5
+            else:
+                pos += length + 1
+            pos += size
+    else:
+        count = short(view, pos)[0]
+        pos += 2
+        for i in range(count):
+            pos += indexSizes[short(view, pos)[0]] + 2
+    return pos
+
+
+def validateAchievements(
+    data: bytes | bytearray | memoryview | BufferReader | io.BufferedReader,
+    modded: bool = False,
+) -> ValidationResult:
+    """Checks achievements are well formed, see the top of this file.
+
+    Args:
+        data (bytes | bytearray | memoryview | BufferReader | io.BufferedReader): The achievements.
+        modded (bool, optional): Whether it is achievements-modded.dat. Defaults to False.
+
+    Returns:
+        ValidationResult: OK, or where and why it isn't.
+    """
+    view = _view(data)
+    try:
+        _need(view, 0, 8, "a version")
+        _flag(view, 8, "a bool")
+        try:
+            pos = _scanAchievements(view, modded)
+            if pos <= len(view) and (len(view) - pos) % 2 == 0:
+                return OK
+        except (_Recheck, IndexError, KeyError, struct.error):
+            pass
+        indexTypes, pos = _skipHeader(view, 9, modded)
+        if modded:
+            _need(view, pos, 4, "the achievement count")
+            count = UINT.unpack_from(view, pos)[0]
+            pos += 4
+            for i in range(count):
+                achType, pos = _typeString(view, pos)
+                pos = _skipString(view, pos, "an achievement name")
+                pos = _skipAchData(view, pos, achType, True)
+        else:
+            _need(view, pos, 2, "the achievement count")
+            count = SHORT.unpack_from(view, pos)[0]
+            pos += 2
+            for i in range(count):
+                _need(view, pos, 2, "an achievement index")
+                index = SHORT.unpack_from(view, pos)[0]
+                if index not in indexTypes:
+                    raise _Invalid(
+                        pos, "an achievement index from the header", f"got {index}"
+                    )
+                pos = _skipAchData(view, pos + 2, indexTypes[index], False)
+        if (len(view) - pos) % 2 != 0:
+            raise _Invalid(
+                pos,
+                "tracked achievement indexes (shorts)",
+                "there is an odd amount of bytes left",
+            )
+    except _Invalid as invalid:
+        return invalid.result
+    return OK
+
+
+# kind > validator, the kinds are the same as batch.py's
+VALIDATORS = {
+    "modSettings": validateModSettings,
+    "achievements": validateAchievements,
+    "moddedAchievements": lambda data: validateAchievements(data, modded=True),
+}
+
+
+def validateFile(path: str | os.PathLike, kind: str) -> ValidationResult:
+    """Checks a file is well formed, the file is mapped with mmap rather than read.
+
+    Args:
+        path (str | os.PathLike): The file.
+        kind (str): "modSettings", "achievements" or "moddedAchievements".
+
+    Returns:
+        ValidationResult: OK, or where and why it isn't.
+    """
+    with BufferReader.open(path) as f:
+        return VALIDATORS[kind](f)
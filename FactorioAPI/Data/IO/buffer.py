@@ -0,0 +1,204 @@
+import mmap
+import os
+import struct
+from typing import Any
+
+"""
+a cursor over a buffer that already holds the whole file (bytes, bytearray, memoryview or mmap)
+
+it has the same read/seek/tell as a file so every reader in read.py works on it as is,
+the difference is read() hands back a slice of a memoryview instead of copying into a new bytes object,
+and BufferReader.open() maps the file with mmap so it never gets loaded with one big read
+
+BufferWriter is the other way around, it gets told the exact size up front (see the sizeOf functions in write.py)
+so a whole file is written into one bytearray and then handed to the real file in a single write
+"""
+
+
+class BufferReader:
+    """A zero-copy read cursor, a memoryview plus an integer offset."""
+
+    __slots__ = ("view", "pos", "_mmap")
+
+    def __init__(
+        self, data: bytes | bytearray | memoryview | mmap.mmap, pos: int = 0
+    ) -> None:
+        """
+        Args:
+            data (bytes | bytearray | memoryview | mmap.mmap): The buffer to read from.
+            pos (int, optional): The offset to start reading at. Defaults to 0.
+        """
+        self.view = memoryview(data).cast("B")
+        self.pos = pos
+        self._mmap = None
+
+    @classmethod
+    def open(cls, path: str | os.PathLike) -> "BufferReader":
+        """Maps a file into memory and returns a reader over it.
+        use it as a context manager (or call close) so the mapping gets released
+
+        Args:
+            path (str | os.PathLike): The path of the file to read.
+
+        Returns:
+            BufferReader: A reader over the mapped file.
+        """
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                # can't mmap an empty file
+                return cls(b"")
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        reader = cls(mapped)
+        reader._mmap = mapped
+        return reader
+
+    def read(self, size: int = -1) -> memoryview:
+        """Reads up to size bytes, or everything left if size is negative.
+
+        Args:
+            size (int, optional): The amount of bytes to read. Defaults to -1.
+
+        Returns:
+            memoryview: A view of the bytes read, this is not a copy.
+        """
+        start = self.pos
+        if size < 0:
+            end = len(self.view)
+        else:
+            end = min(start + size, len(self.view))
+        self.pos = end
+        return self.view[start:end]
+
+    def unpack(self, s: struct.Struct) -> Any:
+        """Unpacks a single value at the cursor with one of the structs from codec.py.
+
+        Args:
+            s (struct.Struct): The struct to unpack with.
+
+        Returns:
+            Any: The unpacked value.
+        """
+        value = s.unpack_from(self.view, self.pos)[0]
+        self.pos += s.size
+        return value
+
+    def seek(self, pos: int, whence: int = os.SEEK_SET) -> int:
+        if whence == os.SEEK_CUR:
+            pos += self.pos
+        elif whence == os.SEEK_END:
+            pos += len(self.view)
+        if pos < 0:
+            raise ValueError(f"negative seek position {pos}")
+        self.pos = pos
+        return self.pos
+
+    def tell(self) -> int:
+        return self.pos
+
+    def seekable(self) -> bool:
+        return True
+
+    def remaining(self) -> int:
+        """
+        Returns:
+            int: How many bytes are left after the cursor.
+        """
+        return max(len(self.view) - self.pos, 0)
+
+    def __len__(self) -> int:
+        return len(self.view)
+
+    def close(self) -> None:
+        """Releases the view and the mapping if the reader was made with open.
+        any slices still held from read() have to be let go of first
+        """
+        self.view.release()
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def __enter__(self) -> "BufferReader":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+class BufferWriter:
+    """A write cursor over one preallocated bytearray.
+    has write/seek/tell like a file so every writer in write.py works on it,
+    the point is to size it exactly up front so nothing ever gets reallocated
+    """
+
+    __slots__ = ("buffer", "view", "pos")
+
+    def __init__(self, size: int) -> None:
+        """
+        Args:
+            size (int): The exact amount of bytes that will be written.
+        """
+        self.buffer = bytearray(size)
+        self.view = memoryview(self.buffer)
+        self.pos = 0
+
+    def write(self, data: bytes | bytearray | memoryview) -> int:
+        """Copies data into the buffer at the cursor.
+
+        Args:
+            data (bytes | bytearray | memoryview): The bytes to write.
+
+        Raises:
+            ValueError: If the data doesn't fit in what is left of the buffer.
+
+        Returns:
+            int: The amount of bytes written.
+        """
+        start = self.pos
+        end = start + len(data)
+        if end > len(self.buffer):
+            raise ValueError(
+                f"BufferWriter overflow, writing {len(data)} bytes at {start} into a {len(self.buffer)} byte buffer"
+            )
+        self.view[start:end] = data
+        self.pos = end
+        return end - start
+
+    def pack(self, s: struct.Struct, value: Any) -> None:
+        """Packs a single value at the cursor with one of the structs from codec.py.
+
+        Args:
+            s (struct.Struct): The struct to pack with.
+            value (Any): The value to write.
+        """
+        s.pack_into(self.buffer, self.pos, value)
+        self.pos += s.size
+
+    def seek(self, pos: int, whence: int = os.SEEK_SET) -> int:
+        if whence == os.SEEK_CUR:
+            pos += self.pos
+        elif whence == os.SEEK_END:
+            pos += len(self.buffer)
+        if pos < 0:
+            raise ValueError(f"negative seek position {pos}")
+        self.pos = pos
+        return self.pos
+
+    def tell(self) -> int:
+        return self.pos
+
+    def seekable(self) -> bool:
+        return True
+
+    def getbuffer(self) -> memoryview:
+        """
+        Returns:
+            memoryview: A view of everything written so far, this is not a copy.
+        """
+        return self.view[: self.pos]
+
+    def getvalue(self) -> bytes:
+        """
+        Returns:
+            bytes: A copy of everything written so far.
+        """
+        return bytes(self.view[: self.pos])
@@ -0,0 +1,77 @@
+import struct
+from typing import Any
+
+import numpy as np
+
+"""
+precompiled structs for every fixed width type in https://wiki.factorio.com/Data_types
+everything factorio writes is little endian, so all of these are "<"
+
+read.py and write.py use these instead of int.from_bytes / numpy for every single value,
+compiling the format once here means each read or write is just one unpack or pack call
+
+primitiveDtype turns the same structs into numpy dtypes, for reading or writing a whole run of one type at once
+"""
+
+BOOL = struct.Struct("<?")
+BYTE = struct.Struct("<b")
+UBYTE = struct.Struct("<B")
+SHORT = struct.Struct("<h")
+USHORT = struct.Struct("<H")
+INT = struct.Struct("<i")
+UINT = struct.Struct("<I")
+LONG = struct.Struct("<q")
+ULONG = struct.Struct("<Q")
+FLOAT = struct.Struct("<f")
+DOUBLE = struct.Struct("<d")
+
+# major, minor, patch, dev
+VERSION = struct.Struct("<4H")
+
+
+def unpackFrom(
+    s: struct.Struct, buffer: bytes | bytearray | memoryview, offset: int = 0
+) -> tuple[Any, int]:
+    """Unpacks a single value from a buffer at the given offset.
+
+    Args:
+        s (struct.Struct): One of the precompiled structs in this module.
+        buffer (bytes | bytearray | memoryview): The buffer to read from.
+        offset (int, optional): Where in the buffer to start. Defaults to 0.
+
+    Returns:
+        tuple[Any, int]: The value and the offset right after it.
+    """
+    return s.unpack_from(buffer, offset)[0], offset + s.size
+
+
+def packInto(
+    s: struct.Struct, buffer: bytearray | memoryview, offset: int, value: Any
+) -> int:
+    """Packs a single value into a writable buffer at the given offset.
+
+    Args:
+        s (struct.Struct): One of the precompiled structs in this module.
+        buffer (bytearray | memoryview): The buffer to write to.
+        offset (int): Where in the buffer to start.
+        value (Any): The value to write.
+
+    Returns:
+        int: The offset right after the written value.
+    """
+    s.pack_into(buffer, offset, value)
+    return offset + s.size
+
+
+def primitiveDtype(dtype: np.dtype | struct.Struct | str) -> np.dtype:
+    """Turns a primitive type descriptor into a little endian numpy dtype.
+
+    Args:
+        dtype (np.dtype | struct.Struct | str): A numpy dtype (or anything np.dtype takes) or one of the structs in this module.
+
+    Returns:
+        np.dtype: The little endian dtype.
+    """
+    if isinstance(dtype, struct.Struct):
+        dtype = dtype.format
+    return np.dtype(dtype).newbyteorder("<")
@@ -0,0 +1,284 @@
+import struct
+from typing import Any, Callable, Generator
+
+from FactorioAPI.Data.IO.codec import UINT, VERSION
+from FactorioAPI.Data.IO.schema import (
+    Array,
+    Capture,
+    CompiledSchema,
+    Dict,
+    OptimizedNumber,
+    Recursive,
+    Schema,
+    String,
+    Struct,
+    Switch,
+    compileSchema,
+    fixedSize,
+)
+
+"""
+parsing from chunks of bytes that are pushed in, instead of reading from a file
+
+a parse is written as a generator that yields how many bytes it wants next and gets exactly that many sent back,
+so it never reads, seeks or waits on anything itself:
+
+    def parseThing(emit):
+        length = UINT.unpack((yield 4))[0]
+        name = str((yield length), "utf-8")
+        emit(("name", name))
+        return name
+
+the pull functions below are the read.py primitives written that way, use them with yield from.
+yielding REST instead of a size asks for whatever has arrived so far, and b"" once there is nothing more coming
+
+PushParser runs one of those generators: feed() it chunks of any size (a socket, a zip member, a decompressor)
+and it hands back whatever was emitted as soon as enough bytes have arrived.
+only the bytes the parse hasn't taken yet are kept, never the whole file
+"""
+
+# yield this instead of a size to get whatever bytes there are, b"" at the end
+REST = -1
+
+# how far into the buffer the parse has to get before the used bytes are dropped
+_COMPACT_AT = 1 << 16
+
+Parse = Generator[int, bytes, Any]
+
+
+def pullStruct(s: struct.Struct) -> Parse:
+    """
+    Args:
+        s (struct.Struct): The struct to unpack, see codec.py.
+
+    Returns:
+        Any: The first value unpacked.
+    """
+    return s.unpack((yield s.size))[0]
+
+
+def pullBool() -> Parse:
+    return (yield 1) == b"\x01"
+
+
+def pullOptimizedNumber() -> Parse:
+    """readOptimizedNumber, see read.py"""
+    number = (yield 1)[0]
+    if number == 255:
+        number = UINT.unpack((yield 4))[0]
+    return number
+
+
+def pullString(spaceOptimized: bool = False) -> Parse:
+    """readString, see read.py"""
+    if spaceOptimized:
+        length = yield from pullOptimizedNumber()
+    else:
+        length = UINT.unpack((yield 4))[0]
+    if length == 0:
+        return ""
+    return str((yield length), "utf-8")
+
+
+def pullHexed(size: int) -> Parse:
+    return "HEX-" + (yield size).hex()
+
+
+# schemas pullSchema had to decode part of on its own, like an Array's length
+_compiled = {}
+
+
+def _decodeAs(schema: Schema, data: bytes | bytearray) -> Any:
+    codec = _compiled.get(schema)
+    if codec is None:
+        codec = _compiled[schema] = compileSchema(schema)
+    return codec.decode(data)[0]
+
+
+def _pullCount(schema: Schema, out: bytearray) -> Parse:
+    if isinstance(schema, OptimizedNumber):
+        data = yield 1
+        out += data
+        if data[0] != 255:
+            return data[0]
+        data = yield 4
+        out += data
+        return UINT.unpack(data)[0]
+    data = bytearray()
+    yield from _pullBytes(schema, data, {})
+    out += data
+    return _decodeAs(schema, data)
+
+
+def _pullBytes(schema: Schema, out: bytearray, scope: dict) -> Parse:
+    # adds the bytes of one schema to out, only reading the lengths (and Switch keys) it needs along the way.
+    # scope is field name > (schema, bytes) of the Struct it is in, for a Switch
+    size = fixedSize(schema)
+    if size is not None:
+        if size:
+            out += yield size
+    elif isinstance(schema, String):
+        length = yield from _pullCount(schema.length, out)
+        if length:
+            out += yield length
+    elif isinstance(schema, Array):
+        count = yield from _pullCount(schema.length, out)
+        itemSize = fixedSize(schema.item)
+        if itemSize is not None:
+            # every item in one go
+            if count * itemSize:
+                out += yield count * itemSize
+        else:
+            for i in range(count):
+                yield from _pullBytes(schema.item, out, {})
+    elif isinstance(schema, Dict):
+        for i in range((yield from _pullCount(schema.length, out))):
+            yield from _pullBytes(schema.key, out, {})
+            yield from _pullBytes(schema.value, out, {})
+    elif isinstance(schema, Struct):
+        fields = {}
+        for name, field, encode in schema.fields:
+            data = bytearray()
+            yield from _pullBytes(field, data, fields)
+            fields[name] = (field, data)
+            out += data
+    elif isinstance(schema, Switch):
+        if schema.lookup is not None or schema.on not in scope:
+            raise ValueError(f"A Switch on {schema.on!r} can't be pulled on its own")
+        case = schema.cases.get(_decodeAs(*scope[schema.on]), schema.default)
+        if case is None:
+            raise ValueError(f"Unknown {schema.on}")
+        yield from _pullBytes(case, out, {})
+    elif isinstance(schema, (Capture, Recursive)):
+        yield from _pullBytes(schema.schema, out, scope)
+    else:
+        raise ValueError(f"A {type(schema).__name__} can't be pulled")
+
+
+def pullSchema(schema: Schema, codec: CompiledSchema = None) -> Parse:
+    """A value of any schema (see schema.py) except Rest and Switch(lookup=...).
+    the lengths and counts in it are read first so every run of bytes after them is one yield,
+    then the whole value is decoded in one go
+
+    Args:
+        schema (Schema): The schema.
+        codec (CompiledSchema, optional): schema compiled, if there already is one. Defaults to compiling it.
+
+    Returns:
+        Any: The value, the same as the codec's decode gives.
+    """
+    data = bytearray()
+    yield from _pullBytes(schema, data, {})
+    if codec is None:
+        return _decodeAs(schema, data)
+    return codec.decode(data)[0]
+
+
+def pullVersionString() -> Parse:
+    """readVersionString, see read.py"""
+    return list(VERSION.unpack((yield VERSION.size)))
+
+
+class PushParser:
+    """Runs a parse generator over chunks of bytes, see the top of this file."""
+
+    def __init__(self, parse: Callable[[Callable[[Any], None]], Parse]) -> None:
+        """
+        Args:
+            parse (Callable[[Callable[[Any], None]], Parse]): A generator function, it gets given an emit function.
+        """
+        self._buffer = bytearray()
+        self._pos = 0
+        self._emitted = []
+        self._parse = parse(self._emitted.append)
+        self.done = False
+        self.result = None
+        # how many bytes the parse has taken, for error messages
+        self.offset = 0
+        self._want = self._send(None)
+
+    def _send(self, data: bytes | None) -> int | None:
+        try:
+            return self._parse.send(data)
+        except StopIteration as stop:
+            self.done = True
+            self.result = stop.value
+            return None
+
+    def _run(self) -> None:
+        buffer = self._buffer
+        pos = self._pos
+        want = self._want
+        while not self.done:
+            if want == REST:
+                if pos == len(buffer):
+                    break
+                data = bytes(buffer[pos:])
+            else:
+                if len(buffer) - pos < want:
+                    break
+                data = bytes(buffer[pos : pos + want])
+            pos += len(data)
+            self.offset += len(data)
+            want = self._send(data)
+        self._want = want
+        if pos == len(buffer):
+            buffer.clear()
+            pos = 0
+        elif pos >= _COMPACT_AT:
+            del buffer[:pos]
+            pos = 0
+        self._pos = pos
+
+    def _takeEmitted(self) -> list:
+        emitted = self._emitted[:]
+        self._emitted.clear()
+        return emitted
+
+    def feed(self, data: bytes | bytearray | memoryview) -> list:
+        """Gives the parser more bytes.
+
+        Args:
+            data (bytes | bytearray | memoryview): The next chunk, any size.
+
+        Raises:
+            ValueError: If the parse has already finished and there are more bytes.
+
+        Returns:
+            list: Everything the parse emitted because of this chunk, in order.
+        """
+        if self.done:
+            if len(data):
+                raise ValueError(f"Got more bytes after the end, at byte {self.offset}")
+            return []
+        self._buffer += data
+        self._run()
+        return self._takeEmitted()
+
+    def close(self) -> Any:
+        """Tells the parser there are no more bytes.
+
+        Raises:
+            ValueError: If the parse wasn't finished, or bytes were left over.
+
+        Returns:
+            Any: What the parse returned.
+        """
+        if not self.done and self._want == REST:
+            self._want = self._send(b"")
+        if not self.done:
+            raise ValueError(
+                f"Ran out of bytes at byte {self.offset}, wanted {self._want} but only had {len(self._buffer) - self._pos}"
+            )
+        if self._pos != len(self._buffer):
+            raise ValueError(
+                f"{len(self._buffer) - self._pos} bytes left over after byte {self.offset}"
+            )
+        return self.result
+
+    def emitted(self) -> list:
+        """
+        Returns:
+            list: Anything emitted since the last feed, like what close emitted.
+        """
+        return self._takeEmitted()
@@ -1,7 +1,26 @@
 import io
+import struct
 from typing import Any, Callable
+
 import numpy as np
 
+from FactorioAPI.Data.IO.buffer import BufferReader
+from FactorioAPI.Data.IO.codec import (
+    BYTE,
+    DOUBLE,
+    FLOAT,
+    INT,
+    LONG,
+    SHORT,
+    UBYTE,
+    UINT,
+    ULONG,
+    USHORT,
+    VERSION,
+    primitiveDtype,
+)
+from FactorioAPI.Data.IO.symbols import SymbolTable
+
 """
 readArray's objectDecoder arg, due to how an array has a object type and depending on the object there is an unkown amount of bytes between each object, because it could be 
 different objects, also because arrays are sometimes used with object based types and those objects could contain strings and other stuff, i am just gonna have it take in a 
@@ -10,17 +29,19 @@ easy but for now, i'm doing it like this
 
 same thing above but for the dict
 
+(later: schema.py is that, formats described once and compiled into readers and writers, these stay as the simple versions)
+
 this was made based on the documentation at https://wiki.factorio.com/Data_types
 and thank you very much to whoever made it for it is so nice, whether it be the factorio devs or a random person
 
 """
 
 
-def readBool(f: io.BufferedReader | io.BytesIO) -> bool:
+def readBool(f: io.BufferedReader | io.BytesIO | BufferReader) -> bool:
     """Reads a single byte and interprets it as a boolean value.
 
     Args:
-        f (io.BufferedReader | io.BytesIO): A file-like object or bytes buffer.
+        f (io.BufferedReader | io.BytesIO | BufferReader): A file-like object, bytes buffer or BufferReader.
 
     Returns:
         bool: True if the byte read is b'\x01', otherwise False.
@@ -28,148 +49,154 @@ def readBool(f: io.BufferedReader | io.BytesIO) -> bool:
     return f.read(1) == b"\x01"
 
 
-def readByte(f: io.BufferedReader | io.BytesIO) -> int:
+def readByte(f: io.BufferedReader | io.BytesIO | BufferReader) -> int:
     """Reads a single byte and interprets it as an integer.
 
     Args:
-        f (io.BufferedReader | io.BytesIO): A file-like object or bytes buffer.
+        f (io.BufferedReader | io.BytesIO | BufferReader): A file-like object, bytes buffer or BufferReader.
 
     Returns:
         int: The byte read as an integer.
     """
-    return int.from_bytes(f.read(1), "little", signed=True)
+    return BYTE.unpack(f.read(1))[0]
 
 
-def readUByte(f: io.BufferedReader | io.BytesIO) -> int:
+def readUByte(f: io.BufferedReader | io.BytesIO | BufferReader) -> int:
     """Reads a single byte and interprets it as an unsigned integer.
 
     Args:
-        f (io.BufferedReader | io.BytesIO): A file-like object or bytes buffer.
+        f (io.BufferedReader | io.BytesIO | BufferReader): A file-like object, bytes buffer or BufferReader.
 
     Returns:
         int: The byte read as an unsigned integer.
     """
-    return int.from_bytes(f.read(1), "little", signed=False)
+    return UBYTE.unpack(f.read(1))[0]
 
 
-def readShort(f: io.BufferedReader | io.BytesIO) -> int:
+def readShort(f: io.BufferedReader | io.BytesIO | BufferReader) -> int:
     """Reads 2 bytes and interprets them as a signed integer.
 
     Args:
-        f (io.BufferedReader | io.BytesIO): A file-like object or bytes buffer.
+        f (io.BufferedReader | io.BytesIO | BufferReader): A file-like object, bytes buffer or BufferReader.
 
     Returns:
         int: The bytes read as a signed integer.
     """
-    return int.from_bytes(f.read(2), "little", signed=True)
+    return SHORT.unpack(f.read(2))[0]
 
 
-def readUShort(f: io.BufferedReader | io.BytesIO) -> int:
+def readUShort(f: io.BufferedReader | io.BytesIO | BufferReader) -> int:
     """Reads 2 bytes and interprets them as an unsigned integer.
 
     Args:
-        f (io.BufferedReader | io.BytesIO): A file-like object or bytes buffer.
+        f (io.BufferedReader | io.BytesIO | BufferReader): A file-like object, bytes buffer or BufferReader.
 
     Returns:
         int: The bytes read as an unsigned integer.
     """
-    return int.from_bytes(f.read(2), "little", signed=False)
+    return USHORT.unpack(f.read(2))[0]
 
 
-def readInt(f: io.BufferedReader | io.BytesIO) -> int:
+def readInt(f: io.BufferedReader | io.BytesIO | BufferReader) -> int:
     """Reads 4 bytes and interprets them as a signed integer.
 
     Args:
-        f (io.BufferedReader | io.BytesIO): A file-like object or bytes buffer.
+        f (io.BufferedReader | io.BytesIO | BufferReader): A file-like object, bytes buffer or BufferReader.
 
     Returns:
         int: The bytes read as a signed integer.
     """
-    return int.from_bytes(f.read(4), "little", signed=True)
+    return INT.unpack(f.read(4))[0]
 
 
-def readUInt(f: io.BufferedReader | io.BytesIO) -> int:
+def readUInt(f: io.BufferedReader | io.BytesIO | BufferReader) -> int:
     """Reads 4 bytes and interprets them as an unsigned integer.
 
     Args:
-        f (io.BufferedReader | io.BytesIO): A file-like object or bytes buffer.
+        f (io.BufferedReader | io.BytesIO | BufferReader): A file-like object, bytes buffer or BufferReader.
 
     Returns:
         int: The bytes read as an unsigned integer.
     """
-    return int.from_bytes(f.read(4), "little", signed=False)
+    return UINT.unpack(f.read(4))[0]
 
 
-def readLong(f: io.BufferedReader | io.BytesIO) -> int:
+def readLong(f: io.BufferedReader | io.BytesIO | BufferReader) -> int:
     """Reads 8 bytes and interprets them as a signed integer.
 
     Args:
-        f (io.BufferedReader | io.BytesIO): A file-like object or bytes buffer.
+        f (io.BufferedReader | io.BytesIO | BufferReader): A file-like object, bytes buffer or BufferReader.
 
     Returns:
         int: The bytes read as a signed integer.
     """
-    return int.from_bytes(f.read(8), "little", signed=True)
+    return LONG.unpack(f.read(8))[0]
 
 
-def readULong(f: io.BufferedReader | io.BytesIO) -> int:
+def readULong(f: io.BufferedReader | io.BytesIO | BufferReader) -> int:
     """Reads 8 bytes and interprets them as an unsigned integer.
 
     Args:
-        f (io.BufferedReader | io.BytesIO): A file-like object or bytes buffer.
+        f (io.BufferedReader | io.BytesIO | BufferReader): A file-like object, bytes buffer or BufferReader.
 
     Returns:
         int: The bytes read as an unsigned integer.
     """
-    return int.from_bytes(f.read(8), "little", signed=False)
+    return ULONG.unpack(f.read(8))[0]
 
 
-def readFloat(f: io.BufferedReader | io.BytesIO) -> float:
+def readFloat(f: io.BufferedReader | io.BytesIO | BufferReader) -> float:
     """Reads 4 bytes and interprets them as a float.
 
     Args:
-        f (io.BufferedReader | io.BytesIO): A file-like object or bytes buffer.
+        f (io.BufferedReader | io.BytesIO | BufferReader): A file-like object, bytes buffer or BufferReader.
 
     Returns:
         float: The bytes read as a float.
     """
-    return float(np.frombuffer(f.read(4), dtype=np.float32, count=1)[0])
+    return FLOAT.unpack(f.read(4))[0]
 
 
-def readDouble(f: io.BufferedReader | io.BytesIO) -> float:
+def readDouble(f: io.BufferedReader | io.BytesIO | BufferReader) -> float:
     """Reads 8 bytes and interprets them as a float.
 
     Args:
-        f (io.BufferedReader | io.BytesIO): A file-like object or bytes buffer.
+        f (io.BufferedReader | io.BytesIO | BufferReader): A file-like object, bytes buffer or BufferReader.
 
     Returns:
         float: The bytes read as a float.
     """
-    return float(np.frombuffer(f.read(8), dtype=np.float64, count=1)[0])
+    return DOUBLE.unpack(f.read(8))[0]
 
 
-def readOptimizedNumber(f: io.BufferedReader | io.BytesIO) -> float:
+def readOptimizedNumber(f: io.BufferedReader | io.BytesIO | BufferReader) -> float:
     """Reads variable amount of bytes and interprets them as a int.
     some types use a space optimized number format for how many bytes they are, this is a helper function to make it easier
     check out space optimized on https://wiki.factorio.com/Data_types for more info
     Args:
-        f (io.BufferedReader | io.BytesIO): A file-like object or bytes buffer.
+        f (io.BufferedReader | io.BytesIO | BufferReader): A file-like object, bytes buffer or BufferReader.
 
     Returns:
         int: The bytes read as a int.
     """
     number = readUByte(f)
     if number == 255:
-        f.seek(f.tell() - 1)
+        # 255 means the real number is in the next 4 bytes
         number = readUInt(f)
     return number
 
 
-def readString(f: io.BufferedReader | io.BytesIO, spaceOptimized=False) -> str:
+def readString(
+    f: io.BufferedReader | io.BytesIO | BufferReader,
+    spaceOptimized=False,
+    symbols: SymbolTable = None,
+) -> str:
     """Reads variable amount of bytes and interprets them as a string.
 
     Args:
-        f (io.BufferedReader | io.BytesIO): A file-like object or bytes buffer.
+        f (io.BufferedReader | io.BytesIO | BufferReader): A file-like object, bytes buffer or BufferReader.
+        spaceOptimized (bool, optional): Whether the length is space optimized. Defaults to False.
+        symbols (SymbolTable, optional): If given, strings it has seen before come back as the same str without being decoded, see symbols.py. Defaults to None.
 
     Returns:
         str: The bytes read as a string.
@@ -181,46 +208,93 @@ def readString(f: io.BufferedReader | io.BytesIO, spaceOptimized=False) -> str:
         dataLength = readUInt(f)
     # print(f.read(20))
     # f.seek(f.tell() - 20)
-    return f.read(dataLength).decode("utf-8")
+    if symbols is not None:
+        return symbols.decode(f.read(dataLength))
+    # str() rather than .decode() so a memoryview from a BufferReader works without copying it first
+    return str(f.read(dataLength), "utf-8")
+
+
+def readPrimitiveRun(
+    f: io.BufferedReader | io.BytesIO | BufferReader,
+    count: int,
+    dtype: np.dtype | struct.Struct | str,
+    asList=False,
+) -> np.ndarray | list:
+    """Reads count fixed width values in one go with numpy instead of one call per value.
+
+    Args:
+        f (io.BufferedReader | io.BytesIO | BufferReader): A file-like object, bytes buffer or BufferReader.
+        count (int): How many values to read.
+        dtype (np.dtype | struct.Struct | str): The type of every value, a numpy dtype or one of the structs from codec.py. always read as little endian
+        asList (bool, optional): Return a list of python values instead of an ndarray. Defaults to False.
+
+    Raises:
+        ValueError: If there isn't enough data left for count values.
+
+    Returns:
+        np.ndarray | list: The values read.
+    """
+    dtype = primitiveDtype(dtype)
+    size = count * dtype.itemsize
+    data = f.read(size)
+    if len(data) != size:
+        raise ValueError(
+            f"Expected {size} bytes for {count} values of {dtype}, got {len(data)}"
+        )
+    array = np.frombuffer(data, dtype=dtype)
+    if asList:
+        return array.tolist()
+    # copy so the array doesn't keep the file's buffer (or a BufferReader's mmap) alive
+    return array.copy()
 
 
 def readArray(
-    f: io.BufferedReader | io.BytesIO,
-    objectDecoder: Callable[[io.BufferedReader | io.BytesIO], Any],
+    f: io.BufferedReader | io.BytesIO | BufferReader,
+    objectDecoder: Callable[
+        [io.BufferedReader | io.BytesIO | BufferReader], Any
+    ] = None,
     spaceOptimized=False,
+    dtype: np.dtype | struct.Struct | str = None,
+    asList=False,
     **kwargs,
-) -> list:
+) -> list | np.ndarray:
     """Reads variable amount of bytes and interprets them as an array.
 
     Args:
-        f (io.BufferedReader | io.BytesIO): A file-like object or bytes buffer.
-        objectDecoder (Callable[[io.BufferedReader | io.BytesIO], Any]): A function that reads the object. check the docstring at the top of the file for more info (me rambling)
+        f (io.BufferedReader | io.BytesIO | BufferReader): A file-like object, bytes buffer or BufferReader.
+        objectDecoder (Callable[[io.BufferedReader | io.BytesIO | BufferReader], Any]): A function that reads the object. check the docstring at the top of the file for more info (me rambling)
+        spaceOptimized (bool, optional): Whether the length is space optimized. Defaults to False.
+        dtype (np.dtype | struct.Struct | str, optional): If every object is the same fixed width primitive, its type, the whole array is then read at once and objectDecoder isn't needed. Defaults to None.
+        asList (bool, optional): With dtype, return a list instead of an ndarray. Defaults to False.
 
     Returns:
-        list: The bytes read as an array.
+        list | np.ndarray: The bytes read as an array, an ndarray when dtype is given unless asList is True.
     """
     if spaceOptimized:
         arrayLength = readOptimizedNumber(f)
     else:
         arrayLength = readUInt(f)
+    if dtype is not None:
+        return readPrimitiveRun(f, arrayLength, dtype, asList)
     array = []
     for i in range(arrayLength):
         array.append(objectDecoder(f, **kwargs))
-        array.append(objectDecoder(f, **kwargs))
     return array
 
 
 def readDict(
-    f: io.BufferedReader | io.BytesIO,
-    keyDecoder: Callable[[io.BufferedReader | io.BytesIO], Any],
-    valueDecoder: Callable[[io.BufferedReader | io.BytesIO], Any],
+    f: io.BufferedReader | io.BytesIO | BufferReader,
+    keyDecoder: Callable[[io.BufferedReader | io.BytesIO | BufferReader], Any],
+    valueDecoder: Callable[[io.BufferedReader | io.BytesIO | BufferReader], Any],
     spaceOptimized=False,
+    **kwargs,
 ) -> dict:
     """Reads variable amount of bytes and interprets them as a dictionary.
     Args:
-        f (io.BufferedReader | io.BytesIO): A file-like object or bytes buffer.
-        keyDecoder (Callable[[io.BufferedReader | io.BytesIO], Any]): A function that reads the key. check the docstring at the top of the file for more info (me rambling)
-        valueDecoder (Callable[[io.BufferedReader | io.BytesIO], Any]): A function that reads the value. check the docstring at the top of the file for more info (me rambling)
+        f (io.BufferedReader | io.BytesIO | BufferReader): A file-like object, bytes buffer or BufferReader.
+        keyDecoder (Callable[[io.BufferedReader | io.BytesIO | BufferReader], Any]): A function that reads the key. check the docstring at the top of the file for more info (me rambling)
+        valueDecoder (Callable[[io.BufferedReader | io.BytesIO | BufferReader], Any]): A function that reads the value. check the docstring at the top of the file for more info (me rambling)
+        **kwargs: Arbitrary keyword arguments. These are passed to both the keyDecoder and valueDecoder functions.
 
     Returns:
         list: The bytes read as an array.
@@ -231,27 +305,24 @@ def readDict(
         dictLength = readUInt(f)
     dict = {}
     for i in range(dictLength):
-        key = keyDecoder(f)
-        value = valueDecoder(f)
+        key = keyDecoder(f, **kwargs)
+        value = valueDecoder(f, **kwargs)
         dict[key] = value
     return dict
 
 
 def readVersionString(
-    f: io.BufferedReader | io.BytesIO, returnString=False
+    f: io.BufferedReader | io.BytesIO | BufferReader, returnString=False
 ) -> list[int] | str:
     """Reads 8 amount of bytes and interprets them as a version string.
 
     Args:
-        f (io.BufferedReader | io.BytesIO): A file-like object or bytes buffer.
+        f (io.BufferedReader | io.BytesIO | BufferReader): A file-like object, bytes buffer or BufferReader.
 
     Returns:
         list[int]: list of the major, minor, patch, and dev version
     """
-    major = readUShort(f)
-    minor = readUShort(f)
-    patch = readUShort(f)
-    dev = readUShort(f)
+    major, minor, patch, dev = VERSION.unpack(f.read(8))
     if returnString:
         return f"{major}.{minor}.{patch}.{dev}"
     return [major, minor, patch, dev]
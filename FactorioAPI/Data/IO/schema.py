@@ -0,0 +1,784 @@
+import io
+import struct
+from typing import Any, Callable
+
+import numpy as np
+
+from FactorioAPI.Data.IO.buffer import BufferReader
+from FactorioAPI.Data.IO.codec import (
+    BYTE,
+    DOUBLE,
+    FLOAT,
+    INT,
+    LONG,
+    SHORT,
+    UBYTE,
+    UINT,
+    ULONG,
+    USHORT,
+    primitiveDtype,
+)
+from FactorioAPI.Data.IO.read import hexed
+
+"""
+this is the "registry of types" the top of read.py talks about
+
+instead of handing readArray/readDict a callback per object, a file format gets described once with the
+classes below (Struct, Array, Switch, ...) and compileSchema turns that description into python source for
+one reader and one writer, which then gets exec'd. the generated code is straight line, it works on a buffer
+and an offset with struct.unpack_from, no callbacks and no **kwargs passed down for every element,
+and fixed width fields that are next to each other in a Struct are merged into a single unpack
+
+readers are generated as  def r(buf, pos, ctx) -> (value, pos)
+writers are generated as  def w(out, value, ctx) -> None  (out is a bytearray)
+ctx is a dict that Capture puts things in and Switch(lookup=...) reads from, see achievements.py for why
+
+CompiledSchema.source has the generated code if you want to see what it made
+"""
+
+
+class Schema:
+    """Base of every schema type.
+    fixed width types set fmt (without the "<"), slots is how many values struct gives back for it
+    """
+
+    fmt: str | None = None
+    slots: int = 1
+
+    def _fromSlots(self, c: "_Compiler", slots: list[str]) -> str:
+        return slots[0]
+
+    def _toSlots(self, c: "_Compiler", expr: str) -> list[str]:
+        return [expr]
+
+    def _emitRead(self, c: "_Compiler", code: "_Code", target: str, scope: dict):
+        c.emitFixedRead(code, [(self, target)])
+
+    def _emitWrite(self, c: "_Compiler", code: "_Code", expr: str, scope: dict):
+        c.emitFixedWrite(code, [(self, expr)])
+
+
+class Primitive(Schema):
+    """One of the fixed width numbers from codec.py."""
+
+    def __init__(self, s: struct.Struct) -> None:
+        self.struct = s
+        self.fmt = s.format.lstrip("<")
+
+
+class BoolPrimitive(Primitive):
+    """A bool, only b'\\x01' counts as True just like readBool."""
+
+    def _fromSlots(self, c, slots):
+        return f"({slots[0]} == 1)"
+
+    def _toSlots(self, c, expr):
+        return [f"(1 if {expr} else 0)"]
+
+
+Bool = BoolPrimitive(struct.Struct("<B"))
+Byte = Primitive(BYTE)
+UByte = Primitive(UBYTE)
+Short = Primitive(SHORT)
+UShort = Primitive(USHORT)
+Int = Primitive(INT)
+UInt = Primitive(UINT)
+Long = Primitive(LONG)
+ULong = Primitive(ULONG)
+Float = Primitive(FLOAT)
+Double = Primitive(DOUBLE)
+
+
+class Version(Schema):
+    """The 8 byte version, same as readVersionString."""
+
+    fmt = "4H"
+    slots = 4
+
+    def __init__(self, asString: bool = False) -> None:
+        self.asString = asString
+
+    def _fromSlots(self, c, slots):
+        if self.asString:
+            return 'f"{%s}.{%s}.{%s}.{%s}"' % tuple(slots)
+        return "[" + ", ".join(slots) + "]"
+
+    def _toSlots(self, c, expr):
+        return [f"*_versionParts({expr})"]
+
+
+class Hex(Schema):
+    """size bytes that aren't decoded, kept as a hexed() string."""
+
+    slots = 1
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self.fmt = f"{size}s"
+
+    def _fromSlots(self, c, slots):
+        return f"_hexed({slots[0]})"
+
+    def _toSlots(self, c, expr):
+        return [f"_unhexed({expr})"]
+
+
+class Const(Schema):
+    """Takes up no bytes, always reads as value and writes nothing."""
+
+    def __init__(self, value: Any) -> None:
+        self.value = value
+
+    def _emitRead(self, c, code, target, scope):
+        code.line(f"{target} = {c.literal(self.value)}")
+
+    def _emitWrite(self, c, code, expr, scope):
+        pass
+
+
+class OptimizedNumber(Schema):
+    """The space optimized number, one byte or 255 followed by a uint, see readOptimizedNumber."""
+
+    def _emitRead(self, c, code, target, scope):
+        code.line(f"{target} = buf[pos]")
+        code.line("pos += 1")
+        with code.block(f"if {target} == 255:"):
+            code.line(f"{target} = _UINT.unpack_from(buf, pos)[0]")
+            code.line("pos += 4")
+
+    def _emitWrite(self, c, code, expr, scope):
+        value = c.bind(code, expr)
+        with code.block(f"if {value} < 255:"):
+            code.line(f"out.append({value})")
+        with code.block("else:"):
+            code.line("out.append(255)")
+            code.line(f"out += _UINT.pack({value})")
+
+
+SpaceOptimizedNumber = OptimizedNumber()
+
+
+class String(Schema):
+    """A utf-8 string with its length in front, see readString."""
+
+    def __init__(self, spaceOptimized: bool = False) -> None:
+        self.length = SpaceOptimizedNumber if spaceOptimized else UInt
+
+    def _emitRead(self, c, code, target, scope):
+        length = c.var("n")
+        self.length._emitRead(c, code, length, scope)
+        with code.block(f"if pos + {length} > len(buf):"):
+            code.line(
+                f'raise ValueError(f"String of {{{length}}} bytes at {{pos}} runs past the end of the data")'
+            )
+        code.line(f'{target} = str(buf[pos : pos + {length}], "utf-8")')
+        code.line(f"pos += {length}")
+
+    def _emitWrite(self, c, code, expr, scope):
+        encoded = c.var("e")
+        code.line(f"{encoded} = {expr}.encode()")
+        self.length._emitWrite(c, code, f"len({encoded})", scope)
+        code.line(f"out += {encoded}")
+
+
+class Array(Schema):
+    """A length followed by that many items, see readArray.
+    arrays of a single fixed width number are done with numpy in one go
+    """
+
+    def __init__(self, item: Schema, length: Schema = UInt) -> None:
+        self.item = item
+        self.length = length
+
+    def _vectorized(self) -> bool:
+        return type(self.item) is Primitive
+
+    def _emitRead(self, c, code, target, scope):
+        count = c.var("n")
+        self.length._emitRead(c, code, count, scope)
+        if self._vectorized():
+            dtype = c.constant(primitiveDtype(self.item.struct))
+            size = self.item.struct.size
+            code.line(
+                f"{target} = _np.frombuffer(buf, {dtype}, {count}, pos).tolist() if {count} else []"
+            )
+            code.line(f"pos += {count} * {size}")
+            return
+        code.line(f"{target} = []")
+        append = c.var("append")
+        code.line(f"{append} = {target}.append")
+        item = c.var("i")
+        with code.block(f"for _ in range({count}):"):
+            self.item._emitRead(c, code, item, {})
+            code.line(f"{append}({item})")
+
+    def _emitWrite(self, c, code, expr, scope):
+        value = c.bind(code, expr)
+        self.length._emitWrite(c, code, f"len({value})", scope)
+        if self._vectorized():
+            dtype = c.constant(primitiveDtype(self.item.struct))
+            code.line(f"out += _np.asarray({value}, {dtype}).tobytes()")
+            return
+        item = c.var("i")
+        with code.block(f"for {item} in {value}:"):
+            self.item._emitWrite(c, code, item, {})
+
+
+class Dict(Schema):
+    """A length followed by that many key value pairs, see readDict."""
+
+    def __init__(self, key: Schema, value: Schema, length: Schema = UInt) -> None:
+        self.key = key
+        self.value = value
+        self.length = length
+
+    def _emitRead(self, c, code, target, scope):
+        count = c.var("n")
+        self.length._emitRead(c, code, count, scope)
+        code.line(f"{target} = {{}}")
+        key = c.var("k")
+        value = c.var("v")
+        with code.block(f"for _ in range({count}):"):
+            self.key._emitRead(c, code, key, {})
+            self.value._emitRead(c, code, value, {})
+            code.line(f"{target}[{key}] = {value}")
+
+    def _emitWrite(self, c, code, expr, scope):
+        data = c.bind(code, expr)
+        self.length._emitWrite(c, code, f"len({data})", scope)
+        key = c.var("k")
+        value = c.var("v")
+        with code.block(f"for {key}, {value} in {data}.items():"):
+            self.key._emitWrite(c, code, key, {})
+            self.value._emitWrite(c, code, value, {})
+
+
+class Struct(Schema):
+    """Fields one after another, read into a dict.
+
+    every field is (name, schema) or (name, schema, encode)
+    - names starting with _ are read but left out of the dict, a Switch can still use them
+    - encode is called with the whole value being written to get that field's value,
+      needed for _ fields since they aren't in the dict
+    - a field called "..." has its dict merged into this one instead of being nested
+    - result=name makes the struct read as just that field's value instead of a dict
+    """
+
+    SPREAD = "..."
+
+    def __init__(self, *fields: tuple, result: str = None) -> None:
+        self.fields = [
+            (field[0], field[1], field[2] if len(field) > 2 else None)
+            for field in fields
+        ]
+        self.result = result
+
+    def _visible(self) -> list[str]:
+        return [
+            name
+            for name, schema, encode in self.fields
+            if not name.startswith("_") and name != self.SPREAD
+        ]
+
+    def _buildRead(self, c, target, names: dict) -> str:
+        if self.result is not None:
+            return names[self.result]
+        items = []
+        for name in self._visible() + [self.SPREAD]:
+            if name == self.SPREAD:
+                if name in names:
+                    items.append(f"**{names[name]}")
+            else:
+                items.append(f"{name!r}: {names[name]}")
+        return "{" + ", ".join(items) + "}"
+
+    def _fieldExpr(self, c, name, encode, value) -> str:
+        if encode is not None:
+            return f"{c.constant(encode)}({value})"
+        if name == self.result:
+            return value
+        if name == self.SPREAD:
+            return f"_without({value}, {c.constant(frozenset(self._visible()))})"
+        return f"{value}[{name!r}]"
+
+    def _emitRead(self, c, code, target, scope):
+        names = {}
+        run = []
+        for name, schema, encode in self.fields:
+            var = c.var("f")
+            names[name] = var
+            if schema.fmt is not None:
+                run.append((schema, var))
+                continue
+            c.emitFixedRead(code, run)
+            run = []
+            schema._emitRead(c, code, var, names)
+        c.emitFixedRead(code, run)
+        code.line(f"{target} = {self._buildRead(c, target, names)}")
+
+    def _emitWrite(self, c, code, expr, scope):
+        value = c.bind(code, expr)
+        names = {}
+        # work out every field first, a Switch may need a field that comes after it in the dict
+        for name, schema, encode in self.fields:
+            var = c.var("f")
+            names[name] = var
+            code.line(f"{var} = {self._fieldExpr(c, name, encode, value)}")
+        run = []
+        for name, schema, encode in self.fields:
+            if schema.fmt is not None:
+                run.append((schema, names[name]))
+                continue
+            c.emitFixedWrite(code, run)
+            run = []
+            schema._emitWrite(c, code, names[name], names)
+        c.emitFixedWrite(code, run)
+
+
+class Tuple(Struct):
+    """Like Struct but reads as a list, written from anything indexable."""
+
+    def __init__(self, *schemas: Schema) -> None:
+        super().__init__(*[(f"i{i}", schema) for i, schema in enumerate(schemas)])
+
+    def _buildRead(self, c, target, names):
+        return "[" + ", ".join(names[name] for name, _, _ in self.fields) + "]"
+
+    def _fieldExpr(self, c, name, encode, value):
+        return f"{value}[{name[1:]}]"
+
+
+class Switch(Schema):
+    """Picks a schema by the value of an earlier field in the same Struct.
+
+    lookup is the name of something in ctx (put there by a Capture) that the field's value is looked
+    up in first, achievements use it to go from an index to the achievement type
+    """
+
+    def __init__(
+        self, on: str, cases: dict, lookup: str = None, default: Schema = None
+    ) -> None:
+        self.on = on
+        self.cases = cases
+        self.lookup = lookup
+        self.default = default
+
+    def _key(self, c, code, scope) -> str:
+        key = scope[self.on]
+        if self.lookup is None:
+            return key
+        table = c.var("table")
+        found = c.var("key")
+        code.line(f"{table} = ctx[{self.lookup!r}]")
+        with code.block(f"if {key} not in {table}:"):
+            code.line(
+                f'raise ValueError(f"{{{key}!r}} isn\'t in {self.lookup}, Malformed File?")'
+            )
+        code.line(f"{found} = {table}[{key}]")
+        return found
+
+    def _unknown(self, code, key):
+        code.line(f'raise ValueError(f"Unknown {self.on}: {{{key}!r}}")')
+
+    def _emit(self, c, code, scope, emitCase):
+        key = self._key(c, code, scope)
+        if set(self.cases) == {True, False} and all(
+            type(value) is bool for value in self.cases
+        ):
+            # a bool can't be anything else, so no need for the unknown case
+            with code.block(f"if {key}:"):
+                emitCase(self.cases[True])
+            with code.block("else:"):
+                emitCase(self.cases[False])
+            return
+        keyword = "if"
+        for value, schema in self.cases.items():
+            with code.block(f"{keyword} {key} == {c.literal(value)}:"):
+                emitCase(schema)
+            keyword = "elif"
+        with code.block("else:"):
+            if self.default is not None:
+                emitCase(self.default)
+            else:
+                self._unknown(code, key)
+
+    def _emitDispatch(self, c, code, scope, target):
+        # too many cases for an if chain, every case gets its own function and a dict picks it
+        key = self._key(c, code, scope)
+        table = c.dispatchTable(
+            {value: c.caseReader(schema) for value, schema in self.cases.items()}
+        )
+        function = c.var("case")
+        code.line(f"{function} = {table}.get({key})")
+        with code.block(f"if {function} is None:"):
+            if self.default is not None:
+                code.line(f"{function} = {c.caseReader(self.default).name}")
+            else:
+                self._unknown(code, key)
+        code.line(f"{target}, pos = {function}(buf, pos, ctx)")
+
+    def _emitRead(self, c, code, target, scope):
+        if len(self.cases) > 8:
+            self._emitDispatch(c, code, scope, target)
+            return
+        self._emit(c, code, scope, lambda s: s._emitRead(c, code, target, {}))
+
+    def _emitWrite(self, c, code, expr, scope):
+        value = c.bind(code, expr)
+        self._emit(c, code, scope, lambda s: s._emitWrite(c, code, value, {}))
+
+
+class Recursive(Schema):
+    """A schema that contains itself, make it first then define() it.
+    it gets compiled into its own function that calls itself
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.schema = None
+
+    def define(self, schema: Schema) -> "Recursive":
+        self.schema = schema
+        return self
+
+    def _emitRead(self, c, code, target, scope):
+        reader, writer = c.recursive(self)
+        code.line(f"{target}, pos = {reader}(buf, pos, ctx)")
+
+    def _emitWrite(self, c, code, expr, scope):
+        reader, writer = c.recursive(self)
+        code.line(f"{writer}(out, {expr}, ctx)")
+
+
+class Capture(Schema):
+    """Reads schema as normal, and also puts function(value) into ctx[name] for a later Switch(lookup=name)."""
+
+    def __init__(self, name: str, schema: Schema, function: Callable) -> None:
+        self.name = name
+        self.schema = schema
+        self.function = function
+
+    def _emitRead(self, c, code, target, scope):
+        self.schema._emitRead(c, code, target, scope)
+        code.line(f"ctx[{self.name!r}] = {c.constant(self.function)}({target})")
+
+    def _emitWrite(self, c, code, expr, scope):
+        value = c.bind(code, expr)
+        code.line(f"ctx[{self.name!r}] = {c.constant(self.function)}({value})")
+        self.schema._emitWrite(c, code, value, scope)
+
+
+class Rest(Schema):
+    """Every byte left, read as a list of one fixed width number, like getTracked."""
+
+    def __init__(self, item: Primitive) -> None:
+        self.item = item
+
+    def _emitRead(self, c, code, target, scope):
+        dtype = c.constant(primitiveDtype(self.item.struct))
+        size = self.item.struct.size
+        count = c.var("n")
+        extra = c.var("r")
+        code.line(f"{count}, {extra} = divmod(len(buf) - pos, {size})")
+        with code.block(f"if {extra}:"):
+            code.line(
+                f'raise ValueError(f"{{len(buf) - pos}} bytes left isn\'t a multiple of {size}, Malformed File?")'
+            )
+        code.line(
+            f"{target} = _np.frombuffer(buf, {dtype}, {count}, pos).tolist() if {count} else []"
+        )
+        code.line("pos = len(buf)")
+
+    def _emitWrite(self, c, code, expr, scope):
+        dtype = c.constant(primitiveDtype(self.item.struct))
+        code.line(f"out += _np.asarray({expr}, {dtype}).tobytes()")
+
+
+def fixedSize(schema: Schema) -> int | None:
+    """
+    Args:
+        schema (Schema): The schema.
+
+    Returns:
+        int | None: How many bytes it always takes up, None if that depends on what is in it.
+    """
+    if schema.fmt is not None:
+        return struct.calcsize("<" + schema.fmt)
+    if isinstance(schema, Const):
+        return 0
+    if isinstance(schema, Struct):
+        sizes = [fixedSize(field) for name, field, encode in schema.fields]
+        return None if None in sizes else sum(sizes)
+    return None
+
+
+def _versionParts(value: list | str) -> list[int]:
+    if isinstance(value, str):
+        value = value.split(".")
+    return [int(v) for v in value]
+
+
+def _unhexed(value: str) -> bytes:
+    return bytes.fromhex(value[4:] if value.startswith("HEX-") else value)
+
+
+def _without(data: dict, names: frozenset) -> dict:
+    return {k: v for k, v in data.items() if k not in names}
+
+
+class _Code:
+    def __init__(self) -> None:
+        self.lines = []
+        self.depth = 0
+        self.starts = []
+
+    def line(self, text: str) -> None:
+        self.lines.append("    " * self.depth + text)
+
+    def block(self, header: str) -> "_Code":
+        self.line(header)
+        return self
+
+    def __enter__(self) -> None:
+        self.depth += 1
+        self.starts.append(len(self.lines))
+
+    def __exit__(self, *args) -> None:
+        # things like Const write nothing, a block can't be empty
+        if self.starts.pop() == len(self.lines):
+            self.line("pass")
+        self.depth -= 1
+
+    def source(self) -> str:
+        return "\n".join(self.lines)
+
+
+class _Compiler:
+    def __init__(self) -> None:
+        self.namespace = {
+            "_np": np,
+            "_UINT": UINT,
+            "_hexed": hexed,
+            "_unhexed": _unhexed,
+            "_versionParts": _versionParts,
+            "_without": _without,
+        }
+        self.functions = []
+        self.counter = 0
+        self.structs = {}
+        self.recursives = {}
+        self.caseReaders = {}
+        self.lateTables = []
+
+    def var(self, prefix: str) -> str:
+        self.counter += 1
+        return f"{prefix}{self.counter}"
+
+    def constant(self, value: Any) -> str:
+        name = self.var("_c")
+        self.namespace[name] = value
+        return name
+
+    def literal(self, value: Any) -> str:
+        if value is None or type(value) in (bool, int, float, str):
+            return repr(value)
+        return self.constant(value)
+
+    def bind(self, code: _Code, expr: str) -> str:
+        """Makes sure an expression is only worked out once."""
+        if expr.isidentifier():
+            return expr
+        var = self.var("t")
+        code.line(f"{var} = {expr}")
+        return var
+
+    def struct(self, fmt: str) -> str:
+        if fmt not in self.structs:
+            self.structs[fmt] = self.constant(struct.Struct("<" + fmt))
+        return self.structs[fmt]
+
+    def emitFixedRead(self, code: _Code, run: list) -> None:
+        """One unpack for a run of fixed width schemas that are next to each other."""
+        if not run:
+            return
+        fmt = "".join(schema.fmt for schema, target in run)
+        size = struct.calcsize("<" + fmt)
+        if len(run) == 1 and run[0][0].slots == 1:
+            schema, target = run[0]
+            # a single byte is quicker to index than to unpack
+            if fmt == "B":
+                value = "buf[pos]"
+            else:
+                value = f"{self.struct(fmt)}.unpack_from(buf, pos)[0]"
+            code.line(f"{target} = {schema._fromSlots(self, [value])}")
+            code.line(f"pos += {size}")
+            return
+        s = self.struct(fmt)
+        values = self.var("u")
+        code.line(f"{values} = {s}.unpack_from(buf, pos)")
+        code.line(f"pos += {size}")
+        slot = 0
+        for schema, target in run:
+            slots = [f"{values}[{slot + i}]" for i in range(schema.slots)]
+            code.line(f"{target} = {schema._fromSlots(self, slots)}")
+            slot += schema.slots
+
+    def emitFixedWrite(self, code: _Code, run: list) -> None:
+        """One pack for a run of fixed width schemas that are next to each other."""
+        if not run:
+            return
+        fmt = "".join(schema.fmt for schema, expr in run)
+        s = self.struct(fmt)
+        values = []
+        for schema, expr in run:
+            values.extend(schema._toSlots(self, expr))
+        code.line(f"out += {s}.pack({', '.join(values)})")
+
+    def function(self, name: str, args: str, emit: Callable) -> None:
+        code = _Code()
+        with code.block(f"def {name}({args}):"):
+            emit(code)
+        self.functions.append(code.source())
+
+    def reader(self, name: str, schema: Schema) -> None:
+        def emit(code):
+            schema._emitRead(self, code, "value", {})
+            code.line("return value, pos")
+
+        self.function(name, "buf, pos, ctx", emit)
+
+    def writer(self, name: str, schema: Schema) -> None:
+        def emit(code):
+            schema._emitWrite(self, code, "value", {})
+
+        self.function(name, "out, value, ctx", emit)
+
+    def recursive(self, schema: Recursive) -> tuple[str, str]:
+        if schema not in self.recursives:
+            if schema.schema is None:
+                raise ValueError(f"Recursive schema {schema.name} was never defined")
+            names = (
+                self.var(f"read_{schema.name}_"),
+                self.var(f"write_{schema.name}_"),
+            )
+            self.recursives[schema] = names
+            self.reader(names[0], schema.schema)
+            self.writer(names[1], schema.schema)
+        return self.recursives[schema]
+
+    def dispatchTable(self, table: dict) -> str:
+        self.lateTables.append(table)
+        return self.constant(table)
+
+    def caseReader(self, schema: Schema) -> Callable:
+        # the dict for a dispatched Switch needs the real functions, so these are compiled on their own
+        if schema not in self.caseReaders:
+            name = self.var("read_case_")
+            self.reader(name, schema)
+            self.caseReaders[schema] = _LateFunction(self.namespace, name)
+        return self.caseReaders[schema]
+
+    def build(self, schema: Schema) -> tuple[Callable, Callable, str]:
+        self.reader("read_root", schema)
+        self.writer("write_root", schema)
+        source = "\n\n\n".join(self.functions) + "\n"
+        exec(compile(source, "<FactorioAPI schema>", "exec"), self.namespace)
+        for table in self.lateTables:
+            for key, function in table.items():
+                table[key] = function.resolve()
+        return self.namespace["read_root"], self.namespace["write_root"], source
+
+
+class _LateFunction:
+    """A generated function that doesn't exist yet when the code referencing it is being made."""
+
+    def __init__(self, namespace: dict, name: str) -> None:
+        self.namespace = namespace
+        self.name = name
+
+    def resolve(self) -> Callable:
+        return self.namespace[self.name]
+
+
+class CompiledSchema:
+    """A schema turned into a generated reader and writer."""
+
+    def __init__(self, schema: Schema) -> None:
+        self.schema = schema
+        self.reader, self.writer, self.source = _Compiler().build(schema)
+
+    def recompile(self) -> None:
+        """Compiles the schema again, for when something in it changed (like a Switch's cases).
+        it stays the same object, so everything holding on to it gets the new reader and writer
+        """
+        self.reader, self.writer, self.source = _Compiler().build(self.schema)
+
+    def decode(
+        self, data: bytes | bytearray | memoryview, pos: int = 0, ctx: dict = None
+    ) -> tuple[Any, int]:
+        """Decodes a value from a buffer.
+
+        Args:
+            data (bytes | bytearray | memoryview): The buffer to read from.
+            pos (int, optional): Where in the buffer to start. Defaults to 0.
+            ctx (dict, optional): Context for Switch lookups, normally left empty. Defaults to None.
+
+        Returns:
+            tuple[Any, int]: The value and the offset right after it.
+        """
+        return self.reader(data, pos, {} if ctx is None else ctx)
+
+    def read(
+        self, f: io.BufferedReader | io.BytesIO | BufferReader | bytes | bytearray
+    ) -> Any:
+        """Reads a value, from a file the rest of it is read in one go first.
+
+        Args:
+            f (io.BufferedReader | io.BytesIO | BufferReader | bytes | bytearray): Where to read from.
+
+        Returns:
+            Any: The value read.
+        """
+        if isinstance(f, BufferReader):
+            value, f.pos = self.reader(f.view, f.pos, {})
+            return value
+        if isinstance(f, (bytes, bytearray, memoryview)):
+            return self.reader(f, 0, {})[0]
+        start = f.tell()
+        data = f.read()
+        value, pos = self.reader(data, 0, {})
+        f.seek(start + pos)
+        return value
+
+    def encode(self, value: Any) -> bytearray:
+        """
+        Args:
+            value (Any): The value to encode.
+
+        Returns:
+            bytearray: The encoded value.
+        """
+        out = bytearray()
+        self.writer(out, value, {})
+        return out
+
+    def write(self, f: io.BufferedWriter | io.BytesIO, value: Any) -> None:
+        """Encodes a value and writes it in one write.
+
+        Args:
+            f (io.BufferedWriter | io.BytesIO): A file-like object or bytes buffer.
+            value (Any): The value to write.
+        """
+        f.write(self.encode(value))
+
+
+def compileSchema(schema: Schema) -> CompiledSchema:
+    """Compiles a schema into a reader and writer, see the top of this file.
+
+    Args:
+        schema (Schema): The schema to compile.
+
+    Returns:
+        CompiledSchema: The compiled reader and writer.
+    """
+    return CompiledSchema(schema)
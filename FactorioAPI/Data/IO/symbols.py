@@ -0,0 +1,81 @@
+import threading
+
+"""
+one shared str for every copy of the same string across everything that gets read
+
+mod settings files are mostly the same names over and over ("startup", "value", every setting name),
+give the same SymbolTable to every read and each of those is one str in memory no matter how many files are loaded.
+lookups are by the raw bytes, so a string that has been seen before is never decoded again
+
+    symbols = SymbolTable()
+    trees = [readModSettings(f, symbols=symbols) for f in files]
+"""
+
+# long strings are rarely repeated, so they aren't kept
+DEFAULT_MAX_LENGTH = 256
+
+
+class SymbolTable:
+    """A pool of strings looked up by their utf-8 bytes, see the top of this file."""
+
+    __slots__ = ("maxLength", "_symbols", "_lock")
+
+    def __init__(self, maxLength: int = DEFAULT_MAX_LENGTH) -> None:
+        """
+        Args:
+            maxLength (int, optional): Strings longer than this many bytes are decoded but not kept. Defaults to DEFAULT_MAX_LENGTH.
+        """
+        self.maxLength = maxLength
+        # utf-8 bytes > str
+        self._symbols = {}
+        self._lock = threading.Lock()
+
+    def decode(self, raw: bytes | bytearray | memoryview) -> str:
+        """Decodes utf-8 bytes, giving back the same str as last time if these bytes have been seen.
+
+        Args:
+            raw (bytes | bytearray | memoryview): The bytes of the string.
+
+        Returns:
+            str: The string.
+        """
+        if len(raw) > self.maxLength:
+            return str(raw, "utf-8")
+        key = bytes(raw)
+        try:
+            return self._symbols[key]
+        except KeyError:
+            pass
+        with self._lock:
+            return self._symbols.setdefault(key, str(key, "utf-8"))
+
+    def intern(self, value: str) -> str:
+        """Gets the pooled copy of a string that is already decoded, adding it if it isn't there.
+
+        Args:
+            value (str): The string.
+
+        Returns:
+            str: The same string, but the one in the pool.
+        """
+        key = value.encode("utf-8")
+        if len(key) > self.maxLength:
+            return value
+        try:
+            return self._symbols[key]
+        except KeyError:
+            pass
+        with self._lock:
+            return self._symbols.setdefault(key, value)
+
+    def __contains__(self, value: str | bytes) -> bool:
+        if isinstance(value, str):
+            value = value.encode("utf-8")
+        return value in self._symbols
+
+    def __len__(self) -> int:
+        return len(self._symbols)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._symbols.clear()
@@ -1,8 +1,24 @@
 import io
+import struct
 from typing import Callable
 
 import numpy as np
 
+from FactorioAPI.Data.IO.codec import (
+    BYTE,
+    DOUBLE,
+    FLOAT,
+    INT,
+    LONG,
+    SHORT,
+    UBYTE,
+    UINT,
+    ULONG,
+    USHORT,
+    VERSION,
+    primitiveDtype,
+)
+
 
 def writeBool(f: io.BufferedWriter | io.BytesIO, value: bool) -> None:
     """Writes a Boolean value to a file-like object or bytes buffer as 1 byte.
@@ -21,7 +37,7 @@ def writeByte(f: io.BufferedWriter | io.BytesIO, value: int) -> None:
         f (io.BufferedWriter | io.BytesIO): A file-like object or bytes buffer.
         value (int): The value to write.
     """
-    f.write(value.to_bytes(1, "little", signed=True))
+    f.write(BYTE.pack(value))
 
 
 def writeUByte(f: io.BufferedWriter | io.BytesIO, value: int) -> None:
@@ -32,7 +48,7 @@ def writeUByte(f: io.BufferedWriter | io.BytesIO, value: int) -> None:
         value (int): The value to write.
     """
 
-    f.write(value.to_bytes(1, "little", signed=False))
+    f.write(UBYTE.pack(value))
 
 
 def writeShort(f: io.BufferedWriter | io.BytesIO, value: int) -> None:
@@ -42,7 +58,7 @@ def writeShort(f: io.BufferedWriter | io.BytesIO, value: int) -> None:
         f (io.BufferedWriter | io.BytesIO): A file-like object or bytes buffer.
         value (int): The value to write.
     """
-    f.write(value.to_bytes(2, "little", signed=True))
+    f.write(SHORT.pack(value))
 
 
 def writeUShort(f: io.BufferedWriter | io.BytesIO, value: int) -> None:
@@ -52,7 +68,7 @@ def writeUShort(f: io.BufferedWriter | io.BytesIO, value: int) -> None:
         f (io.BufferedWriter | io.BytesIO): A file-like object or bytes buffer.
         value (int): The value to write.
     """
-    f.write(value.to_bytes(2, "little", signed=False))
+    f.write(USHORT.pack(value))
 
 
 def writeInt(f: io.BufferedWriter | io.BytesIO, value: int) -> None:
@@ -62,7 +78,7 @@ def writeInt(f: io.BufferedWriter | io.BytesIO, value: int) -> None:
         f (io.BufferedWriter | io.BytesIO): A file-like object or bytes buffer.
         value (int): The value to write.
     """
-    f.write(value.to_bytes(4, "little", signed=True))
+    f.write(INT.pack(value))
 
 
 def writeUInt(f: io.BufferedWriter | io.BytesIO, value: int) -> None:
@@ -72,7 +88,7 @@ def writeUInt(f: io.BufferedWriter | io.BytesIO, value: int) -> None:
         f (io.BufferedWriter | io.BytesIO): A file-like object or bytes buffer.
         value (int): The value to write.
     """
-    f.write(value.to_bytes(4, "little", signed=False))
+    f.write(UINT.pack(value))
 
 
 def writeLong(f: io.BufferedWriter | io.BytesIO, value: int) -> None:
@@ -82,7 +98,7 @@ def writeLong(f: io.BufferedWriter | io.BytesIO, value: int) -> None:
         f (io.BufferedWriter | io.BytesIO): A file-like object or bytes buffer.
         value (int): The value to write.
     """
-    f.write(value.to_bytes(8, "little", signed=True))
+    f.write(LONG.pack(value))
 
 
 def writeULong(f: io.BufferedWriter | io.BytesIO, value: int) -> None:
@@ -92,7 +108,7 @@ def writeULong(f: io.BufferedWriter | io.BytesIO, value: int) -> None:
         f (io.BufferedWriter | io.BytesIO): A file-like object or bytes buffer.
         value (int): The value to write.
     """
-    f.write(value.to_bytes(8, "little", signed=False))
+    f.write(ULONG.pack(value))
 
 
 def writeFloat(f: io.BufferedWriter | io.BytesIO, value: float) -> None:
@@ -102,7 +118,7 @@ def writeFloat(f: io.BufferedWriter | io.BytesIO, value: float) -> None:
         f (io.BufferedWriter | io.BytesIO): A file-like object or bytes buffer.
         value (float): The value to write.
     """
-    f.write(np.float32(value).tobytes())
+    f.write(FLOAT.pack(value))
 
 
 def writeDouble(f: io.BufferedWriter | io.BytesIO, value: float) -> None:
@@ -112,7 +128,7 @@ def writeDouble(f: io.BufferedWriter | io.BytesIO, value: float) -> None:
         f (io.BufferedWriter | io.BytesIO): A file-like object or bytes buffer.
         value (float): The value to write.
     """
-    f.write(np.float64(value).tobytes())
+    f.write(DOUBLE.pack(value))
 
 
 def writeSpaceOptimizedNumber(
@@ -125,9 +141,13 @@ def writeSpaceOptimizedNumber(
         value (int): The value to write.
         forceNo (bool, optional): Whether to force no space optimization. Defaults to False.
     """
-    if value < 255 and not forceNo:
+    if forceNo:
+        writeUInt(f, value)
+    elif value < 255:
         writeUByte(f, value)
     else:
+        # 255 marks that the real number follows as 4 bytes
+        writeUByte(f, 255)
         writeUInt(f, value)
 
 
@@ -141,25 +161,78 @@ def writeString(
         value (str): The value to write.
         spaceOptimize (bool, optional): Whether to use space optimization. Defaults to False.
     """
-    writeSpaceOptimizedNumber(f, len(value), not spaceOptimize)
-    f.write(value.encode())
+    # the length is in bytes not characters
+    encoded = value.encode()
+    writeSpaceOptimizedNumber(f, len(encoded), not spaceOptimize)
+    f.write(encoded)
+
+
+def sizeOfSpaceOptimizedNumber(value: int, forceNo=False) -> int:
+    """Gets how many bytes writeSpaceOptimizedNumber will write for a value.
+
+    Args:
+        value (int): The value that would be written.
+        forceNo (bool, optional): Whether to force no space optimization. Defaults to False.
+
+    Returns:
+        int: The amount of bytes.
+    """
+    if forceNo:
+        return 4
+    return 1 if value < 255 else 5
+
+
+def sizeOfString(value: str, spaceOptimize: bool = False) -> int:
+    """Gets how many bytes writeString will write for a string.
+
+    Args:
+        value (str): The string that would be written.
+        spaceOptimize (bool, optional): Whether to use space optimization. Defaults to False.
+
+    Returns:
+        int: The amount of bytes.
+    """
+    # skip encoding when we can, ascii is always 1 byte per character
+    length = len(value) if value.isascii() else len(value.encode())
+    return sizeOfSpaceOptimizedNumber(length, not spaceOptimize) + length
+
+
+def writePrimitiveRun(
+    f: io.BufferedWriter | io.BytesIO,
+    value: list | np.ndarray,
+    dtype: np.dtype | struct.Struct | str,
+) -> None:
+    """Writes a run of fixed width values in one go with numpy instead of one call per value.
+    no length is written, see writeArray for that
+
+    Args:
+        f (io.BufferedWriter | io.BytesIO): A file-like object or bytes buffer.
+        value (list | np.ndarray): The values to write.
+        dtype (np.dtype | struct.Struct | str): The type of every value, a numpy dtype or one of the structs from codec.py. always written as little endian
+    """
+    f.write(np.asarray(value, dtype=primitiveDtype(dtype)).tobytes())
 
 
 def writeArray(
     f: io.BufferedWriter | io.BytesIO,
-    value: list,
-    valueWriter: Callable[[io.BufferedWriter | io.BytesIO, object], None],
+    value: list | np.ndarray,
+    valueWriter: Callable[[io.BufferedWriter | io.BytesIO, object], None] = None,
     spaceOptimize: bool = False,
+    dtype: np.dtype | struct.Struct | str = None,
 ) -> None:
     """Writes an array value to a file-like object or bytes buffer.
 
     Args:
         f (io.BufferedWriter | io.BytesIO): A file-like object or bytes buffer.
-        value (list): The value to write.
+        value (list | np.ndarray): The value to write.
         valueWriter (Callable[[io.BufferedWriter | io.BytesIO, object], None]): A function that writes a value to a file-like object or bytes buffer.
         spaceOptimize (bool, optional): Whether to use space optimization. Defaults to False.
+        dtype (np.dtype | struct.Struct | str, optional): If every value is the same fixed width primitive, its type, the whole array is then written at once and valueWriter isn't needed. Defaults to None.
     """
     writeSpaceOptimizedNumber(f, len(value), not spaceOptimize)
+    if dtype is not None:
+        writePrimitiveRun(f, value, dtype)
+        return
     for v in value:
         valueWriter(f, v)
 
@@ -186,6 +259,16 @@ def writeDict(
         valueWriter(f, v)
 
 
+def writeHexed(f: io.BufferedWriter | io.BytesIO, value: str) -> None:
+    """Writes the bytes of a string from hexed (see read.py) back out.
+
+    Args:
+        f (io.BufferedWriter | io.BytesIO): A file-like object or bytes buffer.
+        value (str): The hexed string, like "HEX-00ff".
+    """
+    f.write(bytes.fromhex(value.removeprefix("HEX-")))
+
+
 def writeVersionString(f: io.BufferedWriter | io.BytesIO, value: list | str) -> None:
     """Writes a version string value to a file-like object or bytes buffer.
 
@@ -195,8 +278,7 @@ def writeVersionString(f: io.BufferedWriter | io.BytesIO, value: list | str) ->
     """
     if isinstance(value, str):
         value = value.split(".")
-    for v in value:
-        writeUShort(f, v)
+    f.write(VERSION.pack(*map(int, value)))
 
 
 # import io
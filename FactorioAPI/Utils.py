@@ -6,6 +6,7 @@ APPLINK = "https://github.com/catlord-dev/factorioapi"
 
 APPNAME = "FactorioAPI"
 
+
 def getDefaultUserAgent(appName: str = APPNAME, appVersion: str = VERSION) -> str:
     return f"{appName}/{appVersion} (python-requests/{requests.__version__})"
 
@@ -22,11 +23,96 @@ def getDefaultHeaders(
 
 
 import hashlib
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable
+
+# sha1 is what the mod portal gives for mod zips
+HASH_ALGORITHMS = ("sha1", "sha256", "sha512")
+
+
+class HashMemo:
+    """Remembers file hashes by (size, mtime), so a file that hasn't changed isn't hashed again.
+    safe to share between threads
+    """
+
+    def __init__(self) -> None:
+        # (path, algorithm) > (size, mtime, hash)
+        self._hashes = {}
+        self._lock = threading.Lock()
+
+    def get(self, path: str, algorithm: str, stat: os.stat_result) -> str | None:
+        with self._lock:
+            known = self._hashes.get((path, algorithm))
+        if (
+            known is not None
+            and known[0] == stat.st_size
+            and known[1] == stat.st_mtime_ns
+        ):
+            return known[2]
+        return None
+
+    def put(
+        self, path: str, algorithm: str, stat: os.stat_result, fileHash: str
+    ) -> None:
+        with self._lock:
+            self._hashes[(path, algorithm)] = (stat.st_size, stat.st_mtime_ns, fileHash)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._hashes.clear()
+
+
+def getFileHash(path: str, algorithm: str = "sha512", memo: HashMemo = None) -> str:
+    """Hashes a file without loading all of it, it is read a chunk at a time.
+
+    Args:
+        path (str): The file.
+        algorithm (str, optional): Any hashlib algorithm, usually one of HASH_ALGORITHMS. Defaults to "sha512".
+        memo (HashMemo, optional): If given, reuse the hash from last time when the size and mtime are the same. Defaults to None.
+
+    Returns:
+        str: The hex digest.
+    """
+    if memo is not None:
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        fileHash = memo.get(path, algorithm, stat)
+        if fileHash is not None:
+            return fileHash
+    with open(path, "rb") as f:
+        # reads into one reused buffer, with the GIL released while hashing
+        fileHash = hashlib.file_digest(f, algorithm).hexdigest()
+    if memo is not None:
+        memo.put(path, algorithm, stat, fileHash)
+    return fileHash
+
+
+def getFileHashes(
+    paths: Iterable[str],
+    algorithm: str = "sha512",
+    workers: int = None,
+    memo: HashMemo = None,
+) -> dict:
+    """Hashes lots of files at once on a pool of threads, see getFileHash.
+    hashlib lets go of the GIL for big chunks, so this goes faster with more cores
 
+    Args:
+        paths (Iterable[str]): The files.
+        algorithm (str, optional): Any hashlib algorithm, usually one of HASH_ALGORITHMS. Defaults to "sha512".
+        workers (int, optional): How many threads. Defaults to one per CPU.
+        memo (HashMemo, optional): See getFileHash. Defaults to None.
 
-def getFileHash(path: str) -> str:
-    return hashlib.sha512(open(path, "rb").read()).hexdigest()
+    Returns:
+        dict: path > hex digest, in the same order as paths.
+    """
+    paths = list(paths)
+    workers = workers or os.cpu_count() or 1
+    with ThreadPoolExecutor(min(workers, max(len(paths), 1))) as executor:
+        hashes = executor.map(lambda path: getFileHash(path, algorithm, memo), paths)
+        return dict(zip(paths, hashes))
 
 
-def getDataHash(data: bytes) -> str:
-    return hashlib.sha512(data).hexdigest()
+def getDataHash(data: bytes, algorithm: str = "sha512") -> str:
+    return hashlib.new(algorithm, data).hexdigest()
@@ -0,0 +1,69 @@
+import argparse
+import sys
+
+from FactorioAPI.batch import DEFAULT_CHUNK_SIZE, KINDS, parseFiles, writeJsonLines
+
+"""
+python -m FactorioAPI mod-settings.dat servers/ "players/**/achievements*.dat" -o out.jsonl
+
+reads every mod-settings.dat, achievements.dat and achievements-modded.dat it is given (or finds in a directory)
+over a pool of processes and writes one JSON line per file, see batch.py
+"""
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m FactorioAPI",
+        description=f"Reads {', '.join(KINDS)} files into JSON Lines.",
+    )
+    parser.add_argument(
+        "paths", nargs="+", help="files, directories or glob patterns to read"
+    )
+    parser.add_argument(
+        "-o", "--output", help="file to write the JSON Lines to, defaults to stdout"
+    )
+    parser.add_argument(
+        "-j",
+        "--workers",
+        type=int,
+        default=None,
+        help="how many processes to use, 0 for none, defaults to one per CPU",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help=f"how many files each process gets at once, defaults to {DEFAULT_CHUNK_SIZE}",
+    )
+    parser.add_argument(
+        "--unordered",
+        action="store_true",
+        help="write files as they finish instead of in order",
+    )
+    parser.add_argument(
+        "--kind",
+        choices=sorted(set(KINDS.values())),
+        help="what every file is, defaults to going by each file name",
+    )
+    args = parser.parse_args(argv)
+
+    records = parseFiles(
+        args.paths,
+        workers=args.workers,
+        ordered=not args.unordered,
+        chunkSize=args.chunk_size,
+        kind=args.kind,
+    )
+    if args.output is None:
+        errors = writeJsonLines(records, sys.stdout)
+    else:
+        with open(args.output, "w", encoding="utf-8") as f:
+            errors = writeJsonLines(records, f)
+    if errors:
+        print(f"{errors} files couldn't be read", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,177 @@
+import glob
+import json
+import os
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Iterable, Iterator, TextIO
+
+from FactorioAPI.Data.Files.achievements import (
+    achievementsCodec,
+    moddedAchievementsCodec,
+)
+from FactorioAPI.Data.Files.modSettings import modSettingsCodec
+from FactorioAPI.Data.IO.buffer import BufferReader
+
+"""
+reading lots of .dat files at once, over a pool of processes
+
+    for record in parseFiles(["servers/", "players/**/achievements.dat"], ordered=False):
+        print(record["path"], "error" in record)
+
+every file becomes a record, {"path", "kind", "data"} or {"path", "kind", "error"} if it couldn't be read,
+so one broken file doesn't stop the rest. the files are handed to the workers in chunks so the cost of sending
+work between processes is paid once per chunk rather than once per file
+
+python -m FactorioAPI does the same from the command line and writes JSON Lines, see __main__.py
+"""
+
+# file name > kind
+KINDS = {
+    "mod-settings.dat": "modSettings",
+    "achievements.dat": "achievements",
+    "achievements-modded.dat": "moddedAchievements",
+}
+
+_CODECS = {
+    "modSettings": modSettingsCodec,
+    "achievements": achievementsCodec,
+    "moddedAchievements": moddedAchievementsCodec,
+}
+
+DEFAULT_CHUNK_SIZE = 64
+
+
+def fileKind(path: str) -> str | None:
+    """
+    Args:
+        path (str): A file.
+
+    Returns:
+        str | None: The kind of file going by its name, see KINDS, None if it isn't one.
+    """
+    return KINDS.get(os.path.basename(path))
+
+
+def findFiles(paths: Iterable[str]) -> list[str]:
+    """Expands directories and glob patterns into the .dat files in them.
+    directories are searched all the way down for the names in KINDS, files given directly are always kept
+
+    Args:
+        paths (Iterable[str]): Files, directories or glob patterns.
+
+    Returns:
+        list[str]: The files, sorted within each path given and without repeats.
+    """
+    found = {}
+    for path in paths:
+        if os.path.isdir(path):
+            matches = []
+            for root, dirs, files in os.walk(path):
+                matches.extend(
+                    os.path.join(root, name) for name in files if name in KINDS
+                )
+        elif glob.has_magic(path):
+            matches = [
+                match
+                for match in glob.glob(path, recursive=True)
+                if os.path.isfile(match)
+            ]
+        else:
+            matches = [path]
+        for match in sorted(matches):
+            found[match] = None
+    return list(found)
+
+
+def parseFile(path: str, kind: str = None) -> dict:
+    """Reads one file into a record, see the top of this file.
+
+    Args:
+        path (str): The file.
+        kind (str, optional): What it is, see KINDS. Defaults to working it out from the file name.
+
+    Returns:
+        dict: The record.
+    """
+    kind = kind or fileKind(path)
+    if kind not in _CODECS:
+        return {"path": path, "kind": kind, "error": "Unknown kind of file"}
+    try:
+        with BufferReader.open(path) as f:
+            data = _CODECS[kind].read(f)
+    except Exception as e:
+        return {"path": path, "kind": kind, "error": f"{type(e).__name__}: {e}"}
+    return {"path": path, "kind": kind, "data": data}
+
+
+def _parseChunk(paths: list[str], kind: str = None) -> list[dict]:
+    return [parseFile(path, kind) for path in paths]
+
+
+def parseFiles(
+    paths: Iterable[str],
+    workers: int = None,
+    ordered: bool = True,
+    chunkSize: int = DEFAULT_CHUNK_SIZE,
+    kind: str = None,
+) -> Iterator[dict]:
+    """Reads lots of files over a process pool, see the top of this file.
+
+    Args:
+        paths (Iterable[str]): Files, directories or glob patterns, see findFiles.
+        workers (int, optional): How many processes, 0 reads everything in this one. Defaults to one per CPU.
+        ordered (bool, optional): Give records back in the same order as the files, otherwise as they finish. Defaults to True.
+        chunkSize (int, optional): How many files each worker gets at once. Defaults to DEFAULT_CHUNK_SIZE.
+        kind (str, optional): What every file is, see KINDS. Defaults to working it out from each file name.
+
+    Returns:
+        Iterator[dict]: The records.
+    """
+    files = findFiles(paths)
+    if workers == 0:
+        for path in files:
+            yield parseFile(path, kind)
+        return
+    chunks = (files[i : i + chunkSize] for i in range(0, len(files), chunkSize))
+    workers = workers or os.cpu_count() or 1
+    # only keep a few chunks per worker in flight, so finished records don't pile up waiting to be taken
+    window = 2 * workers
+    with ProcessPoolExecutor(workers) as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(_parseChunk, chunk, kind))
+            if len(pending) >= window:
+                yield from _take(pending, ordered)
+        while pending:
+            yield from _take(pending, ordered)
+
+
+def _take(pending: deque, ordered: bool) -> Iterator[dict]:
+    """The records of the next chunk in order, or of whichever chunks are done first."""
+    if ordered:
+        yield from pending.popleft().result()
+        return
+    done, notDone = wait(pending, return_when=FIRST_COMPLETED)
+    pending.clear()
+    pending.extend(notDone)
+    for future in done:
+        yield from future.result()
+
+
+def writeJsonLines(records: Iterable[dict], f: TextIO) -> int:
+    """Writes records as JSON Lines, one record per line as soon as it comes.
+
+    Args:
+        records (Iterable[dict]): The records, like parseFiles gives.
+        f (TextIO): Where to write.
+
+    Returns:
+        int: How many records had an error.
+    """
+    errors = 0
+    for record in records:
+        if "error" in record:
+            errors += 1
+        f.write(json.dumps(record, separators=(",", ":")))
+        f.write("\n")
+    return errors
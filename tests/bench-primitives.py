@@ -0,0 +1,97 @@
+import io
+import sys
+import timeit
+
+sys.path.append("./")
+
+import numpy as np
+
+from FactorioAPI.Data.IO.codec import DOUBLE, FLOAT, INT, USHORT, unpackFrom
+from FactorioAPI.Data.IO.read import readDouble, readFloat, readInt, readUShort
+from FactorioAPI.Data.IO.write import writeDouble, writeFloat, writeInt
+
+# per value cost of the primitives, compared against how they used to be done
+# (a f.read plus int.from_bytes or a numpy scalar for every value)
+# the "from" rows unpack straight out of the buffer with no f.read at all
+# run from the repo root: python tests/bench-primitives.py
+
+AMOUNT = 100_000
+data = io.BytesIO(bytes(range(256)) * (AMOUNT * 8 // 256 + 1))
+
+
+def oldReadInt(f):
+    return int.from_bytes(f.read(4), "little", signed=True)
+
+
+def oldReadUShort(f):
+    return int.from_bytes(f.read(2), "little", signed=False)
+
+
+def oldReadFloat(f):
+    return float(np.frombuffer(f.read(4), dtype=np.float32, count=1)[0])
+
+
+def oldReadDouble(f):
+    return float(np.frombuffer(f.read(8), dtype=np.float64, count=1)[0])
+
+
+def oldWriteInt(f, value):
+    f.write(value.to_bytes(4, "little", signed=True))
+
+
+def oldWriteFloat(f, value):
+    f.write(np.float32(value).tobytes())
+
+
+def oldWriteDouble(f, value):
+    f.write(np.float64(value).tobytes())
+
+
+def benchRead(reader):
+    def run():
+        data.seek(0)
+        for i in range(AMOUNT):
+            reader(data)
+
+    return min(timeit.repeat(run, number=1, repeat=5)) / AMOUNT
+
+
+def benchUnpackFrom(s):
+    buffer = data.getbuffer()
+
+    def run():
+        offset = 0
+        for i in range(AMOUNT):
+            value, offset = unpackFrom(s, buffer, offset)
+
+    result = min(timeit.repeat(run, number=1, repeat=5)) / AMOUNT
+    buffer.release()
+    return result
+
+
+def benchWrite(writer, value):
+    def run():
+        out = io.BytesIO()
+        for i in range(AMOUNT):
+            writer(out, value)
+
+    return min(timeit.repeat(run, number=1, repeat=5)) / AMOUNT
+
+
+cases = [
+    ("readInt", benchRead(oldReadInt), benchRead(readInt)),
+    ("readUShort", benchRead(oldReadUShort), benchRead(readUShort)),
+    ("readFloat", benchRead(oldReadFloat), benchRead(readFloat)),
+    ("readDouble", benchRead(oldReadDouble), benchRead(readDouble)),
+    ("INT from", benchRead(oldReadInt), benchUnpackFrom(INT)),
+    ("USHORT from", benchRead(oldReadUShort), benchUnpackFrom(USHORT)),
+    ("FLOAT from", benchRead(oldReadFloat), benchUnpackFrom(FLOAT)),
+    ("DOUBLE from", benchRead(oldReadDouble), benchUnpackFrom(DOUBLE)),
+    ("writeInt", benchWrite(oldWriteInt, 123456), benchWrite(writeInt, 123456)),
+    ("writeFloat", benchWrite(oldWriteFloat, 1.5), benchWrite(writeFloat, 1.5)),
+    ("writeDouble", benchWrite(oldWriteDouble, 1.5), benchWrite(writeDouble, 1.5)),
+]
+
+print(f"{'function':<12} {'old ns/value':>13} {'new ns/value':>13} {'speedup':>8}")
+for name, old, new in cases:
+    print(f"{name:<12} {old * 1e9:>13.1f} {new * 1e9:>13.1f} {old / new:>7.2f}x")
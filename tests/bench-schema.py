@@ -0,0 +1,74 @@
+import io
+import json
+import sys
+import timeit
+
+sys.path.append("./")
+
+from FactorioAPI.Data.Files.achievements import (
+    achievementsCodec,
+    moddedAchievementsCodec,
+    readAchievements,
+)
+from FactorioAPI.Data.Files.modSettings import (
+    modSettingsCodec,
+    readModSettings,
+    writeModSettings,
+)
+
+# hand written readers and writers against the ones compiled from the schemas,
+# also makes sure the compiled ones still round trip the json fixtures in testing/
+# run from the repo root: python tests/bench-schema.py
+
+files = [
+    (
+        "mod-settings",
+        "./testing/mod-settings.dat",
+        "./testing/mod-settings.json",
+        readModSettings,
+        modSettingsCodec,
+    ),
+    (
+        "achievements",
+        "./testing/achievements.dat",
+        "./testing/achievements.json",
+        readAchievements,
+        achievementsCodec,
+    ),
+    (
+        "achievements-modded",
+        "./testing/achievements-modded.dat",
+        "./testing/achievements-modded.json",
+        lambda f: readAchievements(f, modded=True),
+        moddedAchievementsCodec,
+    ),
+]
+
+
+def best(function):
+    return min(timeit.repeat(function, number=5, repeat=20)) / 5
+
+
+print(f"{'file':<20} {'hand ms':>9} {'compiled ms':>12} {'speedup':>8}")
+for name, datFile, jsonFile, reader, codec in files:
+    with open(datFile, "rb") as f:
+        data = f.read()
+    with open(jsonFile, "r") as f:
+        expected = json.load(f)
+
+    assert codec.read(data) == expected, f"{name} doesn't match {jsonFile}"
+    assert bytes(codec.encode(expected)) == data, f"{name} doesn't round trip"
+
+    hand = best(lambda: reader(io.BytesIO(data)))
+    compiled = best(lambda: codec.read(data))
+    print(
+        f"{name:<20} {hand * 1000:>9.2f} {compiled * 1000:>12.2f} {hand / compiled:>7.2f}x"
+    )
+
+with open("./testing/mod-settings.json", "r") as f:
+    settings = json.load(f)
+hand = best(lambda: writeModSettings(io.BytesIO(), settings))
+compiled = best(lambda: modSettingsCodec.write(io.BytesIO(), settings))
+print(
+    f"{'mod-settings write':<20} {hand * 1000:>9.2f} {compiled * 1000:>12.2f} {hand / compiled:>7.2f}x"
+)
@@ -0,0 +1,68 @@
+import sys
+import timeit
+
+sys.path.append("./")
+
+from FactorioAPI.Data.Files.achievements import (
+    achievementsCodec,
+    moddedAchievementsCodec,
+    readAchievements,
+)
+from FactorioAPI.Data.Files.modSettings import modSettingsCodec, readModSettings
+from FactorioAPI.Data.IO.buffer import BufferReader
+from FactorioAPI.Data.Files.validate import validateAchievements, validateModSettings
+
+# validating against a full read with readModSettings/readAchievements and the compiled codecs, also makes sure the fixtures in testing/
+# validate and that cutting them short or corrupting them doesn't
+# run from the repo root: python tests/bench-validate.py
+
+files = [
+    (
+        "mod-settings",
+        "./testing/mod-settings.dat",
+        readModSettings,
+        validateModSettings,
+        modSettingsCodec,
+    ),
+    (
+        "achievements",
+        "./testing/achievements.dat",
+        readAchievements,
+        validateAchievements,
+        achievementsCodec,
+    ),
+    (
+        "achievements-modded",
+        "./testing/achievements-modded.dat",
+        lambda f: readAchievements(f, modded=True),
+        lambda data: validateAchievements(data, modded=True),
+        moddedAchievementsCodec,
+    ),
+]
+
+
+def best(function):
+    return min(timeit.repeat(function, number=5, repeat=20)) / 5
+
+
+print(
+    f"{'file':<20} {'read ms':>9} {'compiled ms':>12} {'validate ms':>12} {'vs read':>8} {'vs compiled':>12}"
+)
+for name, datFile, reader, validate, codec in files:
+    with open(datFile, "rb") as f:
+        data = f.read()
+
+    assert validate(data), f"{name} doesn't validate: {validate(data)}"
+    result = validate(data[:20])
+    assert not result and result.offset <= 20, f"{name} cut short validated: {result}"
+    corrupt = bytearray(data)
+    corrupt[9] = 0x7F
+    assert not validate(bytes(corrupt)), f"{name} corrupted validated"
+
+    read = best(lambda: reader(BufferReader(data)))
+    compiled = best(lambda: codec.read(data))
+    validated = best(lambda: validate(data))
+    print(
+        f"{name:<20} {read * 1000:>9.2f} {compiled * 1000:>12.2f} {validated * 1000:>12.2f}"
+        f" {read / validated:>7.2f}x {compiled / validated:>11.2f}x"
+    )
@@ -0,0 +1,54 @@
+import os
+import shutil
+import struct
+import sys
+import tempfile
+
+sys.path.append("./")
+
+# patchAchievementProgress on a copy of a real achievements.dat: the progress changes in place,
+# and a bad name, type or value leaves the file exactly as it was
+from FactorioAPI.Data.Files.achievements import readAchievements
+from FactorioAPI.Data.Files.achievementsPatch import (
+    locateAchievements,
+    patchAchievementProgress,
+)
+
+print("Testing achievementsPatch")
+directory = tempfile.mkdtemp()
+path = os.path.join(directory, "achievements.dat")
+shutil.copy("testing/achievements.dat", path)
+with open(path, "rb") as f:
+    original = f.read()
+
+byType = {}
+for location in locateAchievements(original):
+    byType.setdefault(location.type, location)
+kill = byType["kill-achievement"]
+robots = byType["combat-robot-count"]
+
+assert patchAchievementProgress(path, {kill.name: 123.0}) == 1
+with open(path, "rb") as f:
+    patched = f.read()
+assert len(patched) == len(original)
+assert struct.unpack_from("<d", patched, kill.offset)[0] == 123.0
+with open(path, "rb") as f:
+    readAchievements(f)
+
+# the double is fine, the int isn't, so neither gets written
+for changes, error in (
+    ({kill.name: 456.0, robots.name: 2.5}, struct.error),
+    ({kill.name: 456.0, "not-an-achievement": 1.0}, KeyError),
+    ({kill.name: 456.0, byType["research-achievement"].name: 1}, ValueError),
+):
+    try:
+        patchAchievementProgress(path, changes)
+    except error:
+        pass
+    else:
+        raise AssertionError(f"{changes} didn't raise {error.__name__}")
+    with open(path, "rb") as f:
+        assert f.read() == patched, f"{changes} changed the file"
+
+shutil.rmtree(directory)
+print("Bad changes leave the file untouched")
@@ -0,0 +1,100 @@
+import asyncio
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.append("./")
+
+# getGameDetailsMany against a local stub of the matchmaking api, checks every id comes back once,
+# errors stay with their id, and no more than the concurrency limit are ever in flight
+from FactorioAPI.API.client import APIClient, getDefaultClient
+from FactorioAPI.API.Internal.asyncMatchmaking import AsyncMatchmaking
+from FactorioAPI.API.Internal.servers import ServerIndex
+from FactorioAPI.API.scheduler import Scheduler
+
+CONCURRENCY = 8
+inFlight = 0
+mostInFlight = 0
+lock = threading.Lock()
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        global inFlight, mostInFlight
+        with lock:
+            inFlight += 1
+            mostInFlight = max(mostInFlight, inFlight)
+        time.sleep(0.02)
+        gameId = self.path.rsplit("/", 1)[-1]
+        if gameId.endswith("7"):
+            status, body = 404, {"message": "no game with that id"}
+        else:
+            status, body = 200, {
+                "game_id": int(gameId),
+                "name": f"server {gameId}",
+                "mods": [{"name": f"mod-{int(gameId) % 3}", "version": "1.0.0"}],
+            }
+        data = json.dumps(body).encode()
+        with lock:
+            inFlight -= 1
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+async def main(url):
+    ids = [str(i) for i in range(100)]
+    results = {}
+    # the stub can take far more than the default rate limits
+    client = APIClient(CONCURRENCY, scheduler=Scheduler(defaultRate=(1000.0, 100)))
+    async with AsyncMatchmaking(client, concurrency=CONCURRENCY, url=url) as mm:
+        async for result in mm.getGameDetailsMany(ids):
+            results[result.gameId] = result
+        print(mm.client.latency("get-game-details"))
+        # getGames has no mods, addDetails gets them for the servers that say they have some
+        index = ServerIndex(
+            {"game_id": i, "name": f"server {i}", "has_mods": i % 2 == 0}
+            for i in range(30)
+        )
+        assert index.find(mod="mod-0") == [], "mods before addDetails"
+        added = await mm.addDetails(index)
+    return ids, results, index, added
+
+
+owned = AsyncMatchmaking()
+assert (
+    owned.client.scheduler is getDefaultClient().scheduler
+), "not the shared scheduler"
+owned.close()
+
+server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+threading.Thread(target=server.serve_forever, daemon=True).start()
+print("Testing getGameDetailsMany")
+start = time.time()
+ids, results, index, added = asyncio.run(main(f"http://127.0.0.1:{server.server_port}"))
+stop = time.time()
+server.shutdown()
+
+assert sorted(results) == sorted(ids), "not every id came back once"
+for gameId, result in results.items():
+    if gameId.endswith("7"):
+        assert result.details is None and "404" in str(result.error), result
+    else:
+        assert result.error is None and result.details["game_id"] == int(gameId), result
+# the even ids, less the ones ending in 7 (none) that 404
+assert added == 15, added
+found = [record.gameId for record in index.find(mod="mod-0")]
+assert found == [i for i in range(0, 30, 6)], found
+assert index.get(1).mods == () and index.get(2).mods == (("mod-2", "1.0.0"),)
+assert mostInFlight <= CONCURRENCY, f"{mostInFlight} in flight"
+print(f"All results match, at most {mostInFlight} in flight")
+print(f"Test took {stop - start:.5f} seconds")
@@ -0,0 +1,93 @@
+import json
+import sys
+import threading
+import time
+import timeit
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.append("./")
+
+# GamesCache against a local stub of get-games: one fetch for lots of callers at once, stale servers
+# given back while one background fetch revalidates them with If-None-Match
+from FactorioAPI.API.client import APIClient
+from FactorioAPI.API.Internal.matchmaking import GamesCache
+
+ETAG = '"servers-1"'
+seen = []
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        seen.append(self.headers.get("If-None-Match"))
+        time.sleep(0.1)
+        if self.headers.get("If-None-Match") == ETAG:
+            self.send_response(304)
+            self.send_header("ETag", ETAG)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        data = json.dumps([{"game_id": i, "name": f"server {i}"} for i in range(1000)])
+        data = data.encode()
+        self.send_response(200)
+        self.send_header("ETag", ETAG)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+threading.Thread(target=server.serve_forever, daemon=True).start()
+print("Testing GamesCache")
+cache = GamesCache(
+    ttl=0.3,
+    staleFor=5,
+    client=APIClient(),
+    url=f"http://127.0.0.1:{server.server_port}",
+)
+
+with ThreadPoolExecutor(20) as executor:
+    results = list(executor.map(lambda i: cache.get("user", "token"), range(20)))
+assert len(seen) == 1, f"{len(seen)} fetches for 20 callers at once"
+assert all(result is results[0] for result in results)
+assert cache.stats["hits"] == 19, cache.stats
+
+number = 100000
+hit = timeit.timeit(lambda: cache.get("user", "token"), number=number) / number
+print(f"Fresh hit took {hit * 1e6:.3f} microseconds")
+
+time.sleep(0.35)
+start = time.perf_counter()
+stale = cache.get("user", "token")
+took = time.perf_counter() - start
+assert stale is results[0] and took < 0.05, f"stale get waited {took:.3f}s"
+time.sleep(0.25)
+assert seen == [None, ETAG], f"revalidation sent {seen}"
+assert cache.stats["notModified"] == 1 and cache.get("user", "token") is stale
+index = cache.getIndex("user", "token")
+assert index is cache.getIndex("user", "token"), "the index was built twice"
+assert index.get(5).name == "server 5" and len(index.find(text="server 42")) == 1
+
+# the counts are kept under a lock, none go missing with lots of threads
+counted = GamesCache(
+    ttl=60, client=APIClient(), url=f"http://127.0.0.1:{server.server_port}"
+)
+with ThreadPoolExecutor(8) as executor:
+    list(executor.map(lambda i: counted.get("user", "token"), range(8000)))
+assert counted.stats["fetches"] == 1 and counted.stats["hits"] == 7999, counted.stats
+
+# only the most recently used usernames and tokens are kept
+bounded = GamesCache(
+    client=APIClient(), url=f"http://127.0.0.1:{server.server_port}", maxEntries=3
+)
+for user in range(5):
+    bounded.get(f"user {user}", "token")
+assert sorted(bounded._entries) == [(f"user {user}", "token") for user in (2, 3, 4)]
+server.shutdown()
+print(cache.stats)
@@ -0,0 +1,138 @@
+import asyncio
+import json
+import socket
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+sys.path.append("./")
+
+# the scheduler against a local stub server: retries on 429/503, coalescing for threads and coroutines,
+# and the token bucket holding requests to its rate
+from FactorioAPI.API.client import APIClient
+from FactorioAPI.API.scheduler import Scheduler
+
+hits = {}
+lock = threading.Lock()
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        with lock:
+            hits[self.path] = hits.get(self.path, 0) + 1
+            count = hits[self.path]
+        status, headers = 200, {}
+        if self.path.startswith("/limited") and count == 1:
+            status, headers = 429, {"Retry-After": "0"}
+        elif self.path.startswith("/flaky") and count < 3:
+            status = 503
+        elif self.path.startswith("/slow"):
+            time.sleep(0.2)
+        data = json.dumps({"path": self.path, "count": count}).encode()
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        # counted, then too slow for the client's read timeout
+        with lock:
+            hits[self.path] = hits.get(self.path, 0) + 1
+        time.sleep(0.3)
+        self.send_response(500)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+threading.Thread(target=server.serve_forever, daemon=True).start()
+url = f"http://127.0.0.1:{server.server_port}"
+print("Testing the scheduler")
+start = time.time()
+
+client = APIClient(scheduler=Scheduler(backoff=0.01, rates={"rated": (20, 1)}))
+
+response = client.get(f"{url}/limited")
+assert response.status_code == 200 and hits["/limited"] == 2, "429 wasn't retried"
+response = client.get(f"{url}/flaky")
+assert response.status_code == 200 and hits["/flaky"] == 3, "503 wasn't retried"
+
+with ThreadPoolExecutor(10) as executor:
+    responses = list(executor.map(lambda i: client.get(f"{url}/slow"), range(10)))
+assert hits["/slow"] == 1, f"threads weren't coalesced, {hits['/slow']} sent"
+assert all(r.json()["count"] == 1 for r in responses)
+
+
+async def coalesceAsync():
+    return await asyncio.gather(
+        *(client.requestAsync("GET", f"{url}/slow-async") for i in range(10))
+    )
+
+
+responses = asyncio.run(coalesceAsync())
+assert hits["/slow-async"] == 1, f"coroutines weren't coalesced, {hits['/slow-async']}"
+
+try:
+    client.post(f"{url}/login", timeout=(1, 0.1))
+    raise AssertionError("the read timeout wasn't raised")
+except requests.ReadTimeout:
+    pass
+time.sleep(0.4)
+assert hits["/login"] == 1, f"a POST that timed out was sent {hits['/login']} times"
+
+# nothing listens on the closed port, so the POST was never sent and can be tried again
+closed = socket.socket()
+closed.bind(("127.0.0.1", 0))
+closedPort = closed.getsockname()[1]
+closed.close()
+sent = client.scheduler.stats["sent"]
+try:
+    client.post(f"http://127.0.0.1:{closedPort}/login")
+    raise AssertionError("connecting to a closed port worked")
+except requests.ConnectionError:
+    pass
+retried = client.scheduler.stats["sent"] - sent
+assert retried == client.scheduler.retries + 1, f"refused POST sent {retried} times"
+
+rateStart = time.perf_counter()
+for i in range(6):
+    client.get(f"{url}/rated/{i}", "rated")
+took = time.perf_counter() - rateStart
+assert took >= 0.24, f"6 requests at 20 a second with no burst took {took:.3f}s"
+
+
+async def cancelOwner():
+    # the first caller starts the request then is cancelled, the others still get the response
+    owner = asyncio.ensure_future(client.requestAsync("GET", f"{url}/slow-cancel"))
+    await asyncio.sleep(0.05)
+    others = [
+        asyncio.ensure_future(client.requestAsync("GET", f"{url}/slow-cancel"))
+        for i in range(3)
+    ]
+    await asyncio.sleep(0.01)
+    owner.cancel()
+    responses = await asyncio.gather(*others)
+    assert all(response.status_code == 200 for response in responses)
+    assert owner.cancelled()
+
+
+asyncio.run(cancelOwner())
+assert hits["/slow-cancel"] == 1, "cancelling the first caller cancelled the others"
+print("Cancelling one coalesced caller leaves the rest")
+
+stop = time.time()
+server.shutdown()
+print(client.scheduler.stats)
+print(f"Test took {stop - start:.5f} seconds")